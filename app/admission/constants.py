@@ -0,0 +1,9 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", str(os.process_cpu_count() or 1)))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+ADMISSION_DEADLINE = float(os.getenv("ADMISSION_DEADLINE", "2"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
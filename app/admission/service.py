@@ -0,0 +1,67 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Self
+
+from fastapi import HTTPException
+
+from admission.constants import ADMISSION_CONCURRENCY, ADMISSION_DEADLINE, ADMISSION_QUEUE_SIZE, ADMISSION_RETRY_AFTER
+
+
+def overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many login attempts, try again later",
+        headers={"Retry-After": str(ADMISSION_RETRY_AFTER)},
+    )
+
+
+class Admission:
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.reset()
+
+        return cls.cache
+
+    def reset(self: Self) -> None:
+        self.slots = asyncio.Semaphore(ADMISSION_CONCURRENCY)
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+
+    @asynccontextmanager
+    async def admit(self: Self) -> AsyncIterator[None]:
+        if self.slots.locked() and self.waiting >= ADMISSION_QUEUE_SIZE:
+            self.rejected += 1
+            raise overloaded()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), ADMISSION_DEADLINE)
+        except TimeoutError:
+            self.expired += 1
+            raise overloaded()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self.slots.release()
+
+    def stats(self: Self) -> dict[str, int]:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
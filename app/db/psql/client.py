@@ -1,14 +1,39 @@
 import os
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from time import perf_counter
 from typing import Self
 from uuid import UUID
 
 import asyncpg
-from asyncpg import Pool, Record
+from asyncpg import Connection, Pool, Record
 from dotenv import load_dotenv
+from metrics.registry import Metrics
+from metrics.timing import phase
+
+from db.psql.constants import (
+    PSQL_CONNECTION_LIFETIME,
+    PSQL_CURSOR_PREFETCH,
+    PSQL_MAX_QUERIES,
+    PSQL_MAX_SIZE,
+    PSQL_MIN_SIZE,
+    PSQL_STATEMENT_CACHE_SIZE,
+)
+from db.psql.queries import QUERIES
 
 load_dotenv()
 
-type ARG_TYPE = str | bytes | int | UUID | None
+type ARG_TYPE = str | bytes | int | UUID | list[str | None] | list[bytes] | list[UUID] | None
+
+
+async def prepare(connection: Connection) -> None:
+    if not hasattr(connection, "_get_statement"):
+        for query in QUERIES:
+            await connection.prepare(query)
+        return
+
+    for query in QUERIES:
+        await connection._get_statement(query, None)
 
 
 class Psql:
@@ -17,14 +42,24 @@ class Psql:
     def __new__(cls: type[Self]) -> Self:
         if not cls.cache:
             cls.cache = super().__new__(cls)
+            cls.cache.pool = None
+            cls.cache.in_flight = 0
 
         return cls.cache
 
     def __init__(self: Self) -> None:
-        self.pool: Pool
+        self.pool: Pool | None
 
     async def __aenter__(self: Self) -> Self:
-        self.pool = await asyncpg.create_pool(dsn=os.getenv("PSQL_URI"))
+        self.pool = await asyncpg.create_pool(
+            dsn=os.getenv("PSQL_URI"),
+            min_size=PSQL_MIN_SIZE,
+            max_size=PSQL_MAX_SIZE,
+            max_queries=PSQL_MAX_QUERIES,
+            max_inactive_connection_lifetime=PSQL_CONNECTION_LIFETIME,
+            statement_cache_size=PSQL_STATEMENT_CACHE_SIZE,
+            init=prepare,
+        )
         return self
 
     async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
@@ -33,8 +68,51 @@ class Psql:
     async def close(self) -> None:
         await self.pool.close()
 
-    async def execute(self: Self, query: str, *args: ARG_TYPE) -> None:
-        await self.pool.execute(query, *args)
+    @contextmanager
+    def track(self: Self, query: str) -> Iterator[None]:
+        start = perf_counter()
+        outcome = "error"
+        self.in_flight += 1
+        try:
+            with phase("psql"):
+                yield
+            outcome = "ok"
+        finally:
+            self.in_flight -= 1
+            Metrics().queries.observe(perf_counter() - start, query=QUERIES.get(query, "other"), outcome=outcome)
+
+    def stats(self: Self) -> dict[str, int]:
+        if not self.pool:
+            return {}
+
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "in_flight": self.in_flight,
+            "waiting": max(0, self.in_flight - self.pool.get_max_size()),
+        }
+
+    @asynccontextmanager
+    async def transaction(self: Self) -> AsyncIterator[Connection]:
+        async with self.pool.acquire() as connection, connection.transaction():
+            yield connection
+
+    async def execute(self: Self, query: str, *args: ARG_TYPE, connection: Connection | None = None) -> None:
+        with self.track(query):
+            await (connection or self.pool).execute(query, *args)
+
+    async def fetch_row(self: Self, query: str, *args: ARG_TYPE, connection: Connection | None = None) -> Record:
+        with self.track(query):
+            return await (connection or self.pool).fetchrow(query, *args)
+
+    async def fetch(self: Self, query: str, *args: ARG_TYPE, connection: Connection | None = None) -> list[Record]:
+        with self.track(query):
+            return await (connection or self.pool).fetch(query, *args)
 
-    async def fetch_row(self: Self, query: str, *args: ARG_TYPE) -> Record:
-        return await self.pool.fetchrow(query, *args)
+    async def stream(self: Self, query: str, *args: ARG_TYPE) -> AsyncIterator[Record]:
+        async with self.pool.acquire() as connection, connection.transaction():
+            with self.track(query):
+                async for record in connection.cursor(query, *args, prefetch=PSQL_CURSOR_PREFETCH):
+                    yield record
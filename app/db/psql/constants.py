@@ -0,0 +1,11 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+PSQL_MIN_SIZE = int(os.getenv("PSQL_MIN_SIZE", "10"))
+PSQL_MAX_SIZE = int(os.getenv("PSQL_MAX_SIZE", "10"))
+PSQL_STATEMENT_CACHE_SIZE = int(os.getenv("PSQL_STATEMENT_CACHE_SIZE", "100"))
+PSQL_CONNECTION_LIFETIME = float(os.getenv("PSQL_CONNECTION_LIFETIME", "300"))
+PSQL_MAX_QUERIES = int(os.getenv("PSQL_MAX_QUERIES", "50000"))
+PSQL_CURSOR_PREFETCH = int(os.getenv("PSQL_CURSOR_PREFETCH", "500"))
@@ -2,3 +2,16 @@
 
 INSERT_PASSWORD = "INSERT INTO passwords (id, user_id, username, password, name) VALUES ($1, $2, $3, $4, $5)"
 GET_PASSWORD = "SELECT username, password FROM passwords where name = $1 and user_id = $2"
+REKEY_PASSWORD = "UPDATE passwords SET name = $1 WHERE name = $2 and user_id = $3 RETURNING username, password"
+INSERT_PASSWORDS = (
+    "INSERT INTO passwords (id, user_id, username, password, name) "
+    "SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::text[], $5::bytea[]) "
+    "ON CONFLICT (user_id, name) DO NOTHING RETURNING name"
+)
+REKEY_PASSWORDS = (
+    "UPDATE passwords SET name = keys.name FROM unnest($1::bytea[], $2::bytea[]) AS keys(name, legacy) "
+    "WHERE passwords.name = keys.legacy and passwords.user_id = $3 "
+    "RETURNING passwords.name, username, password"
+)
+GET_PASSWORDS = "SELECT name, username, password FROM passwords where name = ANY($1) and user_id = $2"
+LIST_PASSWORDS = "SELECT id, username, password FROM passwords where user_id = $1 ORDER BY id"
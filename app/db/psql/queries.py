@@ -0,0 +1,9 @@
+from db.psql.passwords import queries as passwords
+from db.psql.users import queries as users
+
+QUERIES = {
+    query: name
+    for module in (users, passwords)
+    for name, query in vars(module).items()
+    if name.isupper() and isinstance(query, str)
+}
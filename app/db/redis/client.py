@@ -1,7 +1,10 @@
 from typing import Self
 
+from redis.asyncio import BlockingConnectionPool
 from redis.asyncio import Redis as AsyncRedis
 
+from db.redis.constants import REDIS_HEALTH_CHECK_INTERVAL, REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT, REDIS_URL
+
 
 class Redis:
     cache: Self | None = None
@@ -9,17 +12,22 @@ class Redis:
     def __new__(cls: type[Self]) -> Self:
         if not cls.cache:
             cls.cache = super().__new__(cls)
+            pool = BlockingConnectionPool.from_url(
+                REDIS_URL,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+            )
+            cls.cache.redis = AsyncRedis.from_pool(pool)
 
         return cls.cache
 
-    def __init__(self: Self) -> None:
-        self.redis = AsyncRedis()
-
-    async def set(self: Self, key: str, value: str, ex: int = 1800) -> None:
-        await self.redis.set(key, value, ex=ex)
+    async def __aenter__(self: Self) -> Self:
+        await self.redis.ping()
+        return self
 
-    async def get(self: Self, key: str) -> str | None:
-        if value := await self.redis.get(key):
-            return value.decode()
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        await self.close()
 
-        return None
+    async def close(self: Self) -> None:
+        await self.redis.aclose()
@@ -0,0 +1,19 @@
+FETCH_SESSION = """
+local session = redis.call("HMGET", KEYS[1], "expiry", "ip", "secret", "public", "id", "name")
+if not session[1] then
+    return {"missing"}
+end
+if ARGV[3] ~= "" and session[5] ~= ARGV[3] then
+    return {"missing"}
+end
+if tonumber(session[1]) < tonumber(ARGV[2]) then
+    return {"expired"}
+end
+if session[2] ~= ARGV[1] then
+    return {"wrong_ip"}
+end
+if not session[3] or not session[4] then
+    return {"missing"}
+end
+return {"valid", session[3], session[4], session[1], session[5], session[6]}
+"""
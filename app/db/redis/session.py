@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Self
+
+import pytz
+from metrics.timing import phase
+from models.session import Session, SessionState
+from sessions.store import SessionBackend
+
+from db.redis.client import Redis
+from db.redis.scripts import FETCH_SESSION
+from db.redis.session_cache import SessionCache, keyspace_prefix
+
+
+class SessionStore(SessionBackend):
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.redis = Redis().redis
+            cls.cache.fetch_script = cls.cache.redis.register_script(FETCH_SESSION)
+
+        return cls.cache
+
+    async def create(self: Self, user_id: str, session: Session, ip: str, ex: int) -> None:
+        key = f"{user_id}-session"
+        mapping = {
+            "id": session.id,
+            "name": session.name,
+            "secret": session.secret,
+            "public": session.public,
+            "expiry": session.expiry.timestamp(),
+            "ip": ip,
+        }
+
+        with phase("redis"):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.hset(key, mapping=mapping).expire(key, ex).execute()
+
+    async def fetch(
+        self: Self, user_id: str, session_id: str | None, ip: str, now: datetime
+    ) -> tuple[SessionState, Session | None]:
+        with phase("redis"):
+            raw_state, *keys = await self.fetch_script(
+                keys=[f"{user_id}-session"], args=[ip, now.timestamp(), session_id or ""]
+            )
+
+        if (state := SessionState(raw_state.decode())) is not SessionState.VALID:
+            return state, None
+
+        secret, public, expiry, stored_id, name = keys
+        return state, Session(
+            id=stored_id.decode() if stored_id else None,
+            name=name.decode() if name else None,
+            secret=secret,
+            public=public,
+            expiry=datetime.fromtimestamp(float(expiry), tz=pytz.UTC),
+        )
+
+    async def invalidate(self: Self, user_id: str) -> None:
+        key = f"{user_id}-session"
+        with phase("redis"):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.hdel(key, "name").publish(f"{keyspace_prefix(self.redis)}{key}", "invalidate").execute()
+
+        SessionCache().invalidate(user_id)
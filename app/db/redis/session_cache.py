@@ -0,0 +1,146 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Self
+
+from models.session import CachedSession
+from models.user import User
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError, ResponseError
+
+from db.redis.client import Redis
+from db.redis.constants import KEYSPACE_EVENTS, SESSION_CACHE_RETRY, SESSION_CACHE_SIZE, SESSION_CACHE_TTL
+
+NOTIFY_KEYSPACE_EVENTS = "notify-keyspace-events"
+ALL_EVENTS = "g$lshzxet"
+
+
+async def enable_keyspace_events(redis: AsyncRedis) -> bool:
+    try:
+        current = (await redis.config_get(NOTIFY_KEYSPACE_EVENTS)).get(NOTIFY_KEYSPACE_EVENTS, "")
+        if not set(KEYSPACE_EVENTS) <= set(current.replace("A", ALL_EVENTS)):
+            await redis.config_set(NOTIFY_KEYSPACE_EVENTS, "".join(sorted(set(current) | set(KEYSPACE_EVENTS))))
+    except ResponseError:
+        return False
+
+    return True
+
+
+def keyspace_prefix(redis: AsyncRedis) -> str:
+    return f"__keyspace@{redis.connection_pool.connection_kwargs.get('db', 0)}__:"
+
+
+class SessionCache:
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.enabled = False
+            cls.cache.listener = None
+            cls.cache.reset()
+
+        return cls.cache
+
+    async def __aenter__(self: Self) -> Self:
+        if SESSION_CACHE_SIZE > 0:
+            self.listener = asyncio.create_task(self.listen())
+
+        return self
+
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        await self.close()
+
+    async def close(self: Self) -> None:
+        if self.listener:
+            self.listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.listener
+
+        self.listener = None
+        self.disable()
+
+    def reset(self: Self) -> None:
+        self.entries: OrderedDict[str, CachedSession] = OrderedDict()
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def disable(self: Self) -> None:
+        self.enabled = False
+        self.entries.clear()
+        self.epoch += 1
+
+    def get(self: Self, user_id: str, session_id: str | None, ip: str, now: datetime) -> User | None:
+        if not self.enabled or not session_id:
+            return None
+
+        if not (entry := self.entries.get(user_id)) or entry.session_id != session_id or entry.ip != ip:
+            self.misses += 1
+            return None
+
+        if entry.expires < now:
+            del self.entries[user_id]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(user_id)
+        self.hits += 1
+        return entry.user
+
+    def put(
+        self: Self, user: User, session_id: str, ip: str, session_expiry: datetime, now: datetime, epoch: int
+    ) -> None:
+        if not self.enabled or epoch != self.epoch:
+            return
+
+        expires = min(session_expiry, now + timedelta(seconds=SESSION_CACHE_TTL))
+        self.entries[user.id] = CachedSession(user=user, session_id=session_id, ip=ip, expires=expires)
+        self.entries.move_to_end(user.id)
+
+        while len(self.entries) > SESSION_CACHE_SIZE:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self: Self, user_id: str) -> None:
+        self.epoch += 1
+        if self.entries.pop(user_id, None):
+            self.invalidations += 1
+
+    def stats(self: Self) -> dict[str, int]:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    async def listen(self: Self) -> None:
+        redis = Redis().redis
+        try:
+            while True:
+                with suppress(RedisError, OSError):
+                    await self.watch(redis)
+
+                self.disable()
+                await asyncio.sleep(SESSION_CACHE_RETRY)
+        finally:
+            self.disable()
+
+    async def watch(self: Self, redis: AsyncRedis) -> None:
+        if not await enable_keyspace_events(redis):
+            return
+
+        prefix = keyspace_prefix(redis)
+        async with redis.pubsub() as pubsub:
+            await pubsub.psubscribe(f"{prefix}*-session")
+            self.enabled = True
+
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    self.invalidate(message["channel"].decode().removeprefix(prefix).removesuffix("-session"))
@@ -0,0 +1,9 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+HASHING_EXECUTOR = os.getenv("HASHING_EXECUTOR", "thread")
+HASHING_WORKERS = int(os.getenv("HASHING_WORKERS", str(os.process_cpu_count() or 1)))
+HASHING_MAX_PENDING = int(os.getenv("HASHING_MAX_PENDING", "256"))
+HASHING_BULK_WORKERS = int(os.getenv("HASHING_BULK_WORKERS", str(max(1, HASHING_WORKERS // 4))))
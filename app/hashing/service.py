@@ -0,0 +1,82 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Self
+
+import bcrypt
+from metrics.timing import phase
+
+from hashing.constants import HASHING_BULK_WORKERS, HASHING_EXECUTOR, HASHING_MAX_PENDING, HASHING_WORKERS
+
+
+class Hasher:
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.executor = None
+            cls.cache.slots = None
+            cls.cache.bulk_slots = None
+            cls.cache.in_flight = 0
+
+        return cls.cache
+
+    async def __aenter__(self: Self) -> Self:
+        self.start()
+        return self
+
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        await self.close()
+
+    def start(self: Self) -> Executor:
+        if not self.executor:
+            if HASHING_EXECUTOR == "process":
+                self.executor = ProcessPoolExecutor(max_workers=HASHING_WORKERS)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=HASHING_WORKERS, thread_name_prefix="hashing")
+
+            self.slots = asyncio.Semaphore(HASHING_MAX_PENDING)
+            self.bulk_slots = asyncio.Semaphore(HASHING_BULK_WORKERS)
+
+        return self.executor
+
+    async def close(self: Self) -> None:
+        if self.executor:
+            await asyncio.to_thread(self.executor.shutdown)
+
+        self.executor = None
+        self.slots = None
+        self.bulk_slots = None
+
+    @property
+    def queue_depth(self: Self) -> int:
+        return max(0, self.in_flight - HASHING_WORKERS)
+
+    def stats(self: Self) -> dict[str, int]:
+        return {"workers": HASHING_WORKERS, "in_flight": self.in_flight, "queue_depth": self.queue_depth}
+
+    async def run[T](self: Self, func: Callable[..., T], *args: bytes) -> T:
+        executor = self.start()
+        with phase("bcrypt"):
+            async with self.slots:
+                self.in_flight += 1
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+                finally:
+                    self.in_flight -= 1
+
+    async def hashpw(self: Self, password: bytes, salt: bytes) -> bytes:
+        return await self.run(bcrypt.hashpw, password, salt)
+
+    async def checkpw(self: Self, password: bytes, hashed_password: bytes) -> bool:
+        return await self.run(bcrypt.checkpw, password, hashed_password)
+
+    async def hashpw_many(self: Self, passwords: list[bytes], salt: bytes) -> list[bytes]:
+        self.start()
+
+        async def hashpw(password: bytes) -> bytes:
+            async with self.bulk_slots:
+                return await self.hashpw(password, salt)
+
+        return await asyncio.gather(*(hashpw(password) for password in passwords))
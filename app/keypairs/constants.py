@@ -0,0 +1,8 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+KEYPAIR_POOL_SIZE = int(os.getenv("KEYPAIR_POOL_SIZE", "64"))
+KEYPAIR_REFILL_BATCH = int(os.getenv("KEYPAIR_REFILL_BATCH", "8"))
+KEYPAIR_REFILL_INTERVAL = float(os.getenv("KEYPAIR_REFILL_INTERVAL", "0"))
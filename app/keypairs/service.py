@@ -0,0 +1,91 @@
+import asyncio
+from collections import deque
+from contextlib import suppress
+from typing import Self
+
+from lwe import Secret
+
+from keypairs.constants import KEYPAIR_POOL_SIZE, KEYPAIR_REFILL_BATCH, KEYPAIR_REFILL_INTERVAL
+
+type Keypair = tuple[Secret, str]
+
+
+def generate() -> Keypair:
+    secret = Secret()
+    return secret, secret.generate_public_key().to_b64()
+
+
+def generate_many(count: int) -> list[Keypair]:
+    return [generate() for _ in range(count)]
+
+
+class Keypairs:
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.pairs = deque()
+            cls.cache.wanted = None
+            cls.cache.producer = None
+            cls.cache.produced = 0
+            cls.cache.hits = 0
+            cls.cache.misses = 0
+
+        return cls.cache
+
+    async def __aenter__(self: Self) -> Self:
+        if KEYPAIR_POOL_SIZE > 0:
+            self.wanted = asyncio.Event()
+            self.wanted.set()
+            self.producer = asyncio.create_task(self.produce())
+
+        return self
+
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        await self.close()
+
+    async def close(self: Self) -> None:
+        if self.producer:
+            self.producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.producer
+
+        self.producer = None
+        self.wanted = None
+        self.pairs.clear()
+
+    async def produce(self: Self) -> None:
+        while True:
+            await self.wanted.wait()
+
+            if (missing := KEYPAIR_POOL_SIZE - len(self.pairs)) <= 0:
+                self.wanted.clear()
+                continue
+
+            pairs = await asyncio.to_thread(generate_many, min(missing, KEYPAIR_REFILL_BATCH))
+            self.pairs.extend(pairs)
+            self.produced += len(pairs)
+
+            if KEYPAIR_REFILL_INTERVAL:
+                await asyncio.sleep(KEYPAIR_REFILL_INTERVAL)
+
+    def take(self: Self) -> Keypair:
+        if self.wanted:
+            self.wanted.set()
+
+        if self.pairs:
+            self.hits += 1
+            return self.pairs.popleft()
+
+        self.misses += 1
+        return generate()
+
+    def stats(self: Self) -> dict[str, int]:
+        return {
+            "size": len(self.pairs),
+            "capacity": KEYPAIR_POOL_SIZE,
+            "produced": self.produced,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,2 +1,5 @@
+from lwe.lwe import MAX_MESSAGE_CHARS as MAX_MESSAGE_CHARS
 from lwe.lwe import Public as Public
 from lwe.lwe import Secret as Secret
+from lwe.lwe import configure_pool as configure_pool
+from lwe.lwe import pool_stats as pool_stats
@@ -1,14 +1,21 @@
+from asyncio import Future
 from typing import Self
 
+MAX_MESSAGE_CHARS: int
+
 class Public:
     def __init__(self: Self) -> None: ...
     @classmethod
     def from_bytes(cls: type[Self], byte_str: bytes) -> Self: ...
     @classmethod
     def from_b64(cls: type[Self], base64_str: str) -> Self: ...
-    def to_b64(self: Self) -> str: ...
-    def to_bytes(self: Self) -> bytes: ...
-    def encrypt(self: Self, message: str) -> str: ...
+    def to_b64(self: Self, compact: bool = False) -> str: ...
+    def to_bytes(self: Self, compact: bool = False) -> bytes: ...
+    def is_compact(self: Self) -> bool: ...
+    def encrypt(self: Self, message: str, compact: bool = False) -> str: ...
+    def encrypt_many(self: Self, messages: list[str], compact: bool = False) -> list[str]: ...
+    def encrypt_async(self: Self, message: str, compact: bool = False) -> Future[str]: ...
+    def encrypt_many_async(self: Self, messages: list[str], compact: bool = False) -> Future[list[str]]: ...
 
 class Secret:
     def __init__(self: Self) -> None: ...
@@ -20,3 +27,10 @@ class Secret:
     def to_bytes(self: Self) -> bytes: ...
     def generate_public_key(self: Self) -> Public: ...
     def decrypt(self: Self, message: str) -> str: ...
+    def decrypt_bytes(self: Self, message: str) -> bytes: ...
+    def decrypt_many(self: Self, messages: list[str]) -> list[str]: ...
+    def decrypt_async(self: Self, message: str) -> Future[str]: ...
+    def decrypt_bytes_async(self: Self, message: str) -> Future[bytes]: ...
+
+def configure_pool(threads: int | None = None, thread_name: str | None = None) -> int: ...
+def pool_stats() -> dict[str, int]: ...
@@ -1,46 +1,64 @@
-import json
+from collections.abc import Awaitable, Callable
 from typing import Annotated
 
 import pydantic
 from fastapi import Depends, HTTPException
+from metrics.timing import phase
 from models.input import EncryptedInput
-from models.password.get import GetPasswordIn
+from models.password.get import GetPasswordIn, GetPasswordsIn
 from models.user import User
 from routes.authenticate.current_user import get_current_user
+from routes.password.bulk.constants import BULK_MAX_ENTRIES
+from routes.password.bulk.inbound import SetPasswordsIn
 from routes.password.post.inbound import SetPasswordIn
 
+from lwe import MAX_MESSAGE_CHARS
 
-async def decrypt(model: EncryptedInput, user: Annotated[User, Depends(get_current_user)]) -> tuple[User, str]:
-    return user, user.secret.decrypt(model.content)
 
+async def decrypt(model: EncryptedInput, user: Annotated[User, Depends(get_current_user)]) -> tuple[User, bytes]:
+    with phase("decrypt"):
+        try:
+            return user, await user.secret.decrypt_bytes_async(model.content)
+        except OverflowError:
+            raise HTTPException(
+                status_code=413, detail=f"Message too long, the limit is {MAX_MESSAGE_CHARS} characters"
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Bad Input")
 
-async def decrypt_set_password(payload: Annotated[tuple[User, str], Depends(decrypt)]) -> tuple[SetPasswordIn, User]:
-    user, message = payload
 
-    try:
-        message = json.loads(message)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Bad Input")
+def decrypt_model[T: pydantic.BaseModel](model: type[T]) -> Callable[..., Awaitable[tuple[T, User]]]:
+    async def decrypt_and_validate(payload: Annotated[tuple[User, bytes], Depends(decrypt)]) -> tuple[T, User]:
+        user, message = payload
 
-    try:
-        set_password_in = SetPasswordIn.model_validate(message)
-    except pydantic.ValidationError:
-        raise HTTPException(status_code=400, detail="Bad Input")
+        try:
+            return model.model_validate_json(message), user
+        except pydantic.ValidationError:
+            raise HTTPException(status_code=400, detail="Bad Input")
 
-    return set_password_in, user
+    return decrypt_and_validate
 
 
-async def decrypt_get_password(payload: Annotated[tuple[User, str], Depends(decrypt)]) -> tuple[GetPasswordIn, User]:
-    user, message = payload
+def check_entries(entries: int) -> None:
+    if entries > BULK_MAX_ENTRIES:
+        raise HTTPException(status_code=413, detail=f"Too many entries, the limit is {BULK_MAX_ENTRIES}")
 
-    try:
-        message = json.loads(message)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Bad Input")
 
-    try:
-        get_password_in = GetPasswordIn.model_validate(message)
-    except pydantic.ValidationError:
-        raise HTTPException(status_code=400, detail="Bad Input")
+decrypt_set_password = decrypt_model(SetPasswordIn)
+decrypt_get_password = decrypt_model(GetPasswordIn)
 
-    return get_password_in, user
+
+async def decrypt_set_passwords(
+    payload: Annotated[tuple[SetPasswordsIn, User], Depends(decrypt_model(SetPasswordsIn))],
+) -> tuple[list[SetPasswordIn], User]:
+    set_passwords_in, user = payload
+    check_entries(len(set_passwords_in.root))
+    return set_passwords_in.root, user
+
+
+async def decrypt_get_passwords(
+    payload: Annotated[tuple[GetPasswordsIn, User], Depends(decrypt_model(GetPasswordsIn))],
+) -> tuple[GetPasswordsIn, User]:
+    get_passwords_in, user = payload
+    check_entries(len(get_passwords_in.names))
+    return get_passwords_in, user
@@ -0,0 +1,18 @@
+from collections.abc import Sequence
+
+from metrics.timing import phase
+from models.output import EncryptedOutput
+from models.user import User
+from pydantic import BaseModel
+
+
+async def encrypt(model: BaseModel, user: User) -> EncryptedOutput:
+    with phase("encrypt"):
+        return EncryptedOutput(content=await user.public.encrypt_async(model.model_dump_json(), compact=True))
+
+
+async def encrypt_many(models: Sequence[BaseModel], user: User) -> list[EncryptedOutput]:
+    with phase("encrypt"):
+        encrypted = await user.public.encrypt_many_async([model.model_dump_json() for model in models], compact=True)
+
+    return [EncryptedOutput(content=content) for content in encrypted]
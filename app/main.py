@@ -1,36 +1,71 @@
-import uuid
-from contextlib import asynccontextmanager
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
 from typing import Annotated, AsyncGenerator
 
-import bcrypt
 import uvicorn
 from db.psql.client import Psql
-from db.psql.passwords.queries import GET_PASSWORD, INSERT_PASSWORD
+from db.redis.client import Redis
+from db.redis.session_cache import SessionCache
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, Request
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from lwe.model_decrypt import decrypt_get_password, decrypt_set_password
+from hashing.service import Hasher
+from keypairs.service import Keypairs
+from lwe.model_decrypt import (
+    decrypt_get_password,
+    decrypt_get_passwords,
+    decrypt_set_password,
+    decrypt_set_passwords,
+)
+from lwe.model_encrypt import encrypt
+from metrics.constants import CONTENT_TYPE
+from metrics.timing import TimingMiddleware
 from models.authenticate.output import Token
 from models.new.inbound import NewIn
 from models.new.outbound import NewOut
-from models.password.get import GetPasswordIn, GetPasswordOut
+from models.output import EncryptedOutput
+from models.password.get import GetPasswordIn, GetPasswordsIn
 from models.user import User
 from routes.authenticate.auth import authenticate_user
+from routes.authenticate.current_user import get_current_user
+from routes.metrics.metrics import check_metrics_token, render_metrics
 from routes.new.new_user import create_user
-from routes.password.post.constants import USER_SALT
+from routes.password.bulk.fetch_passwords import fetch_passwords
+from routes.password.bulk.outbound import BulkPasswordOut
+from routes.password.bulk.store_passwords import store_passwords
+from routes.password.get.get_password import fetch_password
 from routes.password.post.inbound import SetPasswordIn
 from routes.password.post.outbound import SetPasswordOut
+from routes.password.post.set_password import store_password
+from routes.password.stream.stream_passwords import stream_passwords
+from sessions.constants import SESSION_STORE
+from usernames.constants import USERNAME_FILTER
+from usernames.service import Usernames
 
 load_dotenv()
 
 
+def services() -> list[AbstractAsyncContextManager]:
+    if SESSION_STORE == "redis":
+        return [Psql(), Redis(), SessionCache(), Hasher(), Keypairs(), Usernames()]
+
+    if USERNAME_FILTER == "redis":
+        return [Psql(), Redis(), Hasher(), Keypairs(), Usernames()]
+
+    return [Psql(), Hasher(), Keypairs(), Usernames()]
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
-    async with Psql():
+    async with AsyncExitStack() as stack:
+        for service in services():
+            await stack.enter_async_context(service)
+
         yield
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(TimingMiddleware)
 
 
 @app.post("/new")
@@ -45,31 +80,40 @@ async def authenticate(form_data: Annotated[OAuth2PasswordRequestForm, Depends()
 
 @app.post("/password")
 async def set_password(payload: Annotated[tuple[SetPasswordIn, User], Depends(decrypt_set_password)]) -> SetPasswordOut:
-    set_password_in, user = payload
-    await Psql().execute(
-        INSERT_PASSWORD,
-        uuid.uuid4(),
-        user.id,
-        set_password_in.username,
-        set_password_in.password,
-        bcrypt.hashpw(set_password_in.name.encode(), salt=USER_SALT),
-    )
-    return SetPasswordOut(name=set_password_in.name)
+    return await store_password(*payload)
+
+
+@app.post("/password/bulk")
+async def set_passwords(
+    payload: Annotated[tuple[list[SetPasswordIn], User], Depends(decrypt_set_passwords)],
+) -> BulkPasswordOut:
+    return await store_passwords(*payload)
 
 
 @app.get("/password")
 async def get_password(
     payload: Annotated[tuple[GetPasswordIn, User], Depends(decrypt_get_password)],
-) -> GetPasswordOut:  # TODO: Add base model to encrypt output before sending
+) -> EncryptedOutput:
     get_password_in, user = payload
+    return await encrypt(await fetch_password(get_password_in, user), user)
+
+
+@app.get("/password/bulk")
+async def get_passwords(
+    payload: Annotated[tuple[GetPasswordsIn, User], Depends(decrypt_get_passwords)],
+) -> EncryptedOutput:
+    get_passwords_in, user = payload
+    return await encrypt(await fetch_passwords(get_passwords_in, user), user)
+
+
+@app.get("/password/all")
+async def list_passwords(user: Annotated[User, Depends(get_current_user)]) -> StreamingResponse:
+    return StreamingResponse(stream_passwords(user), media_type="application/x-ndjson")
 
-    row = await Psql().fetch_row(
-        GET_PASSWORD,
-        bcrypt.hashpw(get_password_in.name.encode(), salt=USER_SALT),
-        user.id,
-    )
 
-    return GetPasswordOut(username=row["username"], password=row["password"])
+@app.get("/metrics", dependencies=[Depends(check_metrics_token)])
+async def metrics() -> Response:
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
 
 
 if __name__ == "__main__":
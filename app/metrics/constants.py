@@ -0,0 +1,11 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SERVER_TIMING_DEBUG = os.getenv("SERVER_TIMING_DEBUG", "false").lower() == "true"
+SERVER_TIMING_HIDDEN = ("/authenticate",)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+PRIVATE_PHASES = ("bcrypt",)
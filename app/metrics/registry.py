@@ -0,0 +1,71 @@
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Self
+
+from metrics.constants import BUCKETS
+
+type Labels = tuple[tuple[str, str], ...]
+
+
+def format_labels(labels: Labels, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped, strict=True)) + "}"
+
+
+class Histogram:
+    def __init__(self: Self, name: str, description: str, buckets: tuple[float, ...] = BUCKETS) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self: Self, value: float, **labels: str) -> None:
+        key = tuple(labels.items())
+        if not (series := self.series.get(key)):
+            series = self.series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self: Self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(labels, le=str(bound))} {cumulative}")
+
+            lines.append(f"{self.name}_sum{format_labels(labels)} {total[0]}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+
+        return lines
+
+
+class Metrics:
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.requests = Histogram("vault_request_duration_seconds", "Time spent handling HTTP requests.")
+            cls.cache.phases = Histogram("vault_phase_duration_seconds", "Time spent in each request phase.")
+            cls.cache.queries = Histogram("vault_psql_query_duration_seconds", "Time spent running Postgres queries.")
+
+        return cls.cache
+
+    def render(
+        self: Self, counters: Mapping[str, Mapping[str, float]], gauges: Mapping[str, Mapping[str, float]]
+    ) -> str:
+        lines = [*self.requests.render(), *self.phases.render(), *self.queries.render()]
+        for kind, families in (("counter", counters), ("gauge", gauges)):
+            for prefix, values in families.items():
+                for key, value in values.items():
+                    name = f"vault_{prefix}_{key}_total" if kind == "counter" else f"vault_{prefix}_{key}"
+                    lines.extend((f"# TYPE {name} {kind}", f"{name} {value}"))
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,62 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Self
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics.constants import PRIVATE_PHASES, SERVER_TIMING_DEBUG, SERVER_TIMING_HIDDEN
+from metrics.registry import Metrics
+
+PHASES: ContextVar[dict[str, float] | None] = ContextVar("phases", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        if name not in PRIVATE_PHASES:
+            Metrics().phases.observe(elapsed, phase=name)
+        if (phases := PHASES.get()) is not None:
+            phases[name] = phases.get(name, 0) + elapsed
+
+
+def server_timing(phases: dict[str, float], total: float) -> str:
+    return ", ".join(f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in (*phases.items(), ("total", total)))
+
+
+class TimingMiddleware:
+    def __init__(self: Self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        phases: dict[str, float] = {}
+        token = PHASES.set(phases)
+        status = 500
+        expose = SERVER_TIMING_DEBUG or scope.get("path") not in SERVER_TIMING_HIDDEN
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if expose:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing(phases, perf_counter() - start))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            PHASES.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            Metrics().requests.observe(perf_counter() - start, method=scope["method"], route=route, status=str(status))
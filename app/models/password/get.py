@@ -8,3 +8,18 @@ class GetPasswordIn(BaseModel):
 class GetPasswordOut(BaseModel):
     username: str
     password: str
+
+
+class GetPasswordsIn(BaseModel):
+    names: list[str]
+
+
+class GetPasswordsOut(BaseModel):
+    passwords: dict[str, GetPasswordOut]
+    missing: list[str]
+
+
+class ListedPasswordOut(BaseModel):
+    id: str
+    username: str | None
+    password: str
@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from models.user import User
+
+
+class SessionState(StrEnum):
+    VALID = "valid"
+    MISSING = "missing"
+    EXPIRED = "expired"
+    WRONG_IP = "wrong_ip"
+
+
+class Session(BaseModel):
+    id: str | None
+    name: str | None
+    secret: bytes
+    public: bytes
+    expiry: datetime
+
+
+class CachedSession(BaseModel):
+    user: User
+    session_id: str
+    ip: str
+    expires: datetime
+
+
+class StoredSession(BaseModel):
+    session: Session
+    ip: str
+    deadline: float
@@ -1,16 +1,20 @@
-import asyncio
+import uuid
 from datetime import datetime, timedelta
 
-import bcrypt
 import jwt
 import pytz
-from db.psql.client import Psql
-from db.psql.users.queries import GET_USER
-from db.redis.client import Redis
+from admission.service import Admission
+from db.redis.session_cache import SessionCache
 from fastapi import HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from lwe import Public, Secret
+from hashing.service import Hasher
+from keypairs.service import Keypairs
+from lwe import Public
+from metrics.timing import phase
 from models.authenticate.output import Token
+from models.session import Session
+from sessions.service import session_store
+from usernames.service import Usernames
 
 from routes.authenticate.constants import JWT_SECRET, SESSION_DURATION
 
@@ -23,34 +27,40 @@ async def authenticate_user(form_data: OAuth2PasswordRequestForm, request: Reque
         raise HTTPException(status_code=401, detail="Invalid client")
 
     try:
-        Public.from_b64(client_secret)
+        client_public = Public.from_b64(client_secret)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid client secret")
 
-    if not (user := await Psql().fetch_row(GET_USER, form_data.username)):
-        raise HTTPException(status_code=401, detail="Invalid username or password")
+    async with Admission().admit():
+        if not (user := await Usernames().lookup(form_data.username)):
+            await Usernames().reject(form_data.password.encode())
+            raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    if not bcrypt.checkpw(form_data.password.encode(), user["hashed_password"]):
-        raise HTTPException(status_code=401, detail="Invalid username or password")
+        if not await Hasher().checkpw(form_data.password.encode(), user["hashed_password"]):
+            raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    user_id = str(user["id"])
-    app_secret = Secret()
-    app_public_key = app_secret.generate_public_key().to_b64()
+        user_id = str(user["id"])
+        with phase("keygen"):
+            app_secret, app_public_key = Keypairs().take()
 
-    expires = (datetime.now(tz=pytz.UTC) + timedelta(seconds=SESSION_DURATION)).isoformat()
+    expires = datetime.now(tz=pytz.UTC) + timedelta(seconds=SESSION_DURATION)
 
-    redis = Redis()
-    await asyncio.gather(
-        redis.set(f"{user_id}-secret", app_secret.to_b64(), ex=SESSION_DURATION),
-        redis.set(f"{user_id}-public", client_secret, ex=SESSION_DURATION),
-        redis.set(f"{user_id}-expiry", expires, ex=SESSION_DURATION),
-        redis.set(f"{user_id}-ip", client.host, ex=SESSION_DURATION),
+    session = Session(
+        id=uuid.uuid4().hex,
+        name=user["name"],
+        secret=app_secret.to_bytes(),
+        public=client_public.to_bytes(compact=True),
+        expiry=expires,
     )
 
+    await session_store().create(user_id, session, client.host, SESSION_DURATION)
+    SessionCache().invalidate(user_id)
+
     raw_token = {
         "id": user_id,
-        "expires": expires,
+        "expires": expires.isoformat(),
         "duration": SESSION_DURATION,
+        "session": session.id,
     }
 
     return Token(access_token=jwt.encode(raw_token, JWT_SECRET), public_key=app_public_key)
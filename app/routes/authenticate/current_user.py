@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime
 from typing import Annotated
 
@@ -6,12 +5,15 @@ import jwt
 import pytz
 from db.psql.client import Psql
 from db.psql.users.queries import GET_USER_FROM_ID
-from db.redis.client import Redis
+from db.redis.session_cache import SessionCache
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from jwt import InvalidTokenError
-from lwe import Public, Secret
+from metrics.timing import phase
+from models.session import SessionState
 from models.user import User
+from sessions.keys import load_public, load_secret
+from sessions.service import session_store
 
 from routes.authenticate.constants import JWT_ALGORITHM, JWT_SECRET
 
@@ -19,10 +21,11 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="authenticate")
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], request: Request) -> User:
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGORITHM)
-    except InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid username or password")
+    with phase("jwt"):
+        try:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGORITHM)
+        except InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid username or password")
 
     if not (client := request.client):
         raise HTTPException(status_code=401, detail="Invalid client")
@@ -30,28 +33,39 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], reques
     if not (user_id := payload.get("id")):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    redis = Redis()
+    now = datetime.now(tz=pytz.utc)
+    session_id = payload.get("session")
+    cache = SessionCache()
+    if cached_user := cache.get(user_id, session_id, client.host, now):
+        return cached_user
 
-    if not (raw_date := await redis.get(f"{user_id}-expiry")):
-        raise HTTPException(status_code=401, detail="Invalid username or password")
+    epoch = cache.epoch
+    state, session = await session_store().fetch(user_id, session_id, client.host, now)
 
-    expiry = datetime.fromisoformat(raw_date)
-    if expiry < datetime.now(tz=pytz.utc):
+    if state is SessionState.EXPIRED:
         raise HTTPException(status_code=401, detail="Token has expired")
 
-    ip = await redis.get(f"{user_id}-ip")
-    if not ip or ip != client.host:
+    if state is SessionState.WRONG_IP:
         raise HTTPException(status_code=401, detail="Invalid ip please reauthenticate")
 
-    secret_b64, public_b64 = await asyncio.gather(
-        redis.get(f"{user_id}-secret"),
-        redis.get(f"{user_id}-public"),
-    )
-    if not secret_b64 or not public_b64:
+    if not session:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    secret = Secret.from_b64(secret_b64)
-    public = Public.from_b64(public_b64)
-    user = await Psql().fetch_row(GET_USER_FROM_ID, user_id)
+    with phase("keys"):
+        secret = load_secret(session.secret)
+        public = load_public(session.public)
+
+    if not (name := session.name):
+        with phase("user_lookup"):
+            user = await Psql().fetch_row(GET_USER_FROM_ID, user_id)
+
+        if not user:
+            raise HTTPException(status_code=401, detail="Invalid username or password")
+
+        name = user["name"]
+
+    current_user = User(id=user_id, name=name, public=public, secret=secret)
+    if session.id:
+        cache.put(current_user, session.id, client.host, session.expiry, now, epoch)
 
-    return User(id=str(user["id"]), name=user["name"], public=public, secret=secret)
+    return current_user
@@ -0,0 +1,52 @@
+import hmac
+from typing import Annotated
+
+from admission.service import Admission
+from db.psql.client import Psql
+from db.redis.session_cache import SessionCache
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from hashing.service import Hasher
+from keypairs.service import Keypairs
+from lwe import pool_stats
+from metrics.constants import METRICS_TOKEN
+from metrics.registry import Metrics
+
+SESSION_CACHE_COUNTERS = ("hits", "misses", "evictions", "invalidations")
+KEYPAIR_COUNTERS = ("produced", "hits", "misses")
+ADMISSION_COUNTERS = ("admitted", "rejected", "expired")
+
+metrics_scheme = HTTPBearer(auto_error=False)
+
+
+def check_metrics_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(metrics_scheme)],
+) -> None:
+    if not (
+        METRICS_TOKEN and credentials and hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode())
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+def render_metrics() -> str:
+    session_cache = SessionCache().stats()
+    lwe_pool = pool_stats()
+    keypairs = Keypairs().stats()
+    admission = Admission().stats()
+
+    counters = {
+        "session_cache": {key: session_cache[key] for key in SESSION_CACHE_COUNTERS},
+        "lwe_pool": {"completed": lwe_pool["completed"]},
+        "keypair_pool": {key: keypairs[key] for key in KEYPAIR_COUNTERS},
+        "auth_admission": {key: admission[key] for key in ADMISSION_COUNTERS},
+    }
+    gauges = {
+        "session_cache": {"size": session_cache["size"]},
+        "hashing": Hasher().stats(),
+        "psql_pool": Psql().stats(),
+        "lwe_pool": {"threads": lwe_pool["threads"], "in_flight": lwe_pool["in_flight"]},
+        "keypair_pool": {"size": keypairs["size"], "capacity": keypairs["capacity"]},
+        "auth_admission": {"running": admission["running"], "waiting": admission["waiting"]},
+    }
+
+    return Metrics().render(counters, gauges)
@@ -1,19 +1,23 @@
 import uuid
 
 import asyncpg
-import bcrypt
 from db.psql.client import Psql
 from db.psql.users.queries import ADD_USER
 from fastapi import HTTPException
+from hashing.service import Hasher
 from models.new.inbound import NewIn
 from models.new.outbound import NewOut
+from usernames.service import Usernames
 
 from routes.new.constants import SALT
 
 
 async def create_user(user: NewIn) -> NewOut:
+    hashed_password = await Hasher().hashpw(user.password.encode(), SALT)
+    await Usernames().add(user.username)
+
     try:
-        await Psql().execute(ADD_USER, str(uuid.uuid4()), user.username, bcrypt.hashpw(user.password.encode(), SALT))
+        await Psql().execute(ADD_USER, str(uuid.uuid4()), user.username, hashed_password)
     except asyncpg.PostgresError:
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
@@ -0,0 +1,8 @@
+import os
+
+from dotenv import load_dotenv
+from lwe import MAX_MESSAGE_CHARS
+
+load_dotenv()
+BULK_ENTRY_CHARS = 192
+BULK_MAX_ENTRIES = min(int(os.getenv("BULK_MAX_ENTRIES", "5000")), MAX_MESSAGE_CHARS // BULK_ENTRY_CHARS)
@@ -0,0 +1,20 @@
+from db.psql.client import Psql
+from db.psql.passwords.queries import GET_PASSWORDS, REKEY_PASSWORDS
+from models.password.get import GetPasswordOut, GetPasswordsIn, GetPasswordsOut
+from models.user import User
+
+from routes.password.name_index import bcrypt_name_keys, migrating, name_keys
+
+
+async def fetch_passwords(get_passwords_in: GetPasswordsIn, user: User) -> GetPasswordsOut:
+    names = list(dict.fromkeys(get_passwords_in.names))
+    keys = dict(zip(await name_keys(names), names, strict=True))
+    rows = await Psql().fetch(GET_PASSWORDS, list(keys), user.id)
+
+    found = {row["name"] for row in rows}
+    if migrating() and (missing := [key for key in keys if key not in found]):
+        legacy = await bcrypt_name_keys([keys[key] for key in missing])
+        rows.extend(await Psql().fetch(REKEY_PASSWORDS, missing, legacy, user.id))
+
+    passwords = {keys[row["name"]]: GetPasswordOut(username=row["username"], password=row["password"]) for row in rows}
+    return GetPasswordsOut(passwords=passwords, missing=[name for name in names if name not in passwords])
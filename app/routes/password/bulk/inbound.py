@@ -0,0 +1,7 @@
+from pydantic import RootModel
+
+from routes.password.post.inbound import SetPasswordIn
+
+
+class SetPasswordsIn(RootModel[list[SetPasswordIn]]):
+    pass
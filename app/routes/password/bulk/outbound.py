@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+from routes.password.post.outbound import SetPasswordOut
+
+
+class BulkPasswordOut(BaseModel):
+    results: list[SetPasswordOut]
+    stored: int
+    failed: int
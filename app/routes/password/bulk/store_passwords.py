@@ -0,0 +1,45 @@
+import uuid
+
+from db.psql.client import Psql
+from db.psql.passwords.queries import INSERT_PASSWORDS, REKEY_PASSWORDS
+from models.user import User
+
+from routes.password.bulk.outbound import BulkPasswordOut
+from routes.password.name_index import bcrypt_name_keys, migrating, name_keys
+from routes.password.post.inbound import SetPasswordIn
+from routes.password.post.outbound import SetPasswordOut
+
+
+async def store_passwords(set_passwords_in: list[SetPasswordIn], user: User) -> BulkPasswordOut:
+    entries: dict[str, SetPasswordIn] = {}
+    for entry in set_passwords_in:
+        entries.setdefault(entry.name, entry)
+
+    keys = await name_keys(list(entries))
+
+    legacy = []
+    if migrating():
+        legacy = await bcrypt_name_keys(list(entries))
+
+    async with Psql().transaction() as connection:
+        if legacy:
+            await Psql().execute(REKEY_PASSWORDS, keys, legacy, user.id, connection=connection)
+
+        rows = await Psql().fetch(
+            INSERT_PASSWORDS,
+            [uuid.uuid4() for _ in entries],
+            [user.id] * len(entries),
+            [entry.username for entry in entries.values()],
+            [entry.password for entry in entries.values()],
+            keys,
+            connection=connection,
+        )
+
+    stored = {row["name"] for row in rows}
+    keys_by_name = dict(zip(entries, keys, strict=True))
+    results = []
+    for entry in set_passwords_in:
+        success = entries.get(entry.name) is entry and keys_by_name[entry.name] in stored
+        results.append(SetPasswordOut(name=entry.name, success=success))
+
+    return BulkPasswordOut(results=results, stored=len(stored), failed=len(results) - len(stored))
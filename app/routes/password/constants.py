@@ -0,0 +1,11 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+NAME_INDEX = os.getenv("NAME_INDEX", "bcrypt")
+NAME_INDEX_KEY = os.getenv("NAME_INDEX_KEY", "").encode()
+NAME_INDEX_MIGRATE = os.getenv("NAME_INDEX_MIGRATE", "false").lower() == "true"
+
+if NAME_INDEX == "hmac" and not NAME_INDEX_KEY:
+    raise ValueError("NAME_INDEX_KEY not set")
@@ -0,0 +1,20 @@
+from db.psql.client import Psql
+from db.psql.passwords.queries import GET_PASSWORD, REKEY_PASSWORD
+from fastapi import HTTPException
+from models.password.get import GetPasswordIn, GetPasswordOut
+from models.user import User
+
+from routes.password.name_index import bcrypt_name_key, migrating, name_key
+
+
+async def fetch_password(get_password_in: GetPasswordIn, user: User) -> GetPasswordOut:
+    key = await name_key(get_password_in.name)
+    row = await Psql().fetch_row(GET_PASSWORD, key, user.id)
+
+    if not row and migrating():
+        row = await Psql().fetch_row(REKEY_PASSWORD, key, await bcrypt_name_key(get_password_in.name), user.id)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Password not found")
+
+    return GetPasswordOut(username=row["username"], password=row["password"])
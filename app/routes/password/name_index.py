@@ -0,0 +1,37 @@
+import hashlib
+import hmac
+
+from hashing.service import Hasher
+
+from routes.password.constants import NAME_INDEX, NAME_INDEX_KEY, NAME_INDEX_MIGRATE
+from routes.password.post.constants import USER_SALT
+
+
+async def bcrypt_name_key(name: str) -> bytes:
+    return await Hasher().hashpw(name.encode(), USER_SALT)
+
+
+async def bcrypt_name_keys(names: list[str]) -> list[bytes]:
+    return await Hasher().hashpw_many([name.encode() for name in names], USER_SALT)
+
+
+def hmac_name_key(name: str) -> bytes:
+    return hmac.new(NAME_INDEX_KEY, name.encode(), hashlib.sha256).digest()
+
+
+async def name_key(name: str) -> bytes:
+    if NAME_INDEX == "hmac":
+        return hmac_name_key(name)
+
+    return await bcrypt_name_key(name)
+
+
+async def name_keys(names: list[str]) -> list[bytes]:
+    if NAME_INDEX == "hmac":
+        return [hmac_name_key(name) for name in names]
+
+    return await bcrypt_name_keys(names)
+
+
+def migrating() -> bool:
+    return NAME_INDEX == "hmac" and NAME_INDEX_MIGRATE
@@ -0,0 +1,26 @@
+import uuid
+
+from db.psql.client import Psql
+from db.psql.passwords.queries import INSERT_PASSWORD, REKEY_PASSWORD
+from models.user import User
+
+from routes.password.name_index import bcrypt_name_key, migrating, name_key
+from routes.password.post.inbound import SetPasswordIn
+from routes.password.post.outbound import SetPasswordOut
+
+
+async def store_password(set_password_in: SetPasswordIn, user: User) -> SetPasswordOut:
+    key = await name_key(set_password_in.name)
+
+    if migrating():
+        await Psql().execute(REKEY_PASSWORD, key, await bcrypt_name_key(set_password_in.name), user.id)
+
+    await Psql().execute(
+        INSERT_PASSWORD,
+        uuid.uuid4(),
+        user.id,
+        set_password_in.username,
+        set_password_in.password,
+        key,
+    )
+    return SetPasswordOut(name=set_password_in.name)
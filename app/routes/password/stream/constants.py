@@ -0,0 +1,6 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "100"))
@@ -0,0 +1,26 @@
+from collections.abc import AsyncIterator
+
+from db.psql.client import Psql
+from db.psql.passwords.queries import LIST_PASSWORDS
+from lwe.model_encrypt import encrypt_many
+from models.password.get import ListedPasswordOut
+from models.user import User
+
+from routes.password.stream.constants import STREAM_BATCH_SIZE
+
+
+async def encrypt_lines(batch: list[ListedPasswordOut], user: User) -> bytes:
+    return b"".join(encrypted.model_dump_json().encode() + b"\n" for encrypted in await encrypt_many(batch, user))
+
+
+async def stream_passwords(user: User) -> AsyncIterator[bytes]:
+    batch = []
+    async for row in Psql().stream(LIST_PASSWORDS, user.id):
+        batch.append(ListedPasswordOut(id=str(row["id"]), username=row["username"], password=row["password"]))
+
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield await encrypt_lines(batch, user)
+            batch = []
+
+    if batch:
+        yield await encrypt_lines(batch, user)
@@ -0,0 +1,4 @@
+from server.launcher import serve
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,15 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")  # noqa: S104
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", str(os.process_cpu_count() or 1)))
+SERVER_LOOP = os.getenv("SERVER_LOOP", "auto")
+SERVER_HTTP = os.getenv("SERVER_HTTP", "auto")
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_KEEP_ALIVE = int(os.getenv("SERVER_KEEP_ALIVE", "5"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+SERVER_PSQL_CONNECTIONS = int(os.getenv("SERVER_PSQL_CONNECTIONS", "40"))
+SERVER_REDIS_CONNECTIONS = int(os.getenv("SERVER_REDIS_CONNECTIONS", "256"))
@@ -0,0 +1,59 @@
+import os
+
+import uvicorn
+from sessions.constants import SESSION_STORE
+from usernames.constants import USERNAME_FILTER
+
+from server.constants import (
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_HTTP,
+    SERVER_KEEP_ALIVE,
+    SERVER_LOOP,
+    SERVER_PORT,
+    SERVER_PSQL_CONNECTIONS,
+    SERVER_REDIS_CONNECTIONS,
+    SERVER_WORKERS,
+)
+
+
+def share(total: int, workers: int) -> str:
+    return str(max(1, total // workers))
+
+
+def worker_environment(workers: int) -> dict[str, str]:
+    connections = share(SERVER_PSQL_CONNECTIONS, workers)
+    threads = share(os.process_cpu_count() or 1, workers)
+    return {
+        "PSQL_MIN_SIZE": connections,
+        "PSQL_MAX_SIZE": connections,
+        "REDIS_MAX_CONNECTIONS": share(SERVER_REDIS_CONNECTIONS, workers),
+        "HASHING_WORKERS": threads,
+        "LWE_THREADS": threads,
+    }
+
+
+def serve() -> None:
+    workers = max(1, SERVER_WORKERS)
+    if workers > 1 and SESSION_STORE == "memory":
+        raise SystemExit("SESSION_STORE=memory keeps sessions per process; set SERVER_WORKERS=1 or use redis")
+
+    for name, value in worker_environment(workers).items():
+        os.environ.setdefault(name, value)
+
+    if workers > 1 and USERNAME_FILTER == "local":
+        os.environ["USERNAME_FILTER"] = "redis"
+
+    uvicorn.run(
+        "main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        workers=workers,
+        loop=SERVER_LOOP,
+        http=SERVER_HTTP,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        access_log=False,
+    )
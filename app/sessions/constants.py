@@ -0,0 +1,7 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+SESSION_STORE = os.getenv("SESSION_STORE", "redis")
+SESSION_STORE_MAX_ENTRIES = int(os.getenv("SESSION_STORE_MAX_ENTRIES", "100000"))
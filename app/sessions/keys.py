@@ -0,0 +1,15 @@
+from lwe import Public, Secret
+
+
+def load_secret(raw: bytes) -> Secret:
+    try:
+        return Secret.from_bytes(raw)
+    except ValueError:
+        return Secret.from_b64(raw.decode())
+
+
+def load_public(raw: bytes) -> Public:
+    try:
+        return Public.from_bytes(raw)
+    except ValueError:
+        return Public.from_b64(raw.decode())
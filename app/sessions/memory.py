@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from datetime import datetime
+from time import monotonic
+from typing import Self
+
+from db.redis.session_cache import SessionCache
+from models.session import Session, SessionState, StoredSession
+
+from sessions.constants import SESSION_STORE_MAX_ENTRIES
+from sessions.store import SessionBackend
+
+
+class MemorySessionStore(SessionBackend):
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.reset()
+
+        return cls.cache
+
+    def reset(self: Self) -> None:
+        self.entries: OrderedDict[str, StoredSession] = OrderedDict()
+        self.evictions = 0
+
+    def get(self: Self, user_id: str) -> StoredSession | None:
+        if not (entry := self.entries.get(user_id)):
+            return None
+
+        if entry.deadline < monotonic():
+            del self.entries[user_id]
+            return None
+
+        return entry
+
+    async def create(self: Self, user_id: str, session: Session, ip: str, ex: int) -> None:
+        self.entries[user_id] = StoredSession(session=session, ip=ip, deadline=monotonic() + ex)
+        self.entries.move_to_end(user_id)
+
+        while len(self.entries) > SESSION_STORE_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    async def fetch(
+        self: Self, user_id: str, session_id: str | None, ip: str, now: datetime
+    ) -> tuple[SessionState, Session | None]:
+        if not (entry := self.get(user_id)) or (session_id and entry.session.id != session_id):
+            return SessionState.MISSING, None
+
+        if entry.session.expiry < now:
+            return SessionState.EXPIRED, None
+
+        if entry.ip != ip:
+            return SessionState.WRONG_IP, None
+
+        return SessionState.VALID, entry.session
+
+    async def invalidate(self: Self, user_id: str) -> None:
+        if entry := self.get(user_id):
+            entry.session = entry.session.model_copy(update={"name": None})
+
+        SessionCache().invalidate(user_id)
+
+    def stats(self: Self) -> dict[str, int]:
+        return {"size": len(self.entries), "evictions": self.evictions}
@@ -0,0 +1,12 @@
+from db.redis.session import SessionStore
+
+from sessions.constants import SESSION_STORE
+from sessions.memory import MemorySessionStore
+from sessions.store import SessionBackend
+
+
+def session_store() -> SessionBackend:
+    if SESSION_STORE == "memory":
+        return MemorySessionStore()
+
+    return SessionStore()
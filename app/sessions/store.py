@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Self
+
+from models.session import Session, SessionState
+
+
+class SessionBackend(ABC):
+    @abstractmethod
+    async def create(self: Self, user_id: str, session: Session, ip: str, ex: int) -> None: ...
+
+    @abstractmethod
+    async def fetch(
+        self: Self, user_id: str, session_id: str | None, ip: str, now: datetime
+    ) -> tuple[SessionState, Session | None]: ...
+
+    @abstractmethod
+    async def invalidate(self: Self, user_id: str) -> None: ...
@@ -0,0 +1,22 @@
+import math
+from hashlib import blake2b
+from typing import Self
+
+
+class BloomFilter:
+    def __init__(self: Self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+
+    def positions(self: Self, name: str) -> list[int]:
+        digest = blake2b(name.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self: Self, name: str) -> None:
+        for position in self.positions(name):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self: Self, name: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(name))
@@ -0,0 +1,14 @@
+import os
+
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+USERNAME_FILTER = os.getenv("USERNAME_FILTER", "off")
+USERNAME_FILTER_CAPACITY = int(os.getenv("USERNAME_FILTER_CAPACITY", "1000000"))
+USERNAME_FILTER_ERROR_RATE = float(os.getenv("USERNAME_FILTER_ERROR_RATE", "0.001"))
+USERNAME_FILTER_KEY = os.getenv("USERNAME_FILTER_KEY", "usernames-filter")
+USERNAME_FILTER_RETIRE_AFTER = int(os.getenv("USERNAME_FILTER_RETIRE_AFTER", "86400"))
+USERNAME_FILTER_BATCH = 1000
+USERNAME_DUMMY_SALT = (os.getenv("SALT") or bcrypt.gensalt().decode()).encode()
+LOOKUP_LATENCY_WEIGHT = 0.1
@@ -0,0 +1,143 @@
+import asyncio
+import secrets
+from time import perf_counter
+from typing import Self
+
+from asyncpg import Record
+from db.psql.client import Psql
+from db.psql.users.queries import GET_USER, LIST_USERNAMES
+from db.redis.client import Redis
+from hashing.service import Hasher
+from metrics.timing import phase
+
+from usernames.bloom import BloomFilter
+from usernames.constants import (
+    LOOKUP_LATENCY_WEIGHT,
+    USERNAME_DUMMY_SALT,
+    USERNAME_FILTER,
+    USERNAME_FILTER_BATCH,
+    USERNAME_FILTER_CAPACITY,
+    USERNAME_FILTER_ERROR_RATE,
+    USERNAME_FILTER_KEY,
+    USERNAME_FILTER_RETIRE_AFTER,
+)
+
+
+class Usernames:
+    cache: Self | None = None
+
+    def __new__(cls: type[Self]) -> Self:
+        if not cls.cache:
+            cls.cache = super().__new__(cls)
+            cls.cache.bloom = BloomFilter(USERNAME_FILTER_CAPACITY, USERNAME_FILTER_ERROR_RATE)
+            cls.cache.ready = False
+            cls.cache.dummy = None
+            cls.cache.rebuilding = None
+            cls.cache.latency = 0.0
+
+        return cls.cache
+
+    async def __aenter__(self: Self) -> Self:
+        self.dummy = await Hasher().hashpw(secrets.token_bytes(16), USERNAME_DUMMY_SALT)
+        if USERNAME_FILTER in ("local", "redis"):
+            await self.build()
+
+        return self
+
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        self.ready = False
+        if self.rebuilding:
+            self.rebuilding.cancel()
+            self.rebuilding = None
+
+    @property
+    def shared(self: Self) -> bool:
+        return USERNAME_FILTER == "redis"
+
+    @property
+    def key(self: Self) -> str:
+        return f"{USERNAME_FILTER_KEY}:{USERNAME_FILTER_CAPACITY}:{USERNAME_FILTER_ERROR_RATE}"
+
+    async def retire(self: Self) -> None:
+        async for key in Redis().redis.scan_iter(match=f"{USERNAME_FILTER_KEY}*"):
+            if key.decode() not in (self.key, f"{self.key}-ready") and await Redis().redis.ttl(key) < 0:
+                await Redis().redis.expire(key, USERNAME_FILTER_RETIRE_AFTER)
+
+    async def build(self: Self) -> None:
+        if self.shared:
+            await self.retire()
+            if await Redis().redis.exists(f"{self.key}-ready"):
+                self.ready = True
+                return
+
+        names = []
+        async for row in Psql().stream(LIST_USERNAMES):
+            names.append(row["name"])
+            if len(names) >= USERNAME_FILTER_BATCH:
+                await self.add_many(names)
+                names = []
+
+        await self.add_many(names)
+
+        if self.shared:
+            await Redis().redis.set(f"{self.key}-ready", 1)
+
+        self.ready = True
+
+    async def add_many(self: Self, names: list[str]) -> None:
+        if not self.shared:
+            for name in names:
+                self.bloom.add(name)
+            return
+
+        async with Redis().redis.pipeline(transaction=False) as pipe:
+            for name in names:
+                for position in self.bloom.positions(name):
+                    pipe.setbit(self.key, position, 1)
+
+            await pipe.execute()
+
+    async def add(self: Self, name: str) -> None:
+        if USERNAME_FILTER in ("local", "redis"):
+            await self.add_many([name])
+
+    async def might_exist(self: Self, name: str) -> bool:
+        if not self.ready:
+            return True
+
+        if not self.shared:
+            return name in self.bloom
+
+        async with Redis().redis.pipeline(transaction=False) as pipe:
+            pipe.exists(f"{self.key}-ready")
+            for position in self.bloom.positions(name):
+                pipe.getbit(self.key, position)
+
+            ready, *bits = await pipe.execute()
+
+        if not ready:
+            self.rebuild()
+            return True
+
+        return all(bits)
+
+    def rebuild(self: Self) -> None:
+        if not self.rebuilding or self.rebuilding.done():
+            self.rebuilding = asyncio.create_task(self.build())
+
+    async def lookup(self: Self, name: str) -> Record | None:
+        if not await self.might_exist(name):
+            with phase("psql"):
+                await asyncio.sleep(self.latency)
+            return None
+
+        start = perf_counter()
+        row = await Psql().fetch_row(GET_USER, name)
+        self.latency += (perf_counter() - start - self.latency) * LOOKUP_LATENCY_WEIGHT
+        return row
+
+    async def reject(self: Self, password: bytes) -> None:
+        if not self.dummy:
+            self.dummy = await Hasher().hashpw(secrets.token_bytes(16), USERNAME_DUMMY_SALT)
+
+        await Hasher().checkpw(password, self.dummy)
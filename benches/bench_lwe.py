@@ -0,0 +1,116 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from lwe import Public, Secret, pool_stats
+
+LENGTHS = (1, 10, 100, 1_000, 10_000, 100_000)
+ALPHABETS = {"ascii": (0x20, 0x7E), "cjk": (0x4E00, 0x9FFF)}
+MIN_RUNS = 5
+KEYS = Path(__file__).with_name("lwe_keys.json")
+
+
+def message(rng: random.Random, length: int, alphabet: str) -> str:
+    low, high = ALPHABETS[alphabet]
+    return "".join(chr(rng.randint(low, high)) for _ in range(length))
+
+
+def measure(func: Callable[[], Any], min_time: float) -> dict[str, float]:
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < MIN_RUNS or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+
+    return {
+        "runs": len(timings),
+        "min_ns": min(timings),
+        "median_ns": statistics.median(timings),
+        "mean_ns": statistics.fmean(timings),
+        "stdev_ns": statistics.stdev(timings),
+    }
+
+
+def load_keys(path: Path) -> tuple[Secret, Public]:
+    if not path.exists():
+        secret = Secret()
+        public = secret.generate_public_key()
+        path.write_text(json.dumps({"secret": secret.to_b64(), "public": public.to_b64(compact=False)}, indent=2))
+
+    keys = json.loads(path.read_text())
+    return Secret.from_b64(keys["secret"]), Public.from_b64(keys["public"])
+
+
+def run(seed: int, keys: Path, min_time: float, lengths: tuple[int, ...]) -> dict[str, Any]:
+    rng = random.Random(seed)  # noqa: S311
+    secret, public = load_keys(keys)
+    secret_b64 = secret.to_b64()
+
+    results = {
+        "secret_new": measure(Secret, min_time),
+        "generate_public_key": measure(secret.generate_public_key, min_time),
+        "b64/secret_to_b64": measure(secret.to_b64, min_time),
+        "b64/secret_from_b64": measure(lambda: Secret.from_b64(secret_b64), min_time),
+    }
+
+    for name, compact in (("compact", True), ("full", False)):
+        public_b64 = public.to_b64(compact=compact)
+        results[f"b64/public_to_b64/{name}"] = measure(lambda c=compact: public.to_b64(compact=c), min_time)
+        results[f"b64/public_from_b64/{name}"] = measure(lambda b=public_b64: Public.from_b64(b), min_time)
+
+    for alphabet in ALPHABETS:
+        for length in lengths:
+            plain = message(rng, length, alphabet)
+            encrypted = public.encrypt(plain)
+            results[f"encrypt/{alphabet}/{length}"] = measure(lambda p=plain: public.encrypt(p), min_time)
+            results[f"decrypt/{alphabet}/{length}"] = measure(lambda e=encrypted: secret.decrypt(e), min_time)
+
+    return {
+        "seed": seed,
+        "keys": str(keys),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "threads": pool_stats()["threads"],
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> dict[str, float]:
+    return {
+        name: result["median_ns"] / baseline["results"][name]["median_ns"]
+        for name, result in current["results"].items()
+        if name in baseline["results"]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the lwe extension")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keys", type=Path, default=KEYS, help="serialized keys to reuse, written on first run")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds spent on each benchmark")
+    parser.add_argument("--lengths", type=int, nargs="+", default=LENGTHS)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare median timings against")
+    args = parser.parse_args()
+
+    results = run(args.seed, args.keys, args.min_time, tuple(args.lengths))
+    if args.baseline:
+        results["ratio_to_baseline"] = compare(json.loads(args.baseline.read_text()), results)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Self
+from unittest.mock import AsyncMock, patch
+from urllib.parse import urlencode
+
+import bcrypt
+from lwe import Public, Secret
+from stand_ins import MemoryPool, MemoryRedis
+
+type ASGIApp = Callable[..., Awaitable[None]]
+type Response = tuple[int, dict[str, Any]]
+
+CLIENT = ("127.0.0.1", 50000)
+
+
+async def call(
+    app: ASGIApp, method: str, path: str, body: bytes = b"", headers: dict[str, str] | None = None
+) -> Response:
+    done = asyncio.Event()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 500
+    chunks = []
+
+    async def receive() -> dict[str, Any]:
+        if messages:
+            return messages.pop()
+
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                done.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+        "client": CLIENT,
+        "server": ("loadtest", 80),
+    }
+
+    await app(scope, receive, send)
+    content = b"".join(chunks)
+    return status, json.loads(content) if content else {}
+
+
+class Client:
+    def __init__(self: Self, app: ASGIApp, rng: random.Random, index: int) -> None:
+        self.app = app
+        self.username = f"load-{rng.getrandbits(64):016x}-{index}"
+        self.password = f"{rng.getrandbits(128):032x}"
+        self.secret = Secret()
+        self.public = self.secret.generate_public_key().to_b64()
+        self.token = ""
+        self.server_key: Public | None = None
+        self.names: list[str] = []
+
+    async def new(self: Self) -> Response:
+        return await self.json("POST", "/new", {"username": self.username, "password": self.password})
+
+    async def authenticate(self: Self) -> Response:
+        form = {"username": self.username, "password": self.password, "client_secret": self.public}
+        headers = {"content-type": "application/x-www-form-urlencoded"}
+        status, body = await call(self.app, "POST", "/authenticate", urlencode(form).encode(), headers)
+
+        if status == 200:
+            self.token = body["access_token"]
+            self.server_key = Public.from_b64(body["public_key"])
+
+        return status, body
+
+    async def set_password(self: Self, rng: random.Random) -> Response:
+        name = f"site-{len(self.names)}-{rng.getrandbits(32):08x}.example"
+        content = {"name": name, "username": self.username, "password": f"{rng.getrandbits(128):032x}"}
+        status, body = await self.encrypted("POST", "/password", content)
+
+        if status == 200:
+            self.names.append(name)
+
+        return status, body
+
+    async def get_password(self: Self, rng: random.Random) -> Response:
+        status, body = await self.encrypted("GET", "/password", {"name": rng.choice(self.names)})
+
+        if status == 200:
+            body = json.loads(await self.secret.decrypt_async(body["content"]))
+
+        return status, body
+
+    async def encrypted(self: Self, method: str, path: str, content: dict[str, Any]) -> Response:
+        if not self.server_key:
+            raise RuntimeError(f"{self.username} is not authenticated")
+
+        encrypted = await self.server_key.encrypt_async(json.dumps(content))
+        return await self.json(method, path, {"content": encrypted}, {"authorization": f"Bearer {self.token}"})
+
+    async def json(
+        self: Self, method: str, path: str, content: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> Response:
+        headers = {"content-type": "application/json", **(headers or {})}
+        return await call(self.app, method, path, json.dumps(content).encode(), headers)
+
+
+async def phase(requests: int, concurrency: int, send: Callable[[int], Awaitable[Response]]) -> dict[str, Any]:
+    latencies = []
+    statuses: dict[str, int] = {}
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        for index in queue:
+            start = time.perf_counter()
+            status, _ = await send(index)
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "statuses": statuses,
+        "seconds": elapsed,
+        "throughput_rps": requests / elapsed if elapsed else 0,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "max_ms": max(latencies, default=0) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with AsyncExitStack() as stack:
+        from db.redis.client import Redis
+        from main import app
+
+        if args.backend == "memory":
+            latency = args.latency / 1000
+            stack.enter_context(
+                patch("db.psql.client.asyncpg.create_pool", AsyncMock(return_value=MemoryPool(latency)))
+            )
+            Redis().redis = MemoryRedis(latency)
+
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        await asyncio.sleep(0)
+
+        rng = random.Random(args.seed)  # noqa: S311
+        clients = [Client(app, rng, index) for index in range(args.users)]
+        requests = args.requests
+
+        results = {
+            "/new": await phase(len(clients), args.concurrency, lambda i: clients[i].new()),
+            "/authenticate": await phase(
+                requests, args.concurrency, lambda i: clients[i % len(clients)].authenticate()
+            ),
+        }
+        results["POST /password"] = await phase(
+            requests, args.concurrency, lambda i: clients[i % len(clients)].set_password(rng)
+        )
+        results["GET /password"] = await phase(
+            requests, args.concurrency, lambda i: clients[i % len(clients)].get_password(rng)
+        )
+
+    return {
+        "seed": args.seed,
+        "backend": args.backend,
+        "session_store": args.session_store,
+        "users": args.users,
+        "requests": requests,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive the vault API under concurrent load")
+    parser.add_argument("--backend", choices=("memory", "local"), default="memory")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint after /new")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--session-store", choices=("redis", "memory"), default="redis")
+    parser.add_argument("--latency", type=float, default=0, help="simulated round trip in ms for memory stand-ins")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="cost for the generated memory backend salts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file instead of stdout")
+    args = parser.parse_args()
+
+    os.environ["SESSION_STORE"] = args.session_store
+    if args.backend == "memory":
+        for salt in ("SALT", "USER_SALT"):
+            os.environ.setdefault(salt, bcrypt.gensalt(args.bcrypt_rounds).decode())
+        os.environ.setdefault("JWT_SECRET", secrets.token_hex(32))
+
+    output = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
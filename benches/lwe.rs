@@ -0,0 +1,98 @@
+use base64::prelude::*;
+use criterion::{criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+use lwe::keys::public::Public;
+use lwe::keys::secret::Secret;
+use rand::{Rng, SeedableRng};
+use rand_chacha::ChaCha8Rng;
+use std::hint::black_box;
+use zerocopy::FromBytes;
+
+const SEED: u64 = 0x5EED;
+const LENGTHS: [usize; 6] = [1, 10, 100, 1_000, 10_000, 100_000];
+const ALPHABETS: [(&str, u32, u32); 2] = [("ascii", 0x20, 0x7E), ("cjk", 0x4E00, 0x9FFF)];
+
+fn message(rng: &mut ChaCha8Rng, length: usize, low: u32, high: u32) -> String {
+    (0..length)
+        .map(|_| char::from_u32(rng.random_range(low..=high)).expect("alphabet is valid"))
+        .collect()
+}
+
+fn keys(c: &mut Criterion) {
+    let mut rng = ChaCha8Rng::seed_from_u64(SEED);
+    let secret = Secret::from_rng(&mut rng);
+
+    c.bench_function("secret_new", |b| b.iter(Secret::new));
+    c.bench_function("generate_public_key", |b| {
+        b.iter(|| secret.generate_public_key_with(&mut rng))
+    });
+}
+
+fn encoding(c: &mut Criterion) {
+    let mut rng = ChaCha8Rng::seed_from_u64(SEED);
+    let secret = Secret::from_rng(&mut rng);
+    let public = secret.generate_public_key_with(&mut rng);
+
+    let mut group = c.benchmark_group("b64");
+    group.bench_function("secret_to_b64", |b| b.iter(|| secret.to_b64()));
+    group.bench_function("secret_from_b64", |b| {
+        let encoded = secret.to_b64();
+        b.iter(|| {
+            Secret::read_from_bytes(&BASE64_URL_SAFE.decode(black_box(&encoded)).unwrap()).unwrap()
+        })
+    });
+
+    for compact in [true, false] {
+        let name = if compact { "compact" } else { "full" };
+        let encoded = public.to_b64(compact);
+
+        group.bench_function(BenchmarkId::new("public_to_b64", name), |b| {
+            b.iter(|| public.to_b64(compact))
+        });
+        group.bench_function(BenchmarkId::new("public_from_b64", name), |b| {
+            b.iter(|| Public::parse(&BASE64_URL_SAFE.decode(black_box(&encoded)).unwrap()).unwrap())
+        });
+    }
+
+    group.finish();
+}
+
+fn messages(c: &mut Criterion) {
+    let mut rng = ChaCha8Rng::seed_from_u64(SEED);
+    let secret = Secret::from_rng(&mut rng);
+    let public = secret.generate_public_key_with(&mut rng);
+
+    for (alphabet, low, high) in ALPHABETS {
+        let mut encrypt = c.benchmark_group(format!("encrypt/{alphabet}"));
+        let mut decrypt = Vec::with_capacity(LENGTHS.len());
+
+        for length in LENGTHS {
+            let message = message(&mut rng, length, low, high);
+            encrypt.throughput(Throughput::Elements(length as u64));
+            if length >= 10_000 {
+                encrypt.sample_size(10);
+            }
+
+            encrypt.bench_with_input(BenchmarkId::from_parameter(length), &message, |b, m| {
+                b.iter(|| public.encrypt(m, false))
+            });
+            decrypt.push((length, public.encrypt(&message, false)));
+        }
+        encrypt.finish();
+
+        let mut group = c.benchmark_group(format!("decrypt/{alphabet}"));
+        for (length, encrypted) in decrypt {
+            group.throughput(Throughput::Elements(length as u64));
+            if length >= 10_000 {
+                group.sample_size(10);
+            }
+
+            group.bench_with_input(BenchmarkId::from_parameter(length), &encrypted, |b, e| {
+                b.iter(|| secret.decrypt(e).unwrap())
+            });
+        }
+        group.finish();
+    }
+}
+
+criterion_group!(benches, keys, encoding, messages);
+criterion_main!(benches);
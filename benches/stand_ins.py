@@ -0,0 +1,306 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from fnmatch import fnmatchcase
+from types import SimpleNamespace
+from typing import Any, Self
+from uuid import UUID
+
+from asyncpg.exceptions import UniqueViolationError
+from db.psql.passwords.queries import (
+    GET_PASSWORD,
+    GET_PASSWORDS,
+    INSERT_PASSWORD,
+    INSERT_PASSWORDS,
+    REKEY_PASSWORD,
+    REKEY_PASSWORDS,
+)
+from db.psql.users.queries import ADD_USER, GET_USER, GET_USER_FROM_ID, LIST_USERNAMES
+from db.redis.scripts import FETCH_SESSION
+
+type Row = dict[str, Any] | None
+type Rows = list[dict[str, Any]]
+
+
+class MemoryPool:
+    def __init__(self: Self, latency: float = 0) -> None:
+        self.latency = latency
+        self.users: dict[str, dict[str, Any]] = {}
+        self.names: dict[str, str] = {}
+        self.passwords: dict[tuple[str, bytes], dict[str, Any]] = {}
+        self.handlers: dict[str, Callable[..., Row | Rows]] = {
+            ADD_USER: self.add_user,
+            GET_USER: self.get_user,
+            GET_USER_FROM_ID: self.get_user_from_id,
+            LIST_USERNAMES: self.list_usernames,
+            INSERT_PASSWORD: self.insert_password,
+            GET_PASSWORD: self.get_password,
+            REKEY_PASSWORD: self.rekey_password,
+            INSERT_PASSWORDS: self.insert_passwords,
+            REKEY_PASSWORDS: self.rekey_passwords,
+            GET_PASSWORDS: self.get_passwords,
+        }
+
+    async def query(self: Self, query: str, *args: Any) -> Row | Rows:  # noqa: ANN401
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if not (handler := self.handlers.get(query)):
+            raise NotImplementedError(query)
+
+        return handler(*args)
+
+    async def execute(self: Self, query: str, *args: Any) -> None:  # noqa: ANN401
+        await self.query(query, *args)
+
+    async def fetchrow(self: Self, query: str, *args: Any) -> Row:  # noqa: ANN401
+        return await self.query(query, *args)
+
+    async def fetch(self: Self, query: str, *args: Any) -> Rows:  # noqa: ANN401
+        return await self.query(query, *args)
+
+    @asynccontextmanager
+    async def acquire(self: Self) -> AsyncIterator[Self]:
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self: Self) -> AsyncIterator[None]:
+        yield
+
+    async def cursor(self: Self, query: str, *args: Any, prefetch: int) -> AsyncIterator[Row]:  # noqa: ANN401, ARG002
+        for row in await self.query(query, *args):
+            yield row
+
+    async def close(self: Self) -> None:
+        pass
+
+    def get_size(self: Self) -> int:
+        return 1
+
+    def get_idle_size(self: Self) -> int:
+        return 1
+
+    def get_min_size(self: Self) -> int:
+        return 1
+
+    def get_max_size(self: Self) -> int:
+        return 1
+
+    def add_user(self: Self, user_id: str, name: str, hashed_password: bytes) -> None:
+        self.users[str(user_id)] = {"id": UUID(str(user_id)), "name": name, "hashed_password": hashed_password}
+        self.names.setdefault(name, str(user_id))
+
+    def get_user(self: Self, name: str) -> Row:
+        return self.users.get(self.names.get(name, ""))
+
+    def get_user_from_id(self: Self, user_id: str) -> Row:
+        return self.users.get(str(user_id))
+
+    def list_usernames(self: Self) -> Rows:
+        return [{"name": name} for name in self.names]
+
+    def insert_password(self: Self, _: UUID, user_id: str, username: str | None, password: str, name: bytes) -> None:
+        if (str(user_id), name) in self.passwords:
+            raise UniqueViolationError("duplicate key value violates unique constraint")
+
+        self.passwords[(str(user_id), name)] = {"username": username, "password": password}
+
+    def insert_passwords(
+        self: Self,
+        _: list[UUID],
+        user_ids: list[str],
+        usernames: list[str | None],
+        passwords: list[str],
+        names: list[bytes],
+    ) -> Rows:
+        rows = []
+        for user_id, username, password, name in zip(user_ids, usernames, passwords, names, strict=True):
+            if (str(user_id), name) not in self.passwords:
+                self.passwords[(str(user_id), name)] = {"username": username, "password": password}
+                rows.append({"name": name})
+
+        return rows
+
+    def rekey_passwords(self: Self, names: list[bytes], legacy: list[bytes], user_id: str) -> Rows:
+        return [
+            {"name": name, **row}
+            for name, old_name in zip(names, legacy, strict=True)
+            if (row := self.rekey_password(name, old_name, user_id))
+        ]
+
+    def get_passwords(self: Self, names: list[bytes], user_id: str) -> Rows:
+        return [{"name": name, **row} for name in names if (row := self.passwords.get((str(user_id), name)))]
+
+    def get_password(self: Self, name: bytes, user_id: str) -> Row:
+        return self.passwords.get((str(user_id), name))
+
+    def rekey_password(self: Self, name: bytes, old_name: bytes, user_id: str) -> Row:
+        if row := self.passwords.pop((str(user_id), old_name), None):
+            self.passwords[(str(user_id), name)] = row
+
+        return row
+
+
+class MemoryPubSub:
+    def __init__(self: Self, redis: "MemoryRedis") -> None:
+        self.redis = redis
+        self.patterns: list[str] = []
+        self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def __aenter__(self: Self) -> Self:
+        self.redis.subscribers.append(self)
+        return self
+
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        self.redis.subscribers.remove(self)
+
+    async def psubscribe(self: Self, *patterns: str) -> None:
+        self.patterns.extend(patterns)
+
+    async def listen(self: Self) -> AsyncGenerator[dict[str, Any], None]:
+        while True:
+            yield await self.messages.get()
+
+
+class MemoryPipeline:
+    def __init__(self: Self, redis: "MemoryRedis") -> None:
+        self.redis = redis
+        self.commands: list[Callable[[], Any]] = []
+
+    async def __aenter__(self: Self) -> Self:
+        return self
+
+    async def __aexit__(self: Self, *_) -> None:  # noqa: ANN002
+        self.commands.clear()
+
+    def hset(self: Self, key: str, mapping: dict[str, Any]) -> Self:
+        self.commands.append(lambda: self.redis.write_hash(key, mapping))
+        return self
+
+    def expire(self: Self, key: str, seconds: int) -> Self:
+        self.commands.append(lambda: self.redis.write_expiry(key, seconds))
+        return self
+
+    def hdel(self: Self, key: str, *fields: str) -> Self:
+        self.commands.append(lambda: self.redis.delete_fields(key, fields))
+        return self
+
+    def publish(self: Self, channel: str, message: str) -> Self:
+        self.commands.append(lambda: self.redis.publish(channel, message))
+        return self
+
+    async def execute(self: Self) -> list[Any]:
+        if self.redis.latency:
+            await asyncio.sleep(self.redis.latency)
+
+        return [command() for command in self.commands]
+
+
+class MemoryRedis:
+    def __init__(self: Self, latency: float = 0) -> None:
+        self.latency = latency
+        self.hashes: dict[str, dict[str, bytes]] = {}
+        self.expiries: dict[str, float] = {}
+        self.config: dict[str, str] = {}
+        self.subscribers: list[MemoryPubSub] = []
+        self.connection_pool = SimpleNamespace(connection_kwargs={})
+        self.scripts: dict[str, Callable[[list[str], list[Any]], Any]] = {
+            FETCH_SESSION: self.fetch_session,
+        }
+
+    async def ping(self: Self) -> bool:
+        return True
+
+    async def aclose(self: Self) -> None:
+        pass
+
+    def hash(self: Self, key: str) -> dict[str, bytes] | None:
+        if (expiry := self.expiries.get(key)) and expiry < time.monotonic():
+            self.hashes.pop(key, None)
+            self.expiries.pop(key, None)
+            self.notify(key, "expired")
+
+        return self.hashes.get(key)
+
+    def notify(self: Self, key: str, event: str) -> None:
+        self.publish(f"__keyspace@0__:{key}", event)
+
+    def publish(self: Self, channel: str, event: str) -> None:
+        for subscriber in self.subscribers:
+            for pattern in subscriber.patterns:
+                if fnmatchcase(channel, pattern):
+                    subscriber.messages.put_nowait(
+                        {"type": "pmessage", "pattern": pattern.encode(), "channel": channel.encode(), "data": event}
+                    )
+
+    def write_hash(self: Self, key: str, mapping: dict[str, Any]) -> int:
+        current = self.hash(key) or self.hashes.setdefault(key, {})
+        added = len(mapping.keys() - current.keys())
+        current.update(
+            {field: value if isinstance(value, bytes) else str(value).encode() for field, value in mapping.items()}
+        )
+        self.notify(key, "hset")
+        return added
+
+    def delete_fields(self: Self, key: str, fields: tuple[str, ...]) -> int:
+        if not (current := self.hash(key)) or not (
+            removed := [field for field in fields if current.pop(field, None) is not None]
+        ):
+            return 0
+
+        self.notify(key, "hdel")
+        return len(removed)
+
+    def write_expiry(self: Self, key: str, seconds: int) -> bool:
+        if self.hash(key) is None:
+            return False
+
+        self.expiries[key] = time.monotonic() + seconds
+        self.notify(key, "expire")
+        return True
+
+    def pipeline(self: Self, transaction: bool = True) -> MemoryPipeline:  # noqa: ARG002
+        return MemoryPipeline(self)
+
+    def pubsub(self: Self) -> MemoryPubSub:
+        return MemoryPubSub(self)
+
+    async def config_get(self: Self, name: str) -> dict[str, str]:
+        return {name: self.config.get(name, "")}
+
+    async def config_set(self: Self, name: str, value: str) -> bool:
+        self.config[name] = value
+        return True
+
+    def register_script(self: Self, script: str) -> Callable[..., Awaitable[Any]]:
+        handler = self.scripts[script]
+
+        async def run(keys: list[str], args: list[Any]) -> Any:  # noqa: ANN401
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            return handler(keys, [str(arg) for arg in args])
+
+        return run
+
+    def fetch_session(self: Self, keys: list[str], args: list[str]) -> list[bytes | None]:
+        ip, now, session_id = args
+        session = self.hash(keys[0]) or {}
+        expiry, stored_ip, secret, public, stored_id, name = (
+            session.get(field) for field in ("expiry", "ip", "secret", "public", "id", "name")
+        )
+
+        if not expiry or (session_id and stored_id != session_id.encode()):
+            return [b"missing"]
+
+        if float(expiry) < float(now):
+            return [b"expired"]
+
+        if stored_ip != ip.encode():
+            return [b"wrong_ip"]
+
+        if not secret or not public:
+            return [b"missing"]
+
+        return [b"valid", secret, public, expiry, stored_id, name]
@@ -0,0 +1,59 @@
+use pyo3::panic::PanicException;
+use pyo3::prelude::*;
+use std::panic::{catch_unwind, AssertUnwindSafe};
+
+use crate::pool::{init, panic_message, run};
+
+#[pyfunction]
+fn resolve(
+    future: &Bound<'_, PyAny>,
+    value: Bound<'_, PyAny>,
+    error: Option<Bound<'_, PyAny>>,
+) -> PyResult<()> {
+    if future.call_method0("done")?.is_truthy()? {
+        return Ok(());
+    }
+
+    match error {
+        Some(error) => future.call_method1("set_exception", (error,))?,
+        None => future.call_method1("set_result", (value,))?,
+    };
+
+    Ok(())
+}
+
+pub fn spawn<T, F>(py: Python<'_>, work: F) -> PyResult<Bound<'_, PyAny>>
+where
+    T: for<'py> IntoPyObject<'py> + Send + 'static,
+    F: FnOnce() -> PyResult<T> + Send + 'static,
+{
+    let event_loop = py.import("asyncio")?.call_method0("get_running_loop")?;
+    let future = event_loop.call_method0("create_future")?;
+    let callback = (
+        wrap_pyfunction!(resolve, py)?.unbind(),
+        future.clone().unbind(),
+        event_loop.unbind(),
+    );
+
+    init();
+    rayon::spawn(move || {
+        let result = catch_unwind(AssertUnwindSafe(|| run(work)))
+            .unwrap_or_else(|panic| Err(PanicException::new_err(panic_message(panic.as_ref()))));
+
+        Python::attach(|py| {
+            let (resolve, future, event_loop) = callback;
+            let (value, error) = match result.and_then(|value| value.into_py_any(py)) {
+                Ok(value) => (value, py.None()),
+                Err(error) => (py.None(), error.into_value(py).into_any()),
+            };
+
+            if let Err(error) =
+                event_loop.call_method1(py, "call_soon_threadsafe", (resolve, future, value, error))
+            {
+                error.write_unraisable(py, None);
+            }
+        });
+    });
+
+    Ok(future)
+}
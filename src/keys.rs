@@ -1,8 +1,11 @@
+pub mod packing;
 pub mod public;
 pub mod secret;
 
 const MAX_CHR: i32 = 1114111;
+pub const PARALLEL_THRESHOLD: usize = 512;
+pub const MAX_MESSAGE_CHARS: usize = 1 << 20;
 
 fn modulus(num: i32, modulo: i32) -> i32 {
-    ((num % modulo) + modulo) % modulo
+    num.rem_euclid(modulo)
 }
@@ -0,0 +1,193 @@
+pub const PACKED_PREFIX: &str = "v1.";
+
+fn zigzag(num: i32) -> u32 {
+    ((num << 1) ^ (num >> 31)) as u32
+}
+
+fn unzigzag(num: u32) -> i32 {
+    ((num >> 1) as i32) ^ -((num & 1) as i32)
+}
+
+fn bit_width(num: u32) -> u8 {
+    (32 - num.leading_zeros()).max(1) as u8
+}
+
+pub fn width_of(num: i32) -> u8 {
+    bit_width(zigzag(num))
+}
+
+fn widths(values: &[i32], stride: usize) -> (u8, u8) {
+    values
+        .chunks(stride)
+        .fold((1, 1), |(width_a, width_b), chunk| {
+            match chunk.split_last() {
+                Some((last, rest)) => (
+                    rest.iter()
+                        .fold(width_a, |width, num| width.max(bit_width(zigzag(*num)))),
+                    width_b.max(bit_width(zigzag(*last))),
+                ),
+                None => (width_a, width_b),
+            }
+        })
+}
+
+pub fn pack(values: &[i32], stride: usize) -> Vec<u8> {
+    let (width_a, width_b) = widths(values, stride);
+    let chunk_bits = (stride - 1) * width_a as usize + width_b as usize;
+    let mut packed = Vec::with_capacity(2 + (values.len() / stride * chunk_bits).div_ceil(8));
+    packed.extend([width_a, width_b]);
+
+    let mut acc: u64 = 0;
+    let mut bits: u32 = 0;
+    for chunk in values.chunks(stride) {
+        for (index, num) in chunk.iter().enumerate() {
+            let width = if index == stride - 1 {
+                width_b
+            } else {
+                width_a
+            };
+            acc |= (zigzag(*num) as u64) << bits;
+            bits += width as u32;
+
+            while bits >= 8 {
+                packed.push(acc as u8);
+                acc >>= 8;
+                bits -= 8;
+            }
+        }
+    }
+
+    if bits > 0 {
+        packed.push(acc as u8);
+    }
+
+    packed
+}
+
+pub fn packed_count(packed: &[u8], stride: usize) -> usize {
+    match packed.split_first_chunk::<2>() {
+        Some(([width_a, width_b], data)) => {
+            data.len() * 8 / ((stride - 1) * *width_a as usize + *width_b as usize).max(1)
+        }
+        None => 0,
+    }
+}
+
+pub fn unpack(packed: &[u8], stride: usize, max_widths: (u8, u8)) -> Option<Vec<i32>> {
+    let ([width_a, width_b], data) = packed.split_first_chunk::<2>()?;
+    if !(1..=max_widths.0.min(32)).contains(width_a)
+        || !(1..=max_widths.1.min(32)).contains(width_b)
+    {
+        return None;
+    }
+
+    let count = packed_count(packed, stride);
+    let mut values = Vec::with_capacity(count * stride);
+    let mut data = data.iter();
+
+    let mut acc: u64 = 0;
+    let mut bits: u32 = 0;
+    for _ in 0..count {
+        for index in 0..stride {
+            let width = if index == stride - 1 {
+                *width_b
+            } else {
+                *width_a
+            } as u32;
+            while bits < width {
+                acc |= (*data.next()? as u64) << bits;
+                bits += 8;
+            }
+
+            values.push(unzigzag((acc & ((1 << width) - 1)) as u32));
+            acc >>= width;
+            bits -= width;
+        }
+    }
+
+    Some(values)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn zigzag_round_trip() {
+        for num in [
+            0,
+            1,
+            -1,
+            4095,
+            -4096,
+            16383,
+            -16384,
+            111206399,
+            i32::MAX,
+            i32::MIN,
+        ] {
+            assert_eq!(unzigzag(zigzag(num)), num);
+        }
+    }
+
+    #[test]
+    fn pack_round_trip() {
+        let values: Vec<i32> = (0..17 * 5)
+            .map(|num| {
+                if num % 17 == 16 {
+                    num * 1000003
+                } else {
+                    num * 97 - 4096
+                }
+            })
+            .collect();
+
+        let packed = pack(&values, 17);
+        assert!(packed.len() < values.len() * 4 * 4 / 5);
+        assert_eq!(unpack(&packed, 17, (32, 32)).unwrap(), values);
+    }
+
+    #[test]
+    fn pack_extremes() {
+        let values = [i32::MIN, i32::MAX, 0, -1, i32::MAX, i32::MIN];
+        assert_eq!(unpack(&pack(&values, 3), 3, (32, 32)).unwrap(), values);
+    }
+
+    #[test]
+    fn pack_empty() {
+        assert_eq!(
+            unpack(&pack(&[], 17), 17, (32, 32)).unwrap(),
+            Vec::<i32>::new()
+        );
+    }
+
+    #[test]
+    fn unpack_invalid() {
+        assert_eq!(unpack(&[], 17, (32, 32)), None);
+        assert_eq!(unpack(&[0, 27, 1, 2, 3], 17, (32, 32)), None);
+        assert_eq!(unpack(&[16, 33, 1, 2, 3], 17, (32, 32)), None);
+    }
+
+    #[test]
+    fn unpack_rejects_unexpected_widths() {
+        let values = [16380, -16384, 0, 111206399];
+        let packed = pack(&values, 2);
+        assert_eq!(packed[..2], [15, 28]);
+
+        assert_eq!(unpack(&packed, 2, (15, 28)).unwrap(), values);
+        assert_eq!(unpack(&packed, 2, (14, 28)), None);
+        assert_eq!(unpack(&packed, 2, (15, 27)), None);
+    }
+
+    #[test]
+    fn packed_count_matches_unpack() {
+        let values: Vec<i32> = (0..17 * 9).map(|num| num * 31 - 2048).collect();
+        let packed = pack(&values, 17);
+        assert_eq!(packed_count(&packed, 17), 9);
+        assert_eq!(packed_count(&[15], 17), 0);
+
+        let limit = [&[1, 1][..], &vec![0; 17 * 1000 / 8]].concat();
+        assert_eq!(packed_count(&limit, 17), 1000);
+        assert_eq!(unpack(&limit, 17, (1, 1)).unwrap().len(), 17 * 1000);
+    }
+}
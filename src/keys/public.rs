@@ -1,37 +1,68 @@
 use base64::prelude::*;
 use pyo3::exceptions::PyValueError;
 use pyo3::types::PyType;
-use pyo3::{pyclass, pymethods, Bound, PyResult};
-use rand::Rng;
+use pyo3::{pyclass, pymethods, Bound, PyAny, PyResult, Python};
+use rand::{Rng, RngCore, SeedableRng};
+use rand_chacha::ChaCha8Rng;
 use rayon::prelude::*;
-use zerocopy::{FromBytes, Immutable, IntoBytes};
+use zerocopy::{FromBytes, Immutable, IntoBytes, KnownLayout};
 
-use crate::keys::modulus;
+use crate::future::spawn;
+use crate::keys::packing::{pack, PACKED_PREFIX};
+use crate::keys::{modulus, MAX_CHR, PARALLEL_THRESHOLD};
+use crate::pool::run;
 
-#[pyclass]
-#[derive(IntoBytes, FromBytes, Immutable)]
+pub const KEY_SIZE: usize = 2890;
+pub const DIM: i32 = 16;
+pub const KEY_BOUND: i32 = 4096;
+pub const MAX_ROWS: i32 = 4;
+const ROWS: usize = KEY_SIZE / (DIM as usize + 1);
+
+#[derive(IntoBytes, FromBytes, Immutable, KnownLayout)]
+#[repr(C)]
+struct FullKey {
+    modulo: i32,
+    key: [i32; KEY_SIZE],
+    add: i32,
+    dim: i32,
+}
+
+#[derive(IntoBytes, FromBytes, Immutable, KnownLayout)]
+#[repr(C)]
+struct CompactKey {
+    modulo: i32,
+    add: i32,
+    dim: i32,
+    seed: [u8; 32],
+    answers: [i32; ROWS],
+}
+
+#[pyclass(frozen)]
 pub struct Public {
     modulo: i32,
-    key: [i32; 2890],
+    key: [i32; KEY_SIZE],
     add: i32,
     dim: i32,
+    seed: Option<[u8; 32]>,
 }
 
 #[pymethods]
 impl Public {
     #[new]
-    pub fn new(modulo: i32, key: [i32; 2890], add: i32, dim: i32) -> Self {
-        Self {
+    pub fn new(modulo: i32, key: [i32; KEY_SIZE], add: i32, dim: i32) -> PyResult<Self> {
+        Self::checked(Self {
             modulo,
             key,
             add,
             dim,
-        }
+            seed: None,
+        })
+        .ok_or_else(|| PyValueError::new_err("Invalid key"))
     }
 
     #[classmethod]
     pub fn from_bytes(_: &Bound<'_, PyType>, bytes_str: Vec<u8>) -> PyResult<Self> {
-        Self::read_from_bytes(&bytes_str).map_err(|_| PyValueError::new_err("Invalid Bytes"))
+        Self::parse(&bytes_str).ok_or_else(|| PyValueError::new_err("Invalid Bytes"))
     }
 
     #[classmethod]
@@ -44,49 +75,223 @@ impl Public {
         )
     }
 
-    pub fn to_bytes(&self) -> Vec<u8> {
-        self.as_bytes().to_vec()
+    #[pyo3(signature = (compact = false))]
+    pub fn to_bytes(&self, compact: bool) -> Vec<u8> {
+        match self.seed {
+            Some(seed) if compact => self.compact(seed).as_bytes().to_vec(),
+            _ => self.full().as_bytes().to_vec(),
+        }
+    }
+
+    #[pyo3(signature = (compact = false))]
+    pub fn to_b64(&self, compact: bool) -> String {
+        BASE64_URL_SAFE.encode(self.to_bytes(compact))
+    }
+
+    pub fn is_compact(&self) -> bool {
+        self.seed.is_some()
+    }
+
+    #[pyo3(name = "encrypt", signature = (message, compact = false))]
+    pub fn py_encrypt(&self, py: Python<'_>, message: &str, compact: bool) -> String {
+        py.detach(|| run(|| self.encrypt(message, compact)))
+    }
+
+    #[pyo3(name = "encrypt_many", signature = (messages, compact = false))]
+    pub fn py_encrypt_many(
+        &self,
+        py: Python<'_>,
+        messages: Vec<String>,
+        compact: bool,
+    ) -> Vec<String> {
+        py.detach(|| run(|| self.encrypt_many(&messages, compact)))
     }
 
-    pub fn to_b64(&self) -> String {
-        BASE64_URL_SAFE.encode(self.as_bytes())
+    #[pyo3(signature = (message, compact = false))]
+    pub fn encrypt_async<'py>(
+        slf: Bound<'py, Self>,
+        message: String,
+        compact: bool,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let public = slf.clone().unbind();
+        spawn(slf.py(), move || {
+            Ok(public.get().encrypt(&message, compact))
+        })
     }
 
-    pub fn encrypt(&self, message: &str) -> String {
-        BASE64_URL_SAFE.encode(self._encrypt(message))
+    #[pyo3(signature = (messages, compact = false))]
+    pub fn encrypt_many_async<'py>(
+        slf: Bound<'py, Self>,
+        messages: Vec<String>,
+        compact: bool,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let public = slf.clone().unbind();
+        spawn(slf.py(), move || {
+            Ok(public.get().encrypt_many(&messages, compact))
+        })
     }
 }
 
 impl Public {
-    fn _encrypt(&self, message: &str) -> Vec<u8> {
+    pub fn from_seed(modulo: i32, key: [i32; KEY_SIZE], add: i32, seed: [u8; 32]) -> Self {
+        Self {
+            modulo,
+            key,
+            add,
+            dim: DIM,
+            seed: Some(seed),
+        }
+    }
+
+    pub fn expand_seed(seed: [u8; 32]) -> [i32; KEY_SIZE] {
+        let mut rng = ChaCha8Rng::from_seed(seed);
+        let mut key = [0; KEY_SIZE];
+
+        key.chunks_mut(DIM as usize + 1).for_each(|chunk| {
+            chunk[..DIM as usize].iter_mut().for_each(|num| {
+                *num = (rng.next_u32() % (2 * KEY_BOUND) as u32) as i32 - KEY_BOUND
+            });
+        });
+
+        key
+    }
+
+    pub fn parse(bytes: &[u8]) -> Option<Self> {
+        if let Ok(full) = FullKey::read_from_bytes(bytes) {
+            return Self::checked(Self {
+                modulo: full.modulo,
+                key: full.key,
+                add: full.add,
+                dim: full.dim,
+                seed: None,
+            });
+        }
+
+        let compact = CompactKey::read_from_bytes(bytes).ok()?;
+        if compact.dim != DIM {
+            return None;
+        }
+
+        let mut key = Self::expand_seed(compact.seed);
+        key.chunks_mut(DIM as usize + 1)
+            .zip(compact.answers)
+            .for_each(|(chunk, answer)| chunk[DIM as usize] = answer);
+
+        Self::checked(Self::from_seed(
+            compact.modulo,
+            key,
+            compact.add,
+            compact.seed,
+        ))
+    }
+
+    fn checked(self) -> Option<Self> {
+        let valid = self.dim == DIM
+            && self.modulo > 0
+            && (1..=self.modulo / MAX_CHR).contains(&self.add)
+            && (self.dim * 10 * (self.dim + 1)) as usize <= KEY_SIZE;
+
+        valid.then_some(self)
+    }
+
+    fn full(&self) -> FullKey {
+        FullKey {
+            modulo: self.modulo,
+            key: self.key,
+            add: self.add,
+            dim: self.dim,
+        }
+    }
+
+    fn compact(&self, seed: [u8; 32]) -> CompactKey {
+        let mut answers = [0; ROWS];
+        answers
+            .iter_mut()
+            .zip(self.key.chunks(DIM as usize + 1))
+            .for_each(|(answer, chunk)| *answer = chunk[DIM as usize]);
+
+        CompactKey {
+            modulo: self.modulo,
+            add: self.add,
+            dim: self.dim,
+            seed,
+            answers,
+        }
+    }
+
+    pub fn encrypt(&self, message: &str, compact: bool) -> String {
+        let encrypted = self._encrypt(message);
+
+        if compact {
+            let packed = pack(&encrypted, (self.dim + 1) as usize);
+            format!("{PACKED_PREFIX}{}", BASE64_URL_SAFE.encode(packed))
+        } else {
+            BASE64_URL_SAFE.encode(encrypted.as_bytes())
+        }
+    }
+
+    pub fn encrypt_many(&self, messages: &[String], compact: bool) -> Vec<String> {
+        if messages.len() < 2
+            || messages
+                .iter()
+                .map(|message| message.chars().count())
+                .sum::<usize>()
+                < PARALLEL_THRESHOLD
+        {
+            messages
+                .iter()
+                .map(|message| self.encrypt(message, compact))
+                .collect()
+        } else {
+            messages
+                .par_iter()
+                .map(|message| self.encrypt(message, compact))
+                .collect()
+        }
+    }
+
+    fn _encrypt(&self, message: &str) -> Vec<i32> {
         let dim = (self.dim + 1) as usize;
-        let pub_key_size = (self.dim * 10) as usize;
         let message_chars: Vec<char> = message.chars().collect();
         let mut encrypted: Vec<i32> = vec![0; dim * message_chars.len()];
 
+        if message_chars.len() < PARALLEL_THRESHOLD {
+            encrypted
+                .chunks_mut(dim)
+                .zip(message_chars)
+                .for_each(|(chunk, chr)| self._encrypt_char(chunk, chr));
+        } else {
+            encrypted
+                .par_chunks_mut(dim)
+                .zip(message_chars)
+                .for_each(|(chunk, chr)| self._encrypt_char(chunk, chr));
+        }
+
         encrypted
-            .par_chunks_mut(dim)
-            .zip(message_chars)
-            .for_each(|(chunk, chr)| {
-                let mut rng = rand::rng();
-                let char_num = (chr as i32) * self.add;
-                for _ in 0..rng.random_range(2..5) {
-                    let num = rng.random_range(0..pub_key_size);
-                    let slice = (num * dim)..(num * dim) + dim;
-                    self.key[slice]
-                        .iter()
-                        .zip(&mut *chunk)
-                        .for_each(|(key_num, chunk_num)| {
-                            *chunk_num += key_num;
-                        })
-                }
-
-                *chunk.last_mut().expect("encrypted buffer is empty") = modulus(
-                    chunk.last().expect("encrypted buffer is empty") + char_num,
-                    self.modulo,
-                );
-            });
+    }
+
+    fn _encrypt_char(&self, chunk: &mut [i32], chr: char) {
+        let dim = chunk.len();
+        let pub_key_size = (self.dim * 10) as usize;
+        let mut rng = rand::rng();
+        let char_num = (chr as i32) * self.add;
+        for _ in 0..rng.random_range(2..=MAX_ROWS) {
+            let num = rng.random_range(0..pub_key_size);
+            let slice = (num * dim)..(num * dim) + dim;
+            self.key[slice]
+                .iter()
+                .zip(&mut *chunk)
+                .for_each(|(key_num, chunk_num)| {
+                    *chunk_num = chunk_num.wrapping_add(*key_num);
+                })
+        }
 
-        encrypted.as_bytes().to_vec()
+        *chunk.last_mut().expect("encrypted buffer is empty") = modulus(
+            chunk
+                .last()
+                .expect("encrypted buffer is empty")
+                .wrapping_add(char_num),
+            self.modulo,
+        );
     }
 }
@@ -1,18 +1,21 @@
 use base64::prelude::BASE64_URL_SAFE;
-use pyo3::exceptions::{PyIndexError, PyValueError};
+use pyo3::exceptions::{PyIndexError, PyOverflowError, PyValueError};
 use rand::Rng;
 use rayon::prelude::*;
 use std::char::from_u32;
 use std::fmt::{Display, Formatter};
 use zerocopy::{FromBytes, Immutable, IntoBytes, KnownLayout};
 
-use crate::keys::public::Public;
-use crate::keys::{modulus, MAX_CHR};
+use crate::future::spawn;
+use crate::keys::packing::{packed_count, unpack, width_of, PACKED_PREFIX};
+use crate::keys::public::{Public, KEY_BOUND, MAX_ROWS};
+use crate::keys::{modulus, MAX_CHR, MAX_MESSAGE_CHARS, PARALLEL_THRESHOLD};
+use crate::pool::run;
 use base64::prelude::*;
 use pyo3::prelude::*;
 use pyo3::types::PyType;
 
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(IntoBytes, FromBytes, Immutable, KnownLayout)]
 #[repr(C)]
 pub struct Secret {
@@ -52,46 +55,67 @@ impl Secret {
         BASE64_URL_SAFE.encode(self.as_bytes())
     }
 
-    pub fn generate_public_key(&self) -> Public {
-        let mut rng = rand::rng();
-        let add = self.add;
-        let mut key: [i32; 2890] = [0; 2890];
-        let max_fuzz = add / 10;
-        let neg_fuzz = -max_fuzz;
+    #[pyo3(name = "generate_public_key")]
+    pub fn py_generate_public_key(&self, py: Python<'_>) -> Public {
+        py.detach(|| run(|| self.generate_public_key()))
+    }
 
-        key.chunks_mut((self.dim + 1) as usize).for_each(|chunk| {
-            let answer: i32 = self
-                .key
-                .iter()
-                .zip(&mut *chunk)
-                .map(|(key_num, chunklet)| {
-                    let num = rng.random_range(-4096..4096);
-                    *chunklet = num;
-                    key_num * num
-                })
-                .sum();
+    #[pyo3(name = "decrypt")]
+    pub fn py_decrypt(&self, py: Python<'_>, message: &str) -> PyResult<String> {
+        py.detach(|| run(|| self.decrypt(message)))
+    }
 
-            *chunk
-                .last_mut()
-                .expect("Attempted `.last_mut()` on an empty chunk") =
-                modulus(answer + rng.random_range(neg_fuzz..max_fuzz), self.modulo);
-        });
+    #[pyo3(name = "decrypt_bytes")]
+    pub fn py_decrypt_bytes(&self, py: Python<'_>, message: &str) -> PyResult<Vec<u8>> {
+        py.detach(|| run(|| self.decrypt_bytes(message)))
+    }
 
-        Public::new(self.modulo, key, add, self.dim)
+    #[pyo3(name = "decrypt_many")]
+    pub fn py_decrypt_many(&self, py: Python<'_>, messages: Vec<String>) -> PyResult<Vec<String>> {
+        py.detach(|| run(|| self.decrypt_many(&messages)))
     }
 
-    pub fn decrypt(&self, message: &str) -> PyResult<String> {
-        self._decrypt(
-            &BASE64_URL_SAFE
-                .decode(message)
-                .map_err(|_| PyValueError::new_err("Could not parse b64"))?,
-        )
+    pub fn decrypt_async<'py>(
+        slf: Bound<'py, Self>,
+        message: String,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let secret = slf.clone().unbind();
+        spawn(slf.py(), move || secret.get().decrypt(&message))
+    }
+
+    pub fn decrypt_bytes_async<'py>(
+        slf: Bound<'py, Self>,
+        message: String,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let secret = slf.clone().unbind();
+        spawn(slf.py(), move || secret.get().decrypt_bytes(&message))
     }
 }
 
 impl Default for Secret {
     fn default() -> Self {
-        let mut rng = rand::rng();
+        Self::from_rng(&mut rand::rng())
+    }
+}
+
+fn decode_b64(message: &str) -> PyResult<Vec<u8>> {
+    BASE64_URL_SAFE
+        .decode(message)
+        .map_err(|_| PyValueError::new_err("Could not parse b64"))
+}
+
+fn check_length(chars: usize) -> PyResult<()> {
+    if chars > MAX_MESSAGE_CHARS {
+        return Err(PyOverflowError::new_err(format!(
+            "Message too long, the limit is {MAX_MESSAGE_CHARS} characters"
+        )));
+    }
+
+    Ok(())
+}
+
+impl Secret {
+    pub fn from_rng<R: Rng>(rng: &mut R) -> Self {
         let mut key = [0; 16];
         let modulo = rng.random_range(11120640..111206400);
         let add: i32 = modulo / MAX_CHR;
@@ -106,36 +130,135 @@ impl Default for Secret {
             dim: 16,
         }
     }
-}
 
-impl Secret {
-    fn _decrypt(&self, message: &[u8]) -> PyResult<String> {
+    pub fn generate_public_key(&self) -> Public {
+        self.generate_public_key_with(&mut rand::rng())
+    }
+
+    pub fn generate_public_key_with<R: Rng>(&self, rng: &mut R) -> Public {
+        let seed: [u8; 32] = rng.random();
+        let max_fuzz = self.add / 10;
+        let neg_fuzz = -max_fuzz;
+        let mut key = Public::expand_seed(seed);
+
+        key.chunks_mut((self.dim + 1) as usize).for_each(|chunk| {
+            let answer: i32 = self
+                .key
+                .iter()
+                .zip(&*chunk)
+                .map(|(key_num, chunklet)| key_num * chunklet)
+                .sum();
+
+            *chunk
+                .last_mut()
+                .expect("Attempted `.last_mut()` on an empty chunk") =
+                modulus(answer + rng.random_range(neg_fuzz..max_fuzz), self.modulo);
+        });
+
+        Public::from_seed(self.modulo, key, self.add, seed)
+    }
+
+    pub fn decrypt(&self, message: &str) -> PyResult<String> {
+        let stride = self.key.len() + 1;
+        match message.strip_prefix(PACKED_PREFIX) {
+            Some(packed) => {
+                let packed = decode_b64(packed)?;
+                check_length(packed_count(&packed, stride))?;
+                self._decrypt(
+                    &unpack(&packed, stride, self.packed_widths())
+                        .ok_or_else(|| PyValueError::new_err("Could not unpack message"))?,
+                )
+            }
+            None => {
+                let message = decode_b64(message)?;
+                check_length(message.len() / (stride * size_of::<i32>()))?;
+                self._decrypt_bytes(&message)
+            }
+        }
+    }
+
+    fn packed_widths(&self) -> (u8, u8) {
+        (width_of(-MAX_ROWS * KEY_BOUND), width_of(self.modulo - 1))
+    }
+
+    fn encrypted_chars(&self, message: &str) -> usize {
+        let stride = self.key.len() + 1;
+        match message.strip_prefix(PACKED_PREFIX) {
+            Some(packed) => {
+                let (width_a, width_b) = self.packed_widths();
+                (packed.len() * 6).saturating_sub(16)
+                    / ((stride - 1) * width_a as usize + width_b as usize)
+            }
+            None => message.len() * 3 / 4 / (stride * size_of::<i32>()),
+        }
+    }
+
+    pub fn decrypt_bytes(&self, message: &str) -> PyResult<Vec<u8>> {
+        self.decrypt(message).map(String::into_bytes)
+    }
+
+    fn _decrypt_bytes(&self, message: &[u8]) -> PyResult<String> {
         if message.is_empty() {
             return Ok(String::new());
         }
 
-        let message: &[i32] = FromBytes::ref_from_bytes(message)
-            .map_err(|_| PyValueError::new_err("Could not parse bytes"))?;
-        let add = self.add as f32;
+        self._decrypt(
+            FromBytes::ref_from_bytes(message)
+                .map_err(|_| PyValueError::new_err("Could not parse bytes"))?,
+        )
+    }
 
-        message
-            .par_chunks(self.key.len() + 1)
-            .map(|message_chunk| {
-                let chr_answer: i32 = self
-                    .key
-                    .iter()
-                    .zip(message_chunk)
-                    .map(|(num, chunklet)| num * chunklet)
-                    .sum();
-
-                let last = message_chunk
-                    .last()
-                    .ok_or_else(|| PyIndexError::new_err("Could not get last chunk of message"))?;
-
-                from_u32((modulus(last - chr_answer, self.modulo) as f32 / add).round() as u32)
-                    .ok_or_else(|| PyValueError::new_err("Could not make a character from u32"))
-            })
-            .collect::<PyResult<String>>()
+    pub fn decrypt_many(&self, messages: &[String]) -> PyResult<Vec<String>> {
+        if messages.len() < 2
+            || messages
+                .iter()
+                .map(|message| self.encrypted_chars(message))
+                .sum::<usize>()
+                < PARALLEL_THRESHOLD
+        {
+            messages
+                .iter()
+                .map(|message| self.decrypt(message))
+                .collect()
+        } else {
+            messages
+                .par_iter()
+                .map(|message| self.decrypt(message))
+                .collect()
+        }
+    }
+
+    fn _decrypt(&self, message: &[i32]) -> PyResult<String> {
+        let chunks = message.chunks(self.key.len() + 1);
+
+        if chunks.len() < PARALLEL_THRESHOLD {
+            chunks
+                .map(|message_chunk| self._decrypt_char(message_chunk))
+                .collect()
+        } else {
+            message
+                .par_chunks(self.key.len() + 1)
+                .map(|message_chunk| self._decrypt_char(message_chunk))
+                .collect()
+        }
+    }
+
+    fn _decrypt_char(&self, message_chunk: &[i32]) -> PyResult<char> {
+        let add = self.add as f32;
+        let chr_answer = self
+            .key
+            .iter()
+            .zip(message_chunk)
+            .fold(0i32, |answer, (num, chunklet)| {
+                answer.wrapping_add(num.wrapping_mul(*chunklet))
+            });
+
+        let last = message_chunk
+            .last()
+            .ok_or_else(|| PyIndexError::new_err("Could not get last chunk of message"))?;
+
+        from_u32((modulus(last.wrapping_sub(chr_answer), self.modulo) as f32 / add).round() as u32)
+            .ok_or_else(|| PyValueError::new_err("Could not make a character from u32"))
     }
 }
 
@@ -152,6 +275,8 @@ impl Display for Secret {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use rand::SeedableRng;
+    use rand_chacha::ChaCha8Rng;
 
     #[test]
     fn test_decryption() {
@@ -160,7 +285,7 @@ mod tests {
 
         let message = "Hello World".to_string();
 
-        let encrypted = public.encrypt(&message);
+        let encrypted = public.encrypt(&message, false);
         let decrypted = secret.decrypt(&encrypted).unwrap();
 
         assert_eq!(decrypted, message);
@@ -173,12 +298,169 @@ mod tests {
 
         let message = "こんにちは世界".to_string();
 
-        let encrypted = public.encrypt(&message);
+        let encrypted = public.encrypt(&message, false);
         let decrypted = secret.decrypt(&encrypted).unwrap();
 
         assert_eq!(decrypted, message);
     }
 
+    #[test]
+    fn test_decryption_compact() {
+        let secret = Secret::new();
+        let public = secret.generate_public_key();
+
+        let message = "Hello World こんにちは世界".to_string();
+
+        let encrypted = public.encrypt(&message, true);
+        assert!(encrypted.starts_with(PACKED_PREFIX));
+        assert!(encrypted.len() < public.encrypt(&message, false).len() * 4 / 5);
+
+        let decrypted = secret.decrypt(&encrypted).unwrap();
+
+        assert_eq!(decrypted, message);
+    }
+
+    #[test]
+    fn test_decryption_bytes() {
+        let secret = Secret::new();
+        let public = secret.generate_public_key();
+
+        let message = "Hello World こんにちは世界".to_string();
+
+        for compact in [false, true] {
+            let decrypted = secret
+                .decrypt_bytes(&public.encrypt(&message, compact))
+                .unwrap();
+            assert_eq!(decrypted, message.as_bytes());
+        }
+    }
+
+    #[test]
+    fn test_compact_public_key() {
+        let secret = Secret::new();
+        let public = secret.generate_public_key();
+        assert!(public.is_compact());
+
+        let compact = public.to_bytes(true);
+        let full = public.to_bytes(false);
+        assert_eq!(compact.len(), 724);
+        assert_eq!(full.len(), 11572);
+
+        let message = "Hello World".to_string();
+        for bytes in [compact, full] {
+            let parsed = Public::parse(&bytes).unwrap();
+            assert_eq!(parsed.to_bytes(false), public.to_bytes(false));
+
+            let decrypted = secret.decrypt(&parsed.encrypt(&message, false)).unwrap();
+            assert_eq!(decrypted, message);
+        }
+    }
+
+    #[test]
+    fn test_reject_malformed_public_key() {
+        let public = Secret::new().generate_public_key();
+
+        let patch = |mut bytes: Vec<u8>, offset: usize, value: i32| {
+            bytes[offset..offset + 4].copy_from_slice(&value.to_ne_bytes());
+            bytes
+        };
+
+        for (offset, value) in [(0, 0), (0, -7), (4, 0), (4, i32::MAX), (8, 2), (8, 0)] {
+            assert!(Public::parse(&patch(public.to_bytes(true), offset, value)).is_none());
+        }
+
+        let full = public.to_bytes(false);
+        for (offset, value) in [(0, 0), (full.len() - 8, 4096), (full.len() - 4, 100)] {
+            assert!(Public::parse(&patch(full.clone(), offset, value)).is_none());
+        }
+        assert!(Public::parse(&full[1..]).is_none());
+    }
+
+    #[test]
+    fn test_decrypt_rejects_unexpected_widths() {
+        let secret = Secret::new();
+        let encrypted = secret.generate_public_key().encrypt("Hello", true);
+        let mut packed = BASE64_URL_SAFE
+            .decode(encrypted.strip_prefix(PACKED_PREFIX).unwrap())
+            .unwrap();
+        assert!(packed[0] <= 15);
+
+        packed[0] = 16;
+        let widened = format!("{PACKED_PREFIX}{}", BASE64_URL_SAFE.encode(packed));
+        assert!(secret.decrypt(&widened).is_err());
+    }
+
+    #[test]
+    fn test_decrypt_rejects_long_messages() {
+        let secret = Secret::new();
+        let widths = secret.packed_widths();
+        let chunk_bits = 16 * widths.0 as usize + widths.1 as usize;
+        let packed = |chars: usize| {
+            let data = vec![0; (chars * chunk_bits).div_ceil(8)];
+            let packed = [&[widths.0, widths.1][..], &data].concat();
+            format!("{PACKED_PREFIX}{}", BASE64_URL_SAFE.encode(packed))
+        };
+
+        assert!(secret.decrypt(&packed(MAX_MESSAGE_CHARS)).is_ok());
+        assert!(secret.decrypt(&packed(MAX_MESSAGE_CHARS + 1)).is_err());
+
+        let full = |chars: usize| BASE64_URL_SAFE.encode(vec![0; chars * 17 * 4]);
+        assert!(secret.decrypt(&full(8)).is_ok());
+        assert!(secret.decrypt(&full(MAX_MESSAGE_CHARS + 1)).is_err());
+    }
+
+    #[test]
+    fn test_decrypt_many() {
+        let secret = Secret::new();
+        let public = secret.generate_public_key();
+
+        let short: Vec<String> = vec!["Hello".to_string(), "世界".to_string(), String::new()];
+        let long: Vec<String> = (0..64).map(|i| format!("message {i} ").repeat(i)).collect();
+
+        for messages in [short, long] {
+            for compact in [false, true] {
+                let encrypted = public.encrypt_many(&messages, compact);
+                assert_eq!(secret.decrypt_many(&encrypted).unwrap(), messages);
+            }
+        }
+    }
+
+    #[test]
+    fn test_encrypted_chars() {
+        let secret = Secret::new();
+        let public = secret.generate_public_key();
+
+        let message = "Hello World こんにちは世界".repeat(8);
+        let chars = message.chars().count();
+        assert_eq!(
+            secret.encrypted_chars(&public.encrypt(&message, false)),
+            chars
+        );
+        assert!(
+            (chars - 2..=chars).contains(&secret.encrypted_chars(&public.encrypt(&message, true)))
+        );
+    }
+
+    #[test]
+    fn test_decrypt_many_invalid() {
+        let secret = Secret::new();
+        let messages = vec![String::new(), "not b64!".to_string()];
+        assert!(secret.decrypt_many(&messages).is_err());
+    }
+
+    #[test]
+    fn test_seeded_keys() {
+        let secret = Secret::from_rng(&mut ChaCha8Rng::seed_from_u64(7));
+        assert_eq!(
+            secret.to_bytes(),
+            Secret::from_rng(&mut ChaCha8Rng::seed_from_u64(7)).to_bytes()
+        );
+
+        let public = secret.generate_public_key_with(&mut ChaCha8Rng::seed_from_u64(7));
+        let again = secret.generate_public_key_with(&mut ChaCha8Rng::seed_from_u64(7));
+        assert_eq!(public.to_bytes(false), again.to_bytes(false));
+    }
+
     #[test]
     fn secret_creation() {
         let secret = Secret::new();
@@ -193,6 +475,15 @@ mod tests {
         }
     }
 
+    #[test]
+    fn decrypt_extreme_values() {
+        let secret = Secret::new();
+        for value in [i32::MAX, i32::MIN] {
+            let message = vec![value; secret.key.len() + 1];
+            let _ = secret._decrypt(&message);
+        }
+    }
+
     #[test]
     fn decrypt_empty_message() {
         let secret = Secret::new();
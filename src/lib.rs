@@ -1,13 +1,20 @@
 use crate::keys::public::Public;
 use crate::keys::secret::Secret;
+use crate::keys::MAX_MESSAGE_CHARS;
+use crate::pool::{configure_pool, pool_stats};
 use pyo3::prelude::*;
 
+pub mod future;
 pub mod keys;
+pub mod pool;
 
 #[pymodule]
 fn lwe(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<Secret>()?;
     m.add_class::<Public>()?;
+    m.add("MAX_MESSAGE_CHARS", MAX_MESSAGE_CHARS)?;
+    m.add_function(wrap_pyfunction!(configure_pool, m)?)?;
+    m.add_function(wrap_pyfunction!(pool_stats, m)?)?;
     Ok(())
 }
 
@@ -0,0 +1,126 @@
+use pyo3::exceptions::{PyRuntimeError, PyValueError};
+use pyo3::prelude::*;
+use std::any::Any;
+use std::collections::HashMap;
+use std::env;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::OnceLock;
+
+const THREADS_VAR: &str = "LWE_THREADS";
+const THREAD_NAME_VAR: &str = "LWE_THREAD_NAME";
+const DEFAULT_THREAD_NAME: &str = "lwe";
+
+static POOL: OnceLock<usize> = OnceLock::new();
+static IN_FLIGHT: AtomicUsize = AtomicUsize::new(0);
+static COMPLETED: AtomicUsize = AtomicUsize::new(0);
+
+struct Task;
+
+impl Task {
+    fn start() -> Self {
+        IN_FLIGHT.fetch_add(1, Ordering::Relaxed);
+        Self
+    }
+}
+
+impl Drop for Task {
+    fn drop(&mut self) {
+        IN_FLIGHT.fetch_sub(1, Ordering::Relaxed);
+        COMPLETED.fetch_add(1, Ordering::Relaxed);
+    }
+}
+
+fn build(threads: usize, thread_name: String) -> usize {
+    let _ = rayon::ThreadPoolBuilder::new()
+        .num_threads(threads)
+        .thread_name(move |index| format!("{thread_name}-{index}"))
+        .panic_handler(|panic| eprintln!("lwe task panicked: {}", panic_message(panic.as_ref())))
+        .build_global();
+
+    rayon::current_num_threads()
+}
+
+pub fn panic_message(panic: &(dyn Any + Send)) -> String {
+    panic
+        .downcast_ref::<&str>()
+        .map(|message| message.to_string())
+        .or_else(|| panic.downcast_ref::<String>().cloned())
+        .unwrap_or_else(|| "unknown panic".to_string())
+}
+
+pub fn init() -> usize {
+    *POOL.get_or_init(|| {
+        let threads = env::var(THREADS_VAR)
+            .ok()
+            .and_then(|threads| threads.parse().ok())
+            .unwrap_or(0);
+        let thread_name =
+            env::var(THREAD_NAME_VAR).unwrap_or_else(|_| DEFAULT_THREAD_NAME.to_string());
+
+        build(threads, thread_name)
+    })
+}
+
+pub fn run<R>(op: impl FnOnce() -> R) -> R {
+    init();
+    let _task = Task::start();
+    op()
+}
+
+#[pyfunction]
+#[pyo3(signature = (threads = None, thread_name = None))]
+pub fn configure_pool(threads: Option<usize>, thread_name: Option<String>) -> PyResult<usize> {
+    if threads == Some(0) {
+        return Err(PyValueError::new_err("threads must be greater than 0"));
+    }
+
+    let mut built = false;
+    let size = *POOL.get_or_init(|| {
+        built = true;
+        build(
+            threads.unwrap_or(0),
+            thread_name.unwrap_or_else(|| DEFAULT_THREAD_NAME.to_string()),
+        )
+    });
+
+    if !built {
+        return Err(PyRuntimeError::new_err(
+            "lwe thread pool is already initialised",
+        ));
+    }
+
+    Ok(size)
+}
+
+#[pyfunction]
+pub fn pool_stats() -> HashMap<&'static str, usize> {
+    HashMap::from([
+        ("threads", init()),
+        ("in_flight", IN_FLIGHT.load(Ordering::Relaxed)),
+        ("completed", COMPLETED.load(Ordering::Relaxed)),
+    ])
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_run_counts_tasks() {
+        let before = COMPLETED.load(Ordering::Relaxed);
+        let in_flight = run(|| IN_FLIGHT.load(Ordering::Relaxed));
+
+        assert!(in_flight >= 1);
+        assert!(COMPLETED.load(Ordering::Relaxed) > before);
+        assert_eq!(pool_stats()["threads"], rayon::current_num_threads());
+    }
+
+    #[test]
+    fn test_panic_message() {
+        let caught = std::panic::catch_unwind(|| panic!("broken {}", 1)).unwrap_err();
+        assert_eq!(panic_message(caught.as_ref()), "broken 1");
+
+        let caught = std::panic::catch_unwind(|| std::panic::panic_any(7)).unwrap_err();
+        assert_eq!(panic_message(caught.as_ref()), "unknown panic");
+    }
+}
@@ -0,0 +1,77 @@
+import asyncio
+from unittest.mock import patch
+
+from admission.service import Admission
+from fastapi import HTTPException
+from pytest import fixture, mark, raises
+
+
+@fixture
+def admission() -> Admission:
+    admission = Admission()
+    admission.reset()
+    return admission
+
+
+def test_admission_cache() -> None:
+    admission = Admission()
+    assert Admission.cache is admission
+    assert Admission() is admission
+
+
+@mark.asyncio
+async def test_admit(admission: Admission) -> None:
+    async with admission.admit():
+        assert admission.running == 1
+
+    assert admission.stats() == {"running": 0, "waiting": 0, "admitted": 1, "rejected": 0, "expired": 0}
+
+
+@patch("admission.service.ADMISSION_QUEUE_SIZE", 1)
+@patch("admission.service.ADMISSION_RETRY_AFTER", 3)
+@patch("admission.service.ADMISSION_CONCURRENCY", 1)
+@mark.asyncio
+async def test_reject_when_queue_full() -> None:
+    admission = Admission()
+    admission.reset()
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with admission.admit():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    assert admission.running == 1
+    assert admission.waiting == 1
+
+    with raises(HTTPException) as error:
+        async with admission.admit():
+            pass
+
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "3"}
+    assert admission.rejected == 1
+
+    release.set()
+    await asyncio.gather(holder, queued)
+    assert admission.admitted == 2
+
+
+@patch("admission.service.ADMISSION_DEADLINE", 0.01)
+@patch("admission.service.ADMISSION_CONCURRENCY", 1)
+@mark.asyncio
+async def test_expire_after_deadline() -> None:
+    admission = Admission()
+    admission.reset()
+
+    async with admission.admit():
+        with raises(HTTPException) as error:
+            async with admission.admit():
+                pass
+
+    assert error.value.status_code == 429
+    assert admission.expired == 1
+    assert admission.waiting == 0
@@ -1,7 +1,20 @@
+import os
+from collections.abc import AsyncIterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from db.psql.client import Psql
-from pytest import mark
+from db.psql.client import Psql, prepare
+from db.psql.constants import (
+    PSQL_CONNECTION_LIFETIME,
+    PSQL_CURSOR_PREFETCH,
+    PSQL_MAX_QUERIES,
+    PSQL_MAX_SIZE,
+    PSQL_MIN_SIZE,
+    PSQL_STATEMENT_CACHE_SIZE,
+)
+from db.psql.queries import QUERIES
+from db.psql.users.queries import GET_USER
+from metrics.registry import Metrics
+from pytest import mark, raises
 
 
 def test_new_cache() -> None:
@@ -16,21 +29,28 @@ def test_new_cache() -> None:
     assert db is db_2
 
 
-@patch("os.getenv", return_value="foo")
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
 @patch("asyncpg.create_pool", new_callable=AsyncMock)
 @mark.asyncio
-async def test_db_context_manager(create_pool_mock: AsyncMock, os_get_env_mock: MagicMock) -> None:
+async def test_db_context_manager(create_pool_mock: AsyncMock) -> None:
     async with Psql():
-        os_get_env_mock.assert_called_once_with("PSQL_URI")
-        create_pool_mock.assert_called_once_with(dsn=os_get_env_mock.return_value)
+        create_pool_mock.assert_called_once_with(
+            dsn="foo",
+            min_size=PSQL_MIN_SIZE,
+            max_size=PSQL_MAX_SIZE,
+            max_queries=PSQL_MAX_QUERIES,
+            max_inactive_connection_lifetime=PSQL_CONNECTION_LIFETIME,
+            statement_cache_size=PSQL_STATEMENT_CACHE_SIZE,
+            init=prepare,
+        )
 
     create_pool_mock.return_value.close.assert_called_once()
 
 
-@patch("os.getenv", return_value="foo")
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
 @patch("asyncpg.create_pool", new_callable=AsyncMock)
 @mark.asyncio
-async def test_execute(create_pool_mock: AsyncMock, _: MagicMock) -> None:
+async def test_execute(create_pool_mock: AsyncMock) -> None:
     query = "SELECT * FROM users where id = $1 and age < $2"
     arg_1 = "12345"
     arg_2 = 6
@@ -40,10 +60,10 @@ async def test_execute(create_pool_mock: AsyncMock, _: MagicMock) -> None:
     create_pool_mock.return_value.execute.assert_called_once_with(query, arg_1, arg_2)
 
 
-@patch("os.getenv", return_value="foo")
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
 @patch("asyncpg.create_pool", new_callable=AsyncMock)
 @mark.asyncio
-async def test_fetch_row(create_pool_mock: AsyncMock, _: MagicMock) -> None:
+async def test_fetch_row(create_pool_mock: AsyncMock) -> None:
     query = "SELECT * FROM users where id = $1 and age < $2"
     arg_1 = "12345"
     arg_2 = 6
@@ -51,3 +71,120 @@ async def test_fetch_row(create_pool_mock: AsyncMock, _: MagicMock) -> None:
         await db.fetch_row(query, arg_1, arg_2)
 
     create_pool_mock.return_value.fetchrow.assert_called_once_with(query, arg_1, arg_2)
+
+
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
+@patch("asyncpg.create_pool", new_callable=AsyncMock)
+@mark.asyncio
+async def test_fetch(create_pool_mock: AsyncMock) -> None:
+    query = "SELECT * FROM users where id = ANY($1)"
+    ids = ["1", "2"]
+    async with Psql() as db:
+        rows = await db.fetch(query, ids)
+
+    create_pool_mock.return_value.fetch.assert_called_once_with(query, ids)
+    assert rows is create_pool_mock.return_value.fetch.return_value
+
+
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
+@patch("asyncpg.create_pool", new_callable=AsyncMock)
+@mark.asyncio
+async def test_stream(create_pool_mock: AsyncMock) -> None:
+    query = "SELECT * FROM passwords where user_id = $1"
+    records = [{"id": 1}, {"id": 2}]
+
+    async def cursor() -> AsyncIterator[dict[str, int]]:
+        for record in records:
+            yield record
+
+    connection = MagicMock()
+    connection.cursor.return_value = cursor()
+    create_pool_mock.return_value.acquire = MagicMock()
+    create_pool_mock.return_value.acquire.return_value.__aenter__.return_value = connection
+
+    async with Psql() as db:
+        streamed = [record async for record in db.stream(query, "user")]
+
+    connection.transaction.assert_called_once_with()
+    connection.cursor.assert_called_once_with(query, "user", prefetch=PSQL_CURSOR_PREFETCH)
+    assert streamed == records
+
+
+@mark.asyncio
+async def test_prepare() -> None:
+    connection = AsyncMock()
+    await prepare(connection)
+
+    assert GET_USER in QUERIES
+    assert QUERIES[GET_USER] == "GET_USER"
+    assert [call.args[0] for call in connection._get_statement.await_args_list] == list(QUERIES)
+    connection.prepare.assert_not_called()
+
+
+@mark.asyncio
+async def test_prepare_without_statement_cache_helper() -> None:
+    connection = MagicMock(spec=["prepare"])
+    connection.prepare = AsyncMock()
+    await prepare(connection)
+
+    assert [call.args[0] for call in connection.prepare.await_args_list] == list(QUERIES)
+
+
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
+@patch("asyncpg.create_pool", new_callable=AsyncMock)
+@mark.asyncio
+async def test_query_metrics(create_pool_mock: AsyncMock) -> None:
+    create_pool_mock.return_value.fetchrow.side_effect = [None, ValueError]
+    series = Metrics().queries.series
+
+    def count(outcome: str) -> int:
+        return sum(series.get((("query", "GET_USER"), ("outcome", outcome)), ([0], [0]))[0])
+
+    ok, error = count("ok"), count("error")
+    async with Psql() as db:
+        await db.fetch_row(GET_USER, "name")
+        with raises(ValueError):
+            await db.fetch_row(GET_USER, "name")
+
+        assert db.in_flight == 0
+
+    assert count("ok") == ok + 1
+    assert count("error") == error + 1
+
+
+def test_stats() -> None:
+    db = Psql()
+    db.pool = MagicMock()
+    db.pool.get_size.return_value = 4
+    db.pool.get_idle_size.return_value = 1
+    db.pool.get_min_size.return_value = 2
+    db.pool.get_max_size.return_value = 4
+    db.in_flight = 6
+
+    assert db.stats() == {"size": 4, "idle": 1, "min_size": 2, "max_size": 4, "in_flight": 6, "waiting": 2}
+
+    db.in_flight = 0
+    db.pool = None
+    assert db.stats() == {}
+
+
+@patch.dict(os.environ, {"PSQL_URI": "foo"})
+@patch("asyncpg.create_pool", new_callable=AsyncMock)
+@mark.asyncio
+async def test_transaction(create_pool_mock: AsyncMock) -> None:
+    connection = MagicMock()
+    connection.execute = AsyncMock()
+    connection.fetch = AsyncMock(return_value=[{"name": "a"}])
+    create_pool_mock.return_value.acquire = MagicMock()
+    create_pool_mock.return_value.acquire.return_value.__aenter__.return_value = connection
+
+    async with Psql() as db, db.transaction() as acquired:
+        await db.execute("UPDATE", 1, connection=acquired)
+        rows = await db.fetch("INSERT", 2, connection=acquired)
+
+    assert acquired is connection
+    connection.transaction.assert_called_once_with()
+    connection.execute.assert_called_once_with("UPDATE", 1)
+    connection.fetch.assert_called_once_with("INSERT", 2)
+    create_pool_mock.return_value.execute.assert_not_called()
+    assert rows == [{"name": "a"}]
@@ -1,7 +1,9 @@
 from unittest.mock import AsyncMock, patch
 
 from db.redis.client import Redis
+from db.redis.constants import REDIS_HEALTH_CHECK_INTERVAL, REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT
 from pytest import fixture, mark
+from redis.asyncio import BlockingConnectionPool
 from redis.asyncio import Redis as AsyncRedis
 
 
@@ -21,26 +23,25 @@ def test_redis_cache() -> None:
     assert id(db) == id(db_2)
     assert db is db_2
     assert isinstance(Redis.cache.redis, AsyncRedis)
+    assert Redis().redis is db.redis
 
 
-@patch("redis.asyncio.Redis.set", new_callable=AsyncMock)
-@mark.asyncio
-async def test_redis_set(set_mock: AsyncMock, redis: Redis) -> None:
-    await redis.set("key", "value")
-    set_mock.assert_called_once_with("key", "value", ex=1800)
+def test_redis_pool(redis: Redis) -> None:
+    pool = redis.redis.connection_pool
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == REDIS_MAX_CONNECTIONS
+    assert pool.timeout == REDIS_POOL_TIMEOUT
+    assert pool.connection_kwargs["health_check_interval"] == REDIS_HEALTH_CHECK_INTERVAL
+    assert redis.redis.auto_close_connection_pool
 
 
-@patch("redis.asyncio.Redis.get", new_callable=AsyncMock, return_value=b"value")
+@patch("redis.asyncio.Redis.aclose", new_callable=AsyncMock)
+@patch("redis.asyncio.Redis.ping", new_callable=AsyncMock)
 @mark.asyncio
-async def test_redis_get(get_mock: AsyncMock, redis: Redis) -> None:
-    value = await redis.get("key")
-    get_mock.assert_called_once_with("key")
-    assert value == get_mock.return_value.decode()
-
+async def test_redis_context_manager(ping_mock: AsyncMock, aclose_mock: AsyncMock) -> None:
+    async with Redis() as redis:
+        ping_mock.assert_awaited_once()
+        aclose_mock.assert_not_awaited()
 
-@patch("redis.asyncio.Redis.get", new_callable=AsyncMock, return_value=None)
-@mark.asyncio
-async def test_redis_get_none(get_mock: AsyncMock, redis: Redis) -> None:
-    value = await redis.get("key")
-    get_mock.assert_called_once_with("key")
-    assert value is None
+    aclose_mock.assert_awaited_once()
+    assert Redis().redis is redis.redis
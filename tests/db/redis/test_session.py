@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytz
+from db.redis.scripts import FETCH_SESSION
+from db.redis.session import SessionStore
+from db.redis.session_cache import SessionCache
+from models.session import Session, SessionState
+from pytest import fixture, mark
+
+NOW = datetime.now(tz=pytz.UTC)
+EXPIRY = NOW + timedelta(seconds=1800)
+
+
+@fixture
+def store() -> SessionStore:
+    return SessionStore()
+
+
+def test_session_store_cache(store: SessionStore) -> None:
+    assert SessionStore.cache is store
+    assert SessionStore() is store
+    assert store.fetch_script.script == FETCH_SESSION
+
+
+@patch("redis.asyncio.Redis.pipeline")
+@mark.asyncio
+async def test_create(pipeline_mock: MagicMock, store: SessionStore) -> None:
+    pipe = pipeline_mock.return_value.__aenter__.return_value = MagicMock()
+    pipe.hset.return_value.expire.return_value.execute = AsyncMock()
+
+    session = Session(id="session", name="name", secret=b"secret", public=b"public", expiry=EXPIRY)
+    await store.create("user", session, "127.0.0.1", 1800)
+
+    pipeline_mock.assert_called_once_with(transaction=True)
+    pipe.hset.assert_called_once_with(
+        "user-session",
+        mapping={
+            "id": "session",
+            "name": "name",
+            "secret": b"secret",
+            "public": b"public",
+            "expiry": EXPIRY.timestamp(),
+            "ip": "127.0.0.1",
+        },
+    )
+    pipe.hset.return_value.expire.assert_called_once_with("user-session", 1800)
+    pipe.hset.return_value.expire.return_value.execute.assert_awaited_once()
+
+
+@mark.asyncio
+async def test_fetch_valid(store: SessionStore) -> None:
+    raw = [b"valid", b"secret", b"public", str(EXPIRY.timestamp()).encode(), b"session", b"name"]
+    with patch.object(store, "fetch_script", new_callable=AsyncMock, return_value=raw):
+        state, session = await store.fetch("user", "session", "127.0.0.1", NOW)
+        store.fetch_script.assert_awaited_once_with(
+            keys=["user-session"], args=["127.0.0.1", NOW.timestamp(), "session"]
+        )
+
+    assert state is SessionState.VALID
+    assert session == Session(id="session", name="name", secret=b"secret", public=b"public", expiry=EXPIRY)
+
+
+@mark.asyncio
+async def test_fetch_without_session_id(store: SessionStore) -> None:
+    raw = [b"valid", b"secret", b"public", str(EXPIRY.timestamp()).encode(), None, None]
+    with patch.object(store, "fetch_script", new_callable=AsyncMock, return_value=raw):
+        state, session = await store.fetch("user", None, "127.0.0.1", NOW)
+        store.fetch_script.assert_awaited_once_with(keys=["user-session"], args=["127.0.0.1", NOW.timestamp(), ""])
+
+    assert state is SessionState.VALID
+    assert session.id is None
+    assert session.name is None
+
+
+@mark.asyncio
+@mark.parametrize("raw_state", [b"missing", b"expired", b"wrong_ip"])
+async def test_fetch_invalid(raw_state: bytes, store: SessionStore) -> None:
+    with patch.object(store, "fetch_script", new_callable=AsyncMock, return_value=[raw_state]):
+        state, session = await store.fetch("user", "session", "127.0.0.1", NOW)
+
+    assert state == raw_state.decode()
+    assert session is None
+
+
+@patch("redis.asyncio.Redis.pipeline")
+@mark.asyncio
+async def test_invalidate(pipeline_mock: MagicMock, store: SessionStore) -> None:
+    pipe = pipeline_mock.return_value.__aenter__.return_value = MagicMock()
+    pipe.hdel.return_value.publish.return_value.execute = AsyncMock()
+    epoch = SessionCache().epoch
+
+    await store.invalidate("user")
+
+    pipeline_mock.assert_called_once_with(transaction=True)
+    pipe.hdel.assert_called_once_with("user-session", "name")
+    pipe.hdel.return_value.publish.assert_called_once_with("__keyspace@0__:user-session", "invalidate")
+    pipe.hdel.return_value.publish.return_value.execute.assert_awaited_once()
+    assert SessionCache().epoch == epoch + 1
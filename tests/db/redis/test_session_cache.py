@@ -0,0 +1,174 @@
+import asyncio
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytz
+from db.redis.session_cache import SessionCache, enable_keyspace_events
+from lwe import Secret
+from models.user import User
+from pytest import fixture, mark, raises
+from redis.exceptions import ResponseError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+NOW = datetime.now(tz=pytz.UTC)
+EXPIRY = NOW + timedelta(seconds=1800)
+SECRET = Secret()
+PUBLIC = SECRET.generate_public_key()
+
+
+def make_user(user_id: str) -> User:
+    return User(id=user_id, name="test", public=PUBLIC, secret=SECRET)
+
+
+@fixture
+def cache() -> Generator[SessionCache, None, None]:
+    session_cache = SessionCache()
+    session_cache.enabled = True
+    yield session_cache
+    session_cache.disable()
+    session_cache.reset()
+
+
+def test_get_disabled(cache: SessionCache) -> None:
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+    cache.enabled = False
+    assert cache.get("user", "session", "127.0.0.1", NOW) is None
+    assert cache.stats()["misses"] == 0
+
+
+def test_get_hit(cache: SessionCache) -> None:
+    user = make_user("user")
+    cache.put(user, "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+
+    assert cache.get("user", "session", "127.0.0.1", NOW) is user
+    assert cache.get("user", "other", "127.0.0.1", NOW) is None
+    assert cache.get("user", "session", "128.1.1.1", NOW) is None
+    assert cache.get("user", None, "127.0.0.1", NOW) is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2, "evictions": 0, "invalidations": 0}
+
+
+@patch("db.redis.session_cache.SESSION_CACHE_TTL", 60)
+def test_get_expired(cache: SessionCache) -> None:
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+
+    assert cache.get("user", "session", "127.0.0.1", NOW + timedelta(seconds=61)) is None
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1, "evictions": 1, "invalidations": 0}
+
+
+@patch("db.redis.session_cache.SESSION_CACHE_SIZE", 2)
+def test_put_evicts_least_recently_used(cache: SessionCache) -> None:
+    for user_id in ("a", "b"):
+        cache.put(make_user(user_id), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+
+    cache.get("a", "session", "127.0.0.1", NOW)
+    cache.put(make_user("c"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_put_after_invalidation_is_dropped(cache: SessionCache) -> None:
+    epoch = cache.epoch
+    cache.invalidate("user")
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, epoch)
+
+    assert not cache.entries
+
+
+def test_invalidate(cache: SessionCache) -> None:
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+    cache.invalidate("user")
+    cache.invalidate("missing")
+
+    assert cache.get("user", "session", "127.0.0.1", NOW) is None
+    assert cache.invalidations == 1
+
+
+@mark.asyncio
+async def test_enable_keyspace_events() -> None:
+    redis = MagicMock()
+    redis.config_get = AsyncMock(return_value={"notify-keyspace-events": "Ex"})
+    redis.config_set = AsyncMock()
+
+    assert await enable_keyspace_events(redis)
+    redis.config_set.assert_awaited_once_with("notify-keyspace-events", "EKeghx")
+
+
+@mark.asyncio
+async def test_enable_keyspace_events_already_enabled() -> None:
+    redis = MagicMock()
+    redis.config_get = AsyncMock(return_value={"notify-keyspace-events": "AK"})
+    redis.config_set = AsyncMock()
+
+    assert await enable_keyspace_events(redis)
+    redis.config_set.assert_not_called()
+
+
+@mark.asyncio
+async def test_enable_keyspace_events_forbidden() -> None:
+    redis = MagicMock()
+    redis.config_get = AsyncMock(side_effect=ResponseError())
+
+    assert not await enable_keyspace_events(redis)
+
+
+@mark.asyncio
+async def test_watch_invalidates_on_keyspace_event(cache: SessionCache) -> None:
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+
+    async def listen() -> Generator[dict, None, None]:
+        yield {"type": "psubscribe", "channel": b"__keyspace@0__:*-session", "data": 1}
+        yield {"type": "pmessage", "channel": b"__keyspace@0__:user-session", "data": b"hset"}
+
+    pubsub = MagicMock()
+    pubsub.psubscribe = AsyncMock()
+    pubsub.listen = listen
+    redis = MagicMock()
+    redis.connection_pool.connection_kwargs = {}
+    redis.pubsub.return_value.__aenter__ = AsyncMock(return_value=pubsub)
+    redis.pubsub.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    with patch("db.redis.session_cache.enable_keyspace_events", new_callable=AsyncMock, return_value=True):
+        await cache.watch(redis)
+
+    pubsub.psubscribe.assert_awaited_once_with("__keyspace@0__:*-session")
+    assert "user" not in cache.entries
+    assert cache.invalidations == 1
+
+
+@patch("db.redis.session_cache.SESSION_CACHE_RETRY", 0)
+@mark.asyncio
+@mark.parametrize("error", [RedisTimeoutError(), ResponseError("keyspace notifications disabled"), OSError()])
+async def test_listen_retries_on_redis_errors(error: Exception, cache: SessionCache) -> None:
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+
+    async def watch(_: MagicMock) -> None:
+        if watch_mock.await_count > 1:
+            assert not cache.enabled
+            assert not cache.entries
+            raise asyncio.CancelledError
+
+        raise error
+
+    with (
+        patch.object(cache, "watch", new_callable=AsyncMock, side_effect=watch) as watch_mock,
+        raises(asyncio.CancelledError),
+    ):
+        await cache.listen()
+
+    assert watch_mock.await_count == 2
+    assert not cache.enabled
+
+
+@mark.asyncio
+async def test_listen_disables_cache_on_unexpected_error(cache: SessionCache) -> None:
+    cache.put(make_user("user"), "session", "127.0.0.1", EXPIRY, NOW, cache.epoch)
+    epoch = cache.epoch
+
+    with patch.object(cache, "watch", new_callable=AsyncMock, side_effect=ValueError), raises(ValueError):
+        await cache.listen()
+
+    assert not cache.enabled
+    assert not cache.entries
+    assert cache.epoch > epoch
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import bcrypt
+from hashing.service import Hasher
+from pytest import mark
+
+SALT = bcrypt.gensalt(rounds=4)
+
+
+def test_hasher_cache() -> None:
+    hasher = Hasher()
+    assert Hasher.cache is hasher
+    assert Hasher() is hasher
+
+
+@mark.asyncio
+async def test_context_manager() -> None:
+    async with Hasher() as hasher:
+        assert isinstance(hasher.executor, ThreadPoolExecutor)
+
+    assert hasher.executor is None
+
+
+@mark.asyncio
+async def test_hashpw() -> None:
+    async with Hasher() as hasher:
+        hashed = await hasher.hashpw(b"password", SALT)
+
+    assert hashed == bcrypt.hashpw(b"password", SALT)
+
+
+@mark.asyncio
+async def test_checkpw() -> None:
+    hashed = bcrypt.hashpw(b"password", SALT)
+    async with Hasher() as hasher:
+        assert await hasher.checkpw(b"password", hashed)
+        assert not await hasher.checkpw(b"wrong", hashed)
+
+
+@patch("hashing.service.HASHING_WORKERS", 1)
+@mark.asyncio
+async def test_queue_depth() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    depths = []
+
+    async with Hasher() as hasher:
+        loop = asyncio.get_running_loop()
+
+        def block(_: bytes) -> None:
+            loop.call_soon_threadsafe(started.set)
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+
+        tasks = [asyncio.create_task(hasher.run(block, b"")) for _ in range(3)]
+        await started.wait()
+        depths.append(hasher.stats())
+        release.set()
+        await asyncio.gather(*tasks)
+        depths.append(hasher.stats())
+
+    assert depths == [
+        {"workers": 1, "in_flight": 3, "queue_depth": 2},
+        {"workers": 1, "in_flight": 0, "queue_depth": 0},
+    ]
+
+
+@patch("hashing.service.HASHING_BULK_WORKERS", 2)
+@patch("hashing.service.HASHING_WORKERS", 4)
+@mark.asyncio
+async def test_hashpw_many_limits_concurrency() -> None:
+    lock = threading.Lock()
+    running = peak = 0
+
+    def hashpw(password: bytes, salt: bytes) -> bytes:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+        return salt + password
+
+    await Hasher().close()
+    with patch("hashing.service.bcrypt.hashpw", hashpw):
+        async with Hasher() as hasher:
+            assert await hasher.hashpw_many([b"a", b"b", b"c", b"d", b"e"], b"salt") == [
+                b"salta",
+                b"saltb",
+                b"saltc",
+                b"saltd",
+                b"salte",
+            ]
+
+    assert peak == 2
@@ -0,0 +1,74 @@
+import asyncio
+from collections import deque
+from typing import Self
+from unittest.mock import patch
+
+from keypairs.service import Keypair, Keypairs
+from lwe import Public, Secret
+from pytest import mark
+
+
+class Pool(deque):
+    def __init__(self: Self, size: int) -> None:
+        super().__init__()
+        self.size = size
+        self.full = asyncio.Event()
+
+    def extend(self: Self, pairs: list[Keypair]) -> None:
+        super().extend(pairs)
+        if len(self) >= self.size:
+            self.full.set()
+
+    async def filled(self: Self) -> None:
+        await asyncio.wait_for(self.full.wait(), timeout=5)
+        self.full.clear()
+
+
+def test_keypairs_cache() -> None:
+    keypairs = Keypairs()
+    assert Keypairs.cache is keypairs
+    assert Keypairs() is keypairs
+
+
+@mark.asyncio
+async def test_take_inline_when_empty() -> None:
+    keypairs = Keypairs()
+    misses = keypairs.misses
+
+    secret, public = keypairs.take()
+
+    assert isinstance(secret, Secret)
+    assert secret.decrypt(Public.from_b64(public).encrypt("message")) == "message"
+    assert keypairs.misses == misses + 1
+
+
+@patch("keypairs.service.KEYPAIR_REFILL_BATCH", 2)
+@patch("keypairs.service.KEYPAIR_POOL_SIZE", 3)
+@mark.asyncio
+async def test_producer_fills_and_refills() -> None:
+    with patch.object(Keypairs(), "pairs", Pool(3)) as pool:
+        async with Keypairs() as keypairs:
+            await pool.filled()
+            await asyncio.sleep(0.01)
+            assert len(keypairs.pairs) == 3
+
+            hits = keypairs.hits
+            secret, public = keypairs.take()
+            assert keypairs.hits == hits + 1
+            assert secret.decrypt(Public.from_b64(public).encrypt("message")) == "message"
+
+            await pool.filled()
+            assert len(keypairs.pairs) == 3
+            assert keypairs.stats()["capacity"] == 3
+
+        assert keypairs.producer is None
+        assert not keypairs.pairs
+
+
+@patch("keypairs.service.KEYPAIR_POOL_SIZE", 0)
+@mark.asyncio
+async def test_disabled_pool() -> None:
+    async with Keypairs() as keypairs:
+        assert keypairs.producer is None
+        keypairs.take()
+        assert not keypairs.pairs
@@ -1,5 +1,7 @@
-from lwe import Public, Secret
-from pytest import fixture
+import asyncio
+
+from lwe import Public, Secret, configure_pool, pool_stats
+from pytest import fixture, mark, raises
 
 
 @fixture
@@ -45,6 +47,37 @@ def test_decrypt_ut8(keys: tuple[Secret, Public]) -> None:
     assert decrypted == message
 
 
+def test_decrypt_compact(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    message = "Hello, world! 你好世界！"  # noqa: RUF001
+
+    encrypted = public.encrypt(message, compact=True)
+    assert encrypted.startswith("v1.")
+    assert len(encrypted) < len(public.encrypt(message)) * 0.8
+
+    decrypted = secret.decrypt(encrypted)
+
+    assert decrypted == message
+
+
+def test_compact_public_key(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    assert public.is_compact()
+
+    compact = public.to_bytes(compact=True)
+    full = public.to_bytes()
+    assert len(compact) * 10 < len(full)
+    assert public.to_b64(compact=True) != public.to_b64()
+
+    message = "Hello, world!"
+    for key in (Public.from_bytes(compact), Public.from_bytes(full), Public.from_b64(public.to_b64(compact=True))):
+        assert key.to_bytes(compact=False) == full
+        assert secret.decrypt(key.encrypt(message)) == message
+
+    assert Public.from_bytes(compact).is_compact()
+    assert not Public.from_bytes(full).is_compact()
+
+
 def test_from_and_to_bytes(keys: tuple[Secret, Public]) -> None:
     secret, public = keys
 
@@ -89,3 +122,83 @@ def test_from_and_to_b64(keys: tuple[Secret, Public]) -> None:
         assert message not in encrypted
         decrypted = s_key.decrypt(encrypted)
         assert decrypted == message
+
+
+@mark.asyncio
+async def test_async_round_trip(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    message = "Hello, world! 你好世界"
+
+    for compact in (False, True):
+        encrypted = await public.encrypt_async(message, compact=compact)
+        assert await secret.decrypt_async(encrypted) == message
+
+
+@mark.asyncio
+async def test_decrypt_async_concurrent(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    messages = [f"message {i}" * 100 for i in range(16)]
+
+    decrypted = await asyncio.gather(*(secret.decrypt_async(public.encrypt(message)) for message in messages))
+    assert decrypted == messages
+
+
+@mark.asyncio
+async def test_encrypt_many_async(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    messages = ["Hello, world!", "你好世界", *(f"message {i} " * i for i in range(64))]
+
+    encrypted = await public.encrypt_many_async(messages, compact=True)
+    assert secret.decrypt_many(encrypted) == messages
+
+
+@mark.asyncio
+async def test_decrypt_async_invalid(keys: tuple[Secret, Public]) -> None:
+    secret, _ = keys
+
+    with raises(ValueError, match="Could not parse b64"):
+        await secret.decrypt_async("not b64!")
+
+
+def test_decrypt_many(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    messages = ["Hello, world!", "你好世界", "", *(f"message {i} " * i for i in range(64))]
+
+    for compact in (False, True):
+        encrypted = public.encrypt_many(messages, compact=compact)
+        assert len(encrypted) == len(messages)
+        assert secret.decrypt_many(encrypted) == messages
+
+
+def test_decrypt_many_invalid(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+
+    with raises(ValueError, match="Could not parse b64"):
+        secret.decrypt_many([public.encrypt("Hello"), "not b64!"])
+
+
+def test_pool_stats(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    secret.decrypt(public.encrypt("Hello, world!"))
+
+    stats = pool_stats()
+    assert stats["threads"] > 0
+    assert stats["in_flight"] >= 0
+    assert stats["completed"] >= 0
+
+    with raises(RuntimeError, match="already initialised"):
+        configure_pool(threads=1)
+
+    with raises(ValueError, match="greater than 0"):
+        configure_pool(threads=0)
+
+
+@mark.asyncio
+async def test_decrypt_bytes(keys: tuple[Secret, Public]) -> None:
+    secret, public = keys
+    message = "Hello, world! 你好世界"
+
+    for compact in (False, True):
+        encrypted = public.encrypt(message, compact=compact)
+        assert secret.decrypt_bytes(encrypted) == message.encode()
+        assert await secret.decrypt_bytes_async(encrypted) == message.encode()
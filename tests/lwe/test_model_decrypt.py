@@ -0,0 +1,93 @@
+import os
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from lwe import MAX_MESSAGE_CHARS, Secret
+from models.input import EncryptedInput
+from models.password.get import GetPasswordIn, GetPasswordsIn
+from models.user import User
+from pytest import fixture, mark, raises
+from routes.password.bulk.constants import BULK_ENTRY_CHARS, BULK_MAX_ENTRIES
+from routes.password.bulk.inbound import SetPasswordsIn
+from routes.password.post.inbound import SetPasswordIn
+
+with patch.dict(os.environ, {"JWT_SECRET": "JWT_SECRET"}):
+    from lwe.model_decrypt import (
+        decrypt,
+        decrypt_get_password,
+        decrypt_get_passwords,
+        decrypt_model,
+        decrypt_set_passwords,
+    )
+
+SECRET = Secret()
+
+
+@fixture
+def user() -> User:
+    return User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+
+@mark.asyncio
+async def test_decrypt_model(user: User) -> None:
+    assert await decrypt_get_password((user, b'{"name": "a"}')) == (GetPasswordIn(name="a"), user)
+
+
+@mark.asyncio
+@mark.parametrize("message", [b"not json", b'{"other": "a"}', b"[]"])
+async def test_decrypt_model_bad_input(user: User, message: bytes) -> None:
+    with raises(HTTPException) as error:
+        await decrypt_get_password((user, message))
+
+    assert error.value.status_code == 400
+
+
+@mark.asyncio
+async def test_decrypt_set_passwords(user: User) -> None:
+    payload = (SetPasswordsIn.model_validate_json(b'[{"name": "a", "password": "b"}]'), user)
+    set_passwords_in, _ = await decrypt_set_passwords(payload)
+
+    assert set_passwords_in == [SetPasswordIn(name="a", password="b")]  # noqa: S106
+
+
+@mark.asyncio
+async def test_decrypt_get_passwords_too_many(user: User) -> None:
+    with raises(HTTPException) as error:
+        await decrypt_get_passwords((GetPasswordsIn(names=["a"] * (BULK_MAX_ENTRIES + 1)), user))
+
+    assert error.value.status_code == 413
+
+
+@mark.asyncio
+async def test_decrypt_bulk_entries(user: User) -> None:
+    entries = [
+        SetPasswordIn(name=f"site-{index}", password="p" * 32, username="user@example.com") for index in range(1000)
+    ]
+    content = user.public.encrypt(SetPasswordsIn(entries).model_dump_json(), compact=True)
+
+    payload = await decrypt_model(SetPasswordsIn)(await decrypt(EncryptedInput(content=content), user))
+    set_passwords_in, _ = await decrypt_set_passwords(payload)
+
+    assert set_passwords_in == entries
+    assert BULK_MAX_ENTRIES * BULK_ENTRY_CHARS <= MAX_MESSAGE_CHARS
+
+
+@mark.asyncio
+@mark.parametrize("compact", [False, True])
+async def test_decrypt_message_limit(user: User, compact: bool) -> None:
+    content = user.public.encrypt("a" * MAX_MESSAGE_CHARS, compact=compact)
+    assert await decrypt(EncryptedInput(content=content), user) == (user, b"a" * MAX_MESSAGE_CHARS)
+
+    content = user.public.encrypt("a" * (MAX_MESSAGE_CHARS + 1), compact=compact)
+    with raises(HTTPException) as error:
+        await decrypt(EncryptedInput(content=content), user)
+
+    assert error.value.status_code == 413
+
+
+@mark.asyncio
+async def test_decrypt_bad_ciphertext(user: User) -> None:
+    with raises(HTTPException) as error:
+        await decrypt(EncryptedInput(content="not b64!"), user)
+
+    assert error.value.status_code == 400
@@ -0,0 +1,34 @@
+import json
+
+from lwe import Secret
+from lwe.model_encrypt import encrypt, encrypt_many
+from models.password.get import GetPasswordOut
+from models.user import User
+from pytest import fixture, mark
+
+SECRET = Secret()
+
+
+@fixture
+def user() -> User:
+    return User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+
+@mark.asyncio
+async def test_encrypt(user: User) -> None:
+    model = GetPasswordOut(username="user", password="password")  # noqa: S106
+
+    encrypted = await encrypt(model, user)
+
+    assert GetPasswordOut.model_validate_json(SECRET.decrypt(encrypted.content)) == model
+
+
+@mark.asyncio
+async def test_encrypt_many(user: User) -> None:
+    models = [GetPasswordOut(username=f"user-{i}", password=f"password-{i}") for i in range(3)]
+
+    encrypted = await encrypt_many(models, user)
+
+    assert [json.loads(SECRET.decrypt(output.content)) for output in encrypted] == [
+        model.model_dump() for model in models
+    ]
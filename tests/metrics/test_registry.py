@@ -0,0 +1,40 @@
+from metrics.registry import Histogram, Metrics, format_labels
+
+
+def test_metrics_cache() -> None:
+    metrics = Metrics()
+    assert Metrics.cache is metrics
+    assert Metrics() is metrics
+
+
+def test_format_labels() -> None:
+    assert format_labels(()) == ""
+    assert format_labels((("route", "/new"),), le="0.5") == '{route="/new",le="0.5"}'
+    assert format_labels((("route", 'a"b\\c'),)) == '{route="a\\"b\\\\c"}'
+
+
+def test_histogram() -> None:
+    histogram = Histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+    histogram.observe(0.05, phase="jwt")
+    histogram.observe(0.1, phase="jwt")
+    histogram.observe(0.5, phase="jwt")
+    histogram.observe(5, phase="jwt")
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test histogram.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{phase="jwt",le="0.1"} 2',
+        'test_seconds_bucket{phase="jwt",le="1.0"} 3',
+        'test_seconds_bucket{phase="jwt",le="+Inf"} 4',
+        'test_seconds_sum{phase="jwt"} 5.65',
+        'test_seconds_count{phase="jwt"} 4',
+    ]
+
+
+def test_render() -> None:
+    rendered = Metrics().render({"session_cache": {"hits": 3}}, {"hashing": {"in_flight": 1}})
+
+    assert "# TYPE vault_request_duration_seconds histogram\n" in rendered
+    assert "# TYPE vault_session_cache_hits_total counter\nvault_session_cache_hits_total 3\n" in rendered
+    assert "# TYPE vault_hashing_in_flight gauge\nvault_hashing_in_flight 1\n" in rendered
+    assert rendered.endswith("\n")
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from metrics.registry import Metrics
+from metrics.timing import PHASES, TimingMiddleware, phase, server_timing
+from pytest import mark
+from starlette.types import Message, Receive, Scope, Send
+
+
+def test_phase_records_histogram() -> None:
+    before = sum(sum(counts) for counts, _ in Metrics().phases.series.values())
+
+    with phase("test"):
+        pass
+
+    assert sum(sum(counts) for counts, _ in Metrics().phases.series.values()) == before + 1
+    assert (("phase", "test"),) in Metrics().phases.series
+
+
+def test_private_phase_not_published() -> None:
+    phases: dict[str, float] = {}
+    token = PHASES.set(phases)
+    try:
+        with phase("bcrypt"):
+            pass
+    finally:
+        PHASES.reset(token)
+
+    assert "bcrypt" in phases
+    assert (("phase", "bcrypt"),) not in Metrics().phases.series
+
+
+def test_phase_accumulates_in_request() -> None:
+    phases: dict[str, float] = {}
+    token = PHASES.set(phases)
+    try:
+        with phase("psql"):
+            pass
+        with phase("psql"):
+            pass
+        with phase("jwt"):
+            pass
+    finally:
+        PHASES.reset(token)
+
+    assert list(phases) == ["psql", "jwt"]
+    assert all(elapsed >= 0 for elapsed in phases.values())
+
+
+def test_server_timing() -> None:
+    assert server_timing({"jwt": 0.0012, "decrypt": 0.5}, 0.75) == "jwt;dur=1.20, decrypt;dur=500.00, total;dur=750.00"
+
+
+@mark.asyncio
+async def test_middleware() -> None:
+    sent: list[Message] = []
+
+    async def app(scope: Scope, _: Receive, send: Send) -> None:
+        with phase("jwt"):
+            pass
+
+        scope["route"] = type("Route", (), {"path": "/password"})()
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    await TimingMiddleware(app)({"type": "http", "method": "GET"}, receive, send)
+
+    header = dict(sent[0]["headers"])[b"server-timing"].decode()
+    assert header.startswith("jwt;dur=")
+    assert ", total;dur=" in header
+    assert (("method", "GET"), ("route", "/password"), ("status", "404")) in Metrics().requests.series
+    assert PHASES.get() is None
+
+
+async def authenticate(debug: bool) -> list[Message]:
+    sent: list[Message] = []
+
+    async def app(_: Scope, __: Receive, send: Send) -> None:
+        with phase("psql"):
+            pass
+
+        await send({"type": "http.response.start", "status": 401, "headers": []})
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    with patch("metrics.timing.SERVER_TIMING_DEBUG", debug):
+        await TimingMiddleware(app)({"type": "http", "method": "POST", "path": "/authenticate"}, receive, send)
+
+    return sent
+
+
+@mark.asyncio
+async def test_middleware_hides_authenticate() -> None:
+    assert b"server-timing" not in dict((await authenticate(debug=False))[0]["headers"])
+    assert b"server-timing" in dict((await authenticate(debug=True))[0]["headers"])
@@ -1,24 +1,30 @@
+import base64
+import os
 import uuid
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, PropertyMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import bcrypt
 import jwt
 import pytest
 import pytz
 from db.psql.users.queries import GET_USER
+from db.redis.session_cache import SessionCache
 from fastapi import HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from freezegun import freeze_time
+from hashing.service import Hasher
 from lwe import Public, Secret
 from models.authenticate.output import Token
+from models.session import Session
 from pytest import fixture, mark
 from starlette.datastructures import Headers
+from usernames.service import Usernames
 
 FAKE_SECRET = "JWT_SECRET"  # noqa: S105
-with patch("os.getenv", return_value=FAKE_SECRET):
+with patch.dict(os.environ, {"JWT_SECRET": FAKE_SECRET}):
     from routes.authenticate.auth import authenticate_user
-    from routes.authenticate.constants import JWT_ALGORITHM, SESSION_DURATION
+    from routes.authenticate.constants import JWT_ALGORITHM, JWT_SECRET, SESSION_DURATION
 
 TEST_TIME = datetime.now(tz=pytz.UTC)
 SECRET = Secret()
@@ -82,9 +88,8 @@ def request_obj() -> Request:
     )
 
 
-@patch("lwe.Secret.to_b64", return_value="secret_b64")
-@patch("db.redis.client.Redis", new_callable=MagicMock)
-@patch("db.redis.client.Redis.set", new_callable=AsyncMock)
+@patch("lwe.Secret.to_bytes", return_value=b"secret")
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
 @patch("db.psql.client.Psql", new_callable=MagicMock)
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
 @freeze_time(TEST_TIME.isoformat())
@@ -92,39 +97,44 @@ def request_obj() -> Request:
 async def test_auth_positive_flow(
     row_mock: AsyncMock,
     _: MagicMock,
-    set_mock: AsyncMock,
-    __: MagicMock,
-    secret_b64_mock: MagicMock,
+    create_mock: AsyncMock,
+    secret_bytes_mock: MagicMock,
     form_data: OAuth2PasswordRequestForm,
     request_obj: Request,
 ) -> None:
+    epoch = SessionCache().epoch
     token = await authenticate_user(form_data, request_obj)
     row_mock.assert_called_once_with(GET_USER, form_data.username)
-    assert set_mock.call_count == 4
-    expiry = (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat()
-    set_mock.assert_has_calls(
-        [
-            call(f"{row_mock.return_value['id']!s}-secret", secret_b64_mock.return_value, ex=SESSION_DURATION),
-            call(f"{row_mock.return_value['id']!s}-public", form_data.client_secret, ex=SESSION_DURATION),
-            call(f"{row_mock.return_value['id']!s}-expiry", expiry, ex=SESSION_DURATION),
-            call(f"{row_mock.return_value['id']!s}-ip", request_obj.client.host, ex=SESSION_DURATION),
-        ],
-        any_order=True,
+    expiry = TEST_TIME + timedelta(seconds=SESSION_DURATION)
+    session_id = create_mock.call_args.args[1].id
+    create_mock.assert_called_once_with(
+        str(row_mock.return_value["id"]),
+        Session(
+            id=session_id,
+            name=row_mock.return_value["name"],
+            secret=secret_bytes_mock.return_value,
+            public=PUBLIC.to_bytes(),
+            expiry=expiry,
+        ),
+        request_obj.client.host,
+        SESSION_DURATION,
     )
 
     assert isinstance(token, Token)
-    jwt_token = jwt.decode(token.access_token, FAKE_SECRET, algorithms=JWT_ALGORITHM)
-    assert jwt_token["expires"] == expiry
+    assert Hasher().in_flight == 0
+    assert SessionCache().epoch == epoch + 1
+    jwt_token = jwt.decode(token.access_token, JWT_SECRET, algorithms=JWT_ALGORITHM)
+    assert jwt_token["expires"] == expiry.isoformat()
     assert jwt_token["id"] == str(row_mock.return_value["id"])
     assert jwt_token["duration"] == SESSION_DURATION
+    assert jwt_token["session"] == session_id
 
     assert token.token_type == "Bearer"  # noqa: S105
 
-    Public.from_b64(token.public_key)
+    assert not Public.from_b64(token.public_key).is_compact()
 
 
-@patch("db.redis.client.Redis", new_callable=MagicMock)
-@patch("db.redis.client.Redis.set", new_callable=AsyncMock)
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
 @patch("db.psql.client.Psql", new_callable=MagicMock)
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
 @freeze_time(TEST_TIME.isoformat())
@@ -132,8 +142,7 @@ async def test_auth_positive_flow(
 async def test_auth_no_client_secret(
     row_mock: AsyncMock,
     _: MagicMock,
-    set_mock: AsyncMock,
-    __: MagicMock,
+    create_mock: AsyncMock,
     form_data_no_client_secret: OAuth2PasswordRequestForm,
     request_obj: Request,
 ) -> None:
@@ -144,11 +153,11 @@ async def test_auth_no_client_secret(
     assert error_info.value.detail == "Invalid client secret"
 
     row_mock.assert_not_called()
-    set_mock.assert_not_called()
+    create_mock.assert_not_called()
 
 
-@patch("db.redis.client.Redis", new_callable=MagicMock)
-@patch("db.redis.client.Redis.set", new_callable=AsyncMock)
+@patch("hashing.service.Hasher.checkpw", new_callable=AsyncMock)
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
 @patch("db.psql.client.Psql", new_callable=MagicMock)
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=None)
 @freeze_time(TEST_TIME.isoformat())
@@ -156,11 +165,12 @@ async def test_auth_no_client_secret(
 async def test_auth_no_user(
     row_mock: AsyncMock,
     _: MagicMock,
-    set_mock: AsyncMock,
-    __: MagicMock,
+    create_mock: AsyncMock,
+    checkpw_mock: AsyncMock,
     form_data: OAuth2PasswordRequestForm,
     request_obj: Request,
 ) -> None:
+    Usernames().dummy = USER_FETCH["hashed_password"]
     with pytest.raises(HTTPException) as error_info:
         await authenticate_user(form_data, request_obj)
 
@@ -168,11 +178,11 @@ async def test_auth_no_user(
     assert error_info.value.detail == "Invalid username or password"
 
     row_mock.assert_called_once_with(GET_USER, form_data.username)
-    set_mock.assert_not_called()
+    checkpw_mock.assert_called_once_with(PASSWORD.encode(), USER_FETCH["hashed_password"])
+    create_mock.assert_not_called()
 
 
-@patch("db.redis.client.Redis", new_callable=MagicMock)
-@patch("db.redis.client.Redis.set", new_callable=AsyncMock)
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
 @patch("db.psql.client.Psql", new_callable=MagicMock)
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
 @freeze_time(TEST_TIME.isoformat())
@@ -180,8 +190,7 @@ async def test_auth_no_user(
 async def test_auth_wrong_password(
     row_mock: AsyncMock,
     _: MagicMock,
-    set_mock: AsyncMock,
-    __: MagicMock,
+    create_mock: AsyncMock,
     form_data_wrong_password: OAuth2PasswordRequestForm,
     request_obj: Request,
 ) -> None:
@@ -192,12 +201,11 @@ async def test_auth_wrong_password(
     assert error_info.value.detail == "Invalid username or password"
 
     row_mock.assert_called_once_with(GET_USER, form_data_wrong_password.username)
-    set_mock.assert_not_called()
+    create_mock.assert_not_called()
 
 
 @patch("starlette.requests.Request.client", new_callable=lambda: PropertyMock(return_value=None))
-@patch("db.redis.client.Redis", new_callable=MagicMock)
-@patch("db.redis.client.Redis.set", new_callable=AsyncMock)
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
 @patch("db.psql.client.Psql", new_callable=MagicMock)
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
 @freeze_time(TEST_TIME.isoformat())
@@ -205,9 +213,8 @@ async def test_auth_wrong_password(
 async def test_auth_no_client(
     row_mock: AsyncMock,
     _: MagicMock,
-    set_mock: AsyncMock,
+    create_mock: AsyncMock,
     __: MagicMock,
-    ___: MagicMock,
     form_data: OAuth2PasswordRequestForm,
     request_obj: Request,
 ) -> None:
@@ -218,11 +225,10 @@ async def test_auth_no_client(
     assert error_info.value.detail == "Invalid client"
 
     row_mock.assert_not_called()
-    set_mock.assert_not_called()
+    create_mock.assert_not_called()
 
 
-@patch("db.redis.client.Redis", new_callable=MagicMock)
-@patch("db.redis.client.Redis.set", new_callable=AsyncMock)
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
 @patch("db.psql.client.Psql", new_callable=MagicMock)
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
 @freeze_time(TEST_TIME.isoformat())
@@ -230,8 +236,7 @@ async def test_auth_no_client(
 async def test_auth_invalid_public_key(
     row_mock: AsyncMock,
     _: MagicMock,
-    set_mock: AsyncMock,
-    __: MagicMock,
+    create_mock: AsyncMock,
     form_data_bad_pub_key: OAuth2PasswordRequestForm,
     request_obj: Request,
 ) -> None:
@@ -242,4 +247,35 @@ async def test_auth_invalid_public_key(
     assert error_info.value.detail == "Invalid client secret"
 
     row_mock.assert_not_called()
-    set_mock.assert_not_called()
+    create_mock.assert_not_called()
+
+
+@patch("db.redis.session.SessionStore.create", new_callable=AsyncMock)
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
+@mark.asyncio
+@mark.parametrize(("offset", "value"), [(0, 0), (4, 2**31 - 1), (8, 2)])
+async def test_auth_malformed_public_key(
+    row_mock: AsyncMock,
+    _: MagicMock,
+    create_mock: AsyncMock,
+    offset: int,
+    value: int,
+    request_obj: Request,
+) -> None:
+    malformed = bytearray(PUBLIC.to_bytes(compact=True))
+    malformed[offset : offset + 4] = value.to_bytes(4, "little")
+    form_data = OAuth2PasswordRequestForm(
+        username="test",
+        password=PASSWORD,
+        client_secret=base64.urlsafe_b64encode(malformed).decode(),
+    )
+
+    with pytest.raises(HTTPException) as error_info:
+        await authenticate_user(form_data, request_obj)
+
+    assert error_info.value.status_code == 401
+    assert error_info.value.detail == "Invalid client secret"
+
+    row_mock.assert_not_called()
+    create_mock.assert_not_called()
@@ -1,14 +1,18 @@
+import os
 import uuid
+from collections.abc import Generator
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, PropertyMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import jwt
 import pytest
 import pytz
 from db.psql.users.queries import GET_USER_FROM_ID
+from db.redis.session_cache import SessionCache
 from fastapi import HTTPException
 from freezegun import freeze_time
 from lwe import Public, Secret
+from models.session import Session, SessionState
 from models.user import User
 from pytest import mark
 from pytest_asyncio import fixture
@@ -16,8 +20,8 @@ from starlette.datastructures import Headers
 from starlette.requests import Request
 
 FAKE_SECRET = "JWT_SECRET"  # noqa: S105
-with patch("os.getenv", return_value=FAKE_SECRET):
-    from routes.authenticate.constants import SESSION_DURATION
+with patch.dict(os.environ, {"JWT_SECRET": FAKE_SECRET}):
+    from routes.authenticate.constants import JWT_SECRET, SESSION_DURATION
     from routes.authenticate.current_user import get_current_user
 
 TEST_TIME = datetime.now(tz=pytz.UTC)
@@ -25,53 +29,10 @@ USER_ID = str(uuid.uuid4())
 SECRET = Secret()
 PUBLIC = SECRET.generate_public_key()
 USER_FETCH = {"id": USER_ID, "name": "test"}
-REDIS_GETS = {
-    f"{USER_ID}-ip": "127.0.0.1",
-    f"{USER_ID}-expiry": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
-    f"{USER_ID}-public": PUBLIC.to_b64(),
-    f"{USER_ID}-secret": SECRET.to_b64(),
-}
-REDIS_GETS_NO_IP = {
-    f"{USER_ID}-expiry": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
-    f"{USER_ID}-public": PUBLIC.to_b64(),
-    f"{USER_ID}-secret": SECRET.to_b64(),
-}
-REDIS_GETS_WRONG_IP = {
-    f"{USER_ID}-ip": "128.1.1.1",
-    f"{USER_ID}-expiry": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
-    f"{USER_ID}-public": PUBLIC.to_b64(),
-    f"{USER_ID}-secret": SECRET.to_b64(),
-}
-REDIS_GETS_NO_SECRET = {
-    f"{USER_ID}-ip": "127.0.0.1",
-    f"{USER_ID}-expiry": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
-    f"{USER_ID}-public": PUBLIC.to_b64(),
-}
-REDIS_GETS_NO_PUBLIC = {
-    f"{USER_ID}-ip": "127.0.0.1",
-    f"{USER_ID}-expiry": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
-    f"{USER_ID}-secret": SECRET.to_b64(),
-}
-
-
-def redis_get_mock_func(key: str) -> str | None:
-    return REDIS_GETS.get(key)
-
-
-def redis_get_mock_func_no_ip(key: str) -> str | None:
-    return REDIS_GETS_NO_IP.get(key)
-
-
-def redis_get_mock_func_wrong_ip(key: str) -> str | None:
-    return REDIS_GETS_WRONG_IP.get(key)
-
-
-def redis_get_mock_func_no_secret(key: str) -> str | None:
-    return REDIS_GETS_NO_SECRET.get(key)
-
-
-def redis_get_mock_func_no_public(key: str) -> str | None:
-    return REDIS_GETS_NO_PUBLIC.get(key)
+SESSION_ID = uuid.uuid4().hex
+SESSION_EXPIRY = TEST_TIME + timedelta(seconds=SESSION_DURATION)
+SESSION = Session(id=SESSION_ID, name="test", secret=SECRET.to_bytes(), public=PUBLIC.to_bytes(), expiry=SESSION_EXPIRY)
+LEGACY_SESSION = Session(id=None, name=None, secret=SECRET.to_b64(), public=PUBLIC.to_b64(), expiry=SESSION_EXPIRY)
 
 
 @fixture
@@ -81,7 +42,27 @@ def token() -> str:
         "expires": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
         "duration": SESSION_DURATION,
     }
-    return jwt.encode(raw_token, FAKE_SECRET)
+    return jwt.encode(raw_token, JWT_SECRET)
+
+
+@fixture
+def token_with_session() -> str:
+    raw_token = {
+        "id": USER_ID,
+        "expires": SESSION_EXPIRY.isoformat(),
+        "duration": SESSION_DURATION,
+        "session": SESSION_ID,
+    }
+    return jwt.encode(raw_token, JWT_SECRET)
+
+
+@fixture
+def session_cache() -> Generator[SessionCache, None, None]:
+    cache = SessionCache()
+    cache.enabled = True
+    yield cache
+    cache.disable()
+    cache.reset()
 
 
 @fixture
@@ -90,7 +71,7 @@ def token_no_id() -> str:
         "expires": (TEST_TIME + timedelta(seconds=SESSION_DURATION)).isoformat(),
         "duration": SESSION_DURATION,
     }
-    return jwt.encode(raw_token, FAKE_SECRET)
+    return jwt.encode(raw_token, JWT_SECRET)
 
 
 @fixture
@@ -110,11 +91,11 @@ def request_obj() -> Request:
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func)
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, SESSION))
 @freeze_time(TEST_TIME.isoformat())
 @mark.asyncio
 async def test_get_current_user_positive(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+    fetch_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
 ) -> None:
     user = await get_current_user(token, request_obj)
 
@@ -126,149 +107,151 @@ async def test_get_current_user_positive(
     assert user.secret.to_b64() == SECRET.to_b64()
     assert user.public.to_b64() == PUBLIC.to_b64()
 
-    row_mock.assert_called_once_with(GET_USER_FROM_ID, USER_ID)
-    assert get_mock.call_count == 4
-    get_mock.assert_has_calls([call(key) for key in REDIS_GETS], any_order=True)
+    row_mock.assert_not_called()
+    fetch_mock.assert_called_once_with(USER_ID, None, request_obj.client.host, TEST_TIME)
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func)
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, LEGACY_SESSION))
+@freeze_time(TEST_TIME.isoformat())
 @mark.asyncio
-async def test_get_current_user_invalid_jwt(get_mock: AsyncMock, row_mock: AsyncMock, request_obj: Request) -> None:
-    with pytest.raises(HTTPException) as error_info:
-        await get_current_user("Invalid", request_obj)
+async def test_get_current_user_legacy_session(
+    fetch_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+) -> None:
+    user = await get_current_user(token, request_obj)
 
-    assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Invalid username or password"
-    row_mock.assert_not_called()
-    get_mock.assert_not_called()
+    assert user.id == USER_ID
+    assert user.name == USER_FETCH["name"]
+    assert user.secret.to_bytes() == SECRET.to_bytes()
+    assert user.public.to_bytes() == PUBLIC.to_bytes()
+    row_mock.assert_called_once_with(GET_USER_FROM_ID, USER_ID)
+    fetch_mock.assert_called_once_with(USER_ID, None, request_obj.client.host, TEST_TIME)
 
 
-@patch("starlette.requests.Request.client", new_callable=lambda: PropertyMock(return_value=None))
-@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=None)
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, LEGACY_SESSION))
+@freeze_time(TEST_TIME.isoformat())
 @mark.asyncio
-async def test_get_current_user_no_client(
-    get_mock: AsyncMock, row_mock: AsyncMock, _: MagicMock, token: str, request_obj: Request
+async def test_get_current_user_legacy_session_deleted_user(
+    _: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
 ) -> None:
     with pytest.raises(HTTPException) as error_info:
         await get_current_user(token, request_obj)
 
     assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Invalid client"
-    row_mock.assert_not_called()
-    get_mock.assert_not_called()
+    assert error_info.value.detail == "Invalid username or password"
+    row_mock.assert_called_once_with(GET_USER_FROM_ID, USER_ID)
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", new_callable=AsyncMock, return_value=None)
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, SESSION))
 @mark.asyncio
-async def test_get_current_user_no_expiry(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
-) -> None:
+async def test_get_current_user_invalid_jwt(fetch_mock: AsyncMock, row_mock: AsyncMock, request_obj: Request) -> None:
     with pytest.raises(HTTPException) as error_info:
-        await get_current_user(token, request_obj)
+        await get_current_user("Invalid", request_obj)
 
     assert error_info.value.status_code == 401
     assert error_info.value.detail == "Invalid username or password"
     row_mock.assert_not_called()
-    get_mock.assert_called_once_with(f"{USER_FETCH['id']}-expiry")
+    fetch_mock.assert_not_called()
 
 
+@patch("starlette.requests.Request.client", new_callable=lambda: PropertyMock(return_value=None))
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", new_callable=AsyncMock, return_value=TEST_TIME.isoformat())
-@freeze_time((TEST_TIME + timedelta(seconds=1)).isoformat())
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, SESSION))
 @mark.asyncio
-async def test_get_current_user_expired_token(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+async def test_get_current_user_no_client(
+    fetch_mock: AsyncMock, row_mock: AsyncMock, _: MagicMock, token: str, request_obj: Request
 ) -> None:
     with pytest.raises(HTTPException) as error_info:
         await get_current_user(token, request_obj)
 
     assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Token has expired"
+    assert error_info.value.detail == "Invalid client"
     row_mock.assert_not_called()
-    get_mock.assert_called_once_with(f"{USER_FETCH['id']}-expiry")
+    fetch_mock.assert_not_called()
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func_no_ip)
-@freeze_time(TEST_TIME.isoformat())
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.MISSING, None))
 @mark.asyncio
-async def test_get_current_user_no_ip(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+async def test_get_current_user_no_session(
+    fetch_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
 ) -> None:
     with pytest.raises(HTTPException) as error_info:
         await get_current_user(token, request_obj)
 
     assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Invalid ip please reauthenticate"
+    assert error_info.value.detail == "Invalid username or password"
     row_mock.assert_not_called()
-    assert get_mock.call_count == 2
-    get_mock.assert_has_calls([call(f"{USER_FETCH['id']}-expiry"), call(f"{USER_FETCH['id']}-ip")])
+    fetch_mock.assert_called_once()
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func_wrong_ip)
-@freeze_time(TEST_TIME.isoformat())
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.EXPIRED, None))
 @mark.asyncio
-async def test_get_current_user_wrong_ip(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+async def test_get_current_user_expired_token(
+    fetch_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
 ) -> None:
     with pytest.raises(HTTPException) as error_info:
         await get_current_user(token, request_obj)
 
     assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Invalid ip please reauthenticate"
+    assert error_info.value.detail == "Token has expired"
     row_mock.assert_not_called()
-    assert get_mock.call_count == 2
-    get_mock.assert_has_calls([call(f"{USER_FETCH['id']}-expiry"), call(f"{USER_FETCH['id']}-ip")])
+    fetch_mock.assert_called_once()
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func_no_secret)
-@freeze_time(TEST_TIME.isoformat())
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.WRONG_IP, None))
 @mark.asyncio
-async def test_get_current_user_no_secret(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+async def test_get_current_user_wrong_ip(
+    fetch_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
 ) -> None:
     with pytest.raises(HTTPException) as error_info:
         await get_current_user(token, request_obj)
 
     assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Invalid username or password"
+    assert error_info.value.detail == "Invalid ip please reauthenticate"
     row_mock.assert_not_called()
-    assert get_mock.call_count == 4
-    get_mock.assert_has_calls([call(key) for key in REDIS_GETS], any_order=True)
+    fetch_mock.assert_called_once()
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func_no_public)
-@freeze_time(TEST_TIME.isoformat())
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, SESSION))
 @mark.asyncio
-async def test_get_current_user_no_public(
-    get_mock: AsyncMock, row_mock: AsyncMock, token: str, request_obj: Request
+async def test_get_current_user_no_user_id(
+    fetch_mock: AsyncMock, row_mock: AsyncMock, token_no_id: str, request_obj: Request
 ) -> None:
     with pytest.raises(HTTPException) as error_info:
-        await get_current_user(token, request_obj)
+        await get_current_user(token_no_id, request_obj)
 
     assert error_info.value.status_code == 401
     assert error_info.value.detail == "Invalid username or password"
     row_mock.assert_not_called()
-    assert get_mock.call_count == 4
-    get_mock.assert_has_calls([call(key) for key in REDIS_GETS], any_order=True)
+    fetch_mock.assert_not_called()
 
 
 @patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=USER_FETCH)
-@patch("db.redis.client.Redis.get", side_effect=redis_get_mock_func)
+@patch("db.redis.session.SessionStore.fetch", new_callable=AsyncMock, return_value=(SessionState.VALID, SESSION))
+@freeze_time(TEST_TIME.isoformat())
 @mark.asyncio
-async def test_get_current_user_no_user_id(
-    get_mock: AsyncMock, row_mock: AsyncMock, token_no_id: str, request_obj: Request
+async def test_get_current_user_cached(
+    fetch_mock: AsyncMock,
+    row_mock: AsyncMock,
+    token_with_session: str,
+    request_obj: Request,
+    session_cache: SessionCache,
 ) -> None:
-    with pytest.raises(HTTPException) as error_info:
-        await get_current_user(token_no_id, request_obj)
+    user = await get_current_user(token_with_session, request_obj)
+    cached_user = await get_current_user(token_with_session, request_obj)
 
-    assert error_info.value.status_code == 401
-    assert error_info.value.detail == "Invalid username or password"
+    assert cached_user is user
+    fetch_mock.assert_called_once_with(USER_ID, SESSION_ID, request_obj.client.host, TEST_TIME)
     row_mock.assert_not_called()
-    get_mock.assert_not_called()
+    assert session_cache.hits == 1
+    assert session_cache.misses == 1
+
+    session_cache.invalidate(USER_ID)
+    await get_current_user(token_with_session, request_obj)
+    assert fetch_mock.call_count == 2
@@ -0,0 +1,90 @@
+import os
+from unittest.mock import patch
+
+import bcrypt
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from pytest import mark, raises
+from routes.metrics.metrics import check_metrics_token, render_metrics
+from starlette.types import Message
+
+SALT = bcrypt.gensalt(rounds=4).decode()
+with patch.dict(os.environ, {"SALT": SALT, "USER_SALT": SALT, "JWT_SECRET": "JWT_SECRET"}):
+    from main import app
+
+TOKEN = "metrics token"  # noqa: S105
+
+
+def test_render_metrics() -> None:
+    with (
+        patch("routes.metrics.metrics.pool_stats", return_value={"threads": 4, "in_flight": 1, "completed": 9}),
+        patch("db.psql.client.Psql.stats", return_value={"size": 10, "waiting": 0}),
+    ):
+        rendered = render_metrics()
+
+    assert "vault_lwe_pool_completed_total 9\n" in rendered
+    assert "vault_lwe_pool_threads 4\n" in rendered
+    assert "vault_lwe_pool_in_flight 1\n" in rendered
+    assert "# TYPE vault_session_cache_hits_total counter\n" in rendered
+    assert "# TYPE vault_session_cache_size gauge\n" in rendered
+    assert "# TYPE vault_hashing_queue_depth gauge\n" in rendered
+    assert "vault_psql_pool_size 10\n" in rendered
+    assert "# TYPE vault_keypair_pool_misses_total counter\n" in rendered
+    assert "# TYPE vault_keypair_pool_size gauge\n" in rendered
+    assert "# TYPE vault_auth_admission_rejected_total counter\n" in rendered
+    assert "# TYPE vault_auth_admission_waiting gauge\n" in rendered
+    assert "# TYPE vault_psql_query_duration_seconds histogram\n" in rendered
+    assert "username_filter" not in rendered
+    assert 'phase="bcrypt"' not in rendered
+
+
+@mark.parametrize(
+    ("configured", "credentials"),
+    [("", None), ("", ""), (TOKEN, None), (TOKEN, "wrong"), (TOKEN, "ünïcode")],
+)
+def test_metrics_token_rejected(configured: str, credentials: str | None) -> None:
+    if credentials is not None:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=credentials)
+
+    with patch("routes.metrics.metrics.METRICS_TOKEN", configured), raises(HTTPException) as error:
+        check_metrics_token(credentials)
+
+    assert error.value.status_code == 401
+
+
+@patch("routes.metrics.metrics.METRICS_TOKEN", TOKEN)
+def test_metrics_token_accepted() -> None:
+    check_metrics_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=TOKEN))
+
+
+async def get_metrics(headers: list[tuple[bytes, bytes]]) -> int:
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/metrics",
+        "headers": headers,
+        "query_string": b"",
+        "client": ("127.0.0.1", 8080),
+        "server": ("www.example.com", 443),
+    }
+    with patch("routes.metrics.metrics.METRICS_TOKEN", TOKEN):
+        await app(scope, receive, send)
+
+    return sent[0]["status"]
+
+
+@mark.asyncio
+async def test_metrics_route_requires_token() -> None:
+    assert await get_metrics([]) == 401
+    assert await get_metrics([(b"authorization", b"Bearer wrong")]) == 401
+
+    with patch("main.render_metrics", return_value=""):
+        assert await get_metrics([(b"authorization", f"Bearer {TOKEN}".encode())]) == 200
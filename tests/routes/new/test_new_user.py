@@ -1,3 +1,4 @@
+import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import asyncpg
@@ -5,13 +6,15 @@ import bcrypt
 import pytest
 from db.psql.users.queries import ADD_USER
 from fastapi import HTTPException
+from hashing.service import Hasher
 from models.new.inbound import NewIn
 from models.new.outbound import NewOut
 from pytest import mark
 from pytest_asyncio import fixture
 
 MOCK_GET_ENV = bcrypt.gensalt()
-with patch("os.getenv", return_value=MOCK_GET_ENV.decode()):
+with patch.dict(os.environ, {"SALT": MOCK_GET_ENV.decode()}):
+    from routes.new.constants import SALT
     from routes.new.new_user import create_user
 
 
@@ -31,11 +34,12 @@ def new_user() -> NewIn:
 async def test_new_user(execute_mock: AsyncMock, _: MagicMock, uuid_mock: MagicMock, new_user: NewIn) -> None:
     user_out = await create_user(new_user)
     execute_mock.assert_called_once_with(
-        ADD_USER, uuid_mock.return_value, new_user.username, bcrypt.hashpw(new_user.password.encode(), MOCK_GET_ENV)
+        ADD_USER, uuid_mock.return_value, new_user.username, bcrypt.hashpw(new_user.password.encode(), SALT)
     )
 
     assert isinstance(user_out, NewOut)
     assert user_out.username == new_user.username
+    assert Hasher().in_flight == 0
 
 
 @patch("uuid.uuid4", return_value="uuid")
@@ -51,5 +55,5 @@ async def test_new_user_raise_error(
     assert error_info.value.status_code == 500
     assert error_info.value.detail == "Internal Server Error"
     execute_mock.assert_called_once_with(
-        ADD_USER, uuid_mock.return_value, new_user.username, bcrypt.hashpw(new_user.password.encode(), MOCK_GET_ENV)
+        ADD_USER, uuid_mock.return_value, new_user.username, bcrypt.hashpw(new_user.password.encode(), SALT)
     )
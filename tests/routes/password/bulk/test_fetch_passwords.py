@@ -0,0 +1,77 @@
+import os
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import bcrypt
+import pytest_asyncio
+from db.psql.passwords.queries import GET_PASSWORDS, REKEY_PASSWORDS
+from hashing.service import Hasher
+from lwe import Secret
+from models.user import User
+from pytest import fixture, mark
+
+MOCK_USER_SALT = bcrypt.gensalt(rounds=4)
+with patch.dict(os.environ, {"USER_SALT": MOCK_USER_SALT.decode()}):
+    from models.password.get import GetPasswordOut, GetPasswordsIn, GetPasswordsOut
+    from routes.password.bulk.fetch_passwords import fetch_passwords
+    from routes.password.post.constants import USER_SALT
+
+SECRET = Secret()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def hasher() -> AsyncIterator[Hasher]:
+    await Hasher().close()
+    async with Hasher() as hasher:
+        yield hasher
+
+
+@fixture
+def user() -> User:
+    return User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+
+def key(name: str) -> bytes:
+    return bcrypt.hashpw(name.encode(), USER_SALT)
+
+
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch", new_callable=AsyncMock)
+@mark.asyncio
+async def test_fetch_passwords(fetch_mock: AsyncMock, _: MagicMock, user: User) -> None:
+    fetch_mock.return_value = [
+        {"name": key("b"), "username": "user-b", "password": "password-b"},
+        {"name": key("a"), "username": "user-a", "password": "password-a"},
+    ]
+
+    out = await fetch_passwords(GetPasswordsIn(names=["a", "b", "a", "c"]), user)
+
+    fetch_mock.assert_called_once_with(GET_PASSWORDS, [key("a"), key("b"), key("c")], user.id)
+    assert out == GetPasswordsOut(
+        passwords={
+            "a": GetPasswordOut(username="user-a", password="password-a"),  # noqa: S106
+            "b": GetPasswordOut(username="user-b", password="password-b"),  # noqa: S106
+        },
+        missing=["c"],
+    )
+
+
+@patch("routes.password.name_index.NAME_INDEX_MIGRATE", True)
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@patch("routes.password.name_index.hmac_name_key", side_effect=lambda name: f"hmac-{name}".encode())
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch", new_callable=AsyncMock)
+@mark.asyncio
+async def test_fetch_passwords_migrates_legacy_names(
+    fetch_mock: AsyncMock, _: MagicMock, __: MagicMock, user: User
+) -> None:
+    fetch_mock.side_effect = [
+        [{"name": b"hmac-a", "username": "user-a", "password": "password-a"}],
+        [{"name": b"hmac-b", "username": "user-b", "password": "password-b"}],
+    ]
+
+    out = await fetch_passwords(GetPasswordsIn(names=["a", "b", "c"]), user)
+
+    fetch_mock.assert_called_with(REKEY_PASSWORDS, [b"hmac-b", b"hmac-c"], [key("b"), key("c")], user.id)
+    assert list(out.passwords) == ["a", "b"]
+    assert out.missing == ["c"]
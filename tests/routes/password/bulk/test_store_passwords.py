@@ -0,0 +1,106 @@
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import bcrypt
+import pytest_asyncio
+from db.psql.passwords.queries import INSERT_PASSWORDS, REKEY_PASSWORDS
+from hashing.service import Hasher
+from lwe import Secret
+from models.user import User
+from pytest import fixture, mark
+
+MOCK_USER_SALT = bcrypt.gensalt(rounds=4)
+with patch.dict(os.environ, {"USER_SALT": MOCK_USER_SALT.decode()}):
+    from routes.password.bulk.outbound import BulkPasswordOut
+    from routes.password.bulk.store_passwords import store_passwords
+    from routes.password.post.constants import USER_SALT
+    from routes.password.post.inbound import SetPasswordIn
+    from routes.password.post.outbound import SetPasswordOut
+
+SECRET = Secret()
+CONNECTION = MagicMock()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def hasher() -> AsyncIterator[Hasher]:
+    await Hasher().close()
+    async with Hasher() as hasher:
+        yield hasher
+
+
+@asynccontextmanager
+async def transaction(_: object) -> AsyncIterator[MagicMock]:
+    yield CONNECTION
+
+
+@fixture
+def user() -> User:
+    return User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+
+@fixture
+def set_passwords_in() -> list[SetPasswordIn]:
+    return [
+        SetPasswordIn(name="a", username="user-a", password="password-a"),  # noqa: S106
+        SetPasswordIn(name="b", password="password-b"),  # noqa: S106
+        SetPasswordIn(name="a", username="user-a2", password="password-a2"),  # noqa: S106
+        SetPasswordIn(name="c", username="user-c", password="password-c"),  # noqa: S106
+    ]
+
+
+def key(name: str) -> bytes:
+    return bcrypt.hashpw(name.encode(), USER_SALT)
+
+
+@patch("uuid.uuid4", return_value="uuid")
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.transaction", transaction)
+@patch("db.psql.client.Psql.fetch", new_callable=AsyncMock)
+@mark.asyncio
+async def test_store_passwords(
+    fetch_mock: AsyncMock, _: MagicMock, __: MagicMock, set_passwords_in: list[SetPasswordIn], user: User
+) -> None:
+    fetch_mock.return_value = [{"name": key("a")}, {"name": key("b")}]
+
+    out = await store_passwords(set_passwords_in, user)
+
+    fetch_mock.assert_called_once_with(
+        INSERT_PASSWORDS,
+        ["uuid", "uuid", "uuid"],
+        [user.id, user.id, user.id],
+        ["user-a", None, "user-c"],
+        ["password-a", "password-b", "password-c"],
+        [key("a"), key("b"), key("c")],
+        connection=CONNECTION,
+    )
+    assert out == BulkPasswordOut(
+        results=[
+            SetPasswordOut(name="a"),
+            SetPasswordOut(name="b"),
+            SetPasswordOut(name="a", success=False),
+            SetPasswordOut(name="c", success=False),
+        ],
+        stored=2,
+        failed=2,
+    )
+
+
+@patch("routes.password.name_index.NAME_INDEX_MIGRATE", True)
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@patch("routes.password.name_index.hmac_name_key", side_effect=lambda name: f"hmac-{name}".encode())
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.transaction", transaction)
+@patch("db.psql.client.Psql.execute", new_callable=AsyncMock)
+@patch("db.psql.client.Psql.fetch", new_callable=AsyncMock, return_value=[{"name": b"hmac-a"}])
+@mark.asyncio
+async def test_store_passwords_migrates_legacy_names(
+    fetch_mock: AsyncMock, execute_mock: AsyncMock, _: MagicMock, __: MagicMock, user: User
+) -> None:
+    out = await store_passwords([SetPasswordIn(name="a", password="password")], user)  # noqa: S106
+
+    execute_mock.assert_called_once_with(REKEY_PASSWORDS, [b"hmac-a"], [key("a")], user.id, connection=CONNECTION)
+    assert fetch_mock.call_args.args[-1] == [b"hmac-a"]
+    assert fetch_mock.call_args.kwargs == {"connection": CONNECTION}
+    assert out.results == [SetPasswordOut(name="a")]
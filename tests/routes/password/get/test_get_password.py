@@ -0,0 +1,81 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import bcrypt
+import pytest
+from db.psql.passwords.queries import GET_PASSWORD, REKEY_PASSWORD
+from fastapi import HTTPException
+from hashing.service import Hasher
+from lwe import Secret
+from models.password.get import GetPasswordIn, GetPasswordOut
+from models.user import User
+from pytest import fixture, mark
+
+MOCK_USER_SALT = bcrypt.gensalt(rounds=4)
+with patch.dict(os.environ, {"USER_SALT": MOCK_USER_SALT.decode()}):
+    from routes.password.get.get_password import fetch_password
+    from routes.password.post.constants import USER_SALT
+
+SECRET = Secret()
+ROW = {"username": "username", "password": "password"}
+
+
+@fixture
+def user() -> User:
+    return User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=ROW)
+@mark.asyncio
+async def test_fetch_password(row_mock: AsyncMock, _: MagicMock, user: User) -> None:
+    password_out = await fetch_password(GetPasswordIn(name="name"), user)
+
+    row_mock.assert_called_once_with(GET_PASSWORD, bcrypt.hashpw(b"name", USER_SALT), user.id)
+    assert password_out == GetPasswordOut(**ROW)
+    assert Hasher().in_flight == 0
+
+
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=None)
+@mark.asyncio
+async def test_fetch_password_not_found(row_mock: AsyncMock, _: MagicMock, user: User) -> None:
+    with pytest.raises(HTTPException) as error_info:
+        await fetch_password(GetPasswordIn(name="name"), user)
+
+    assert error_info.value.status_code == 404
+    row_mock.assert_called_once()
+
+
+@patch("routes.password.name_index.NAME_INDEX_MIGRATE", True)
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@patch("routes.password.name_index.hmac_name_key", return_value=b"hmac")
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, side_effect=[None, ROW])
+@mark.asyncio
+async def test_fetch_password_migrates_legacy_name(
+    row_mock: AsyncMock, _: MagicMock, __: MagicMock, user: User
+) -> None:
+    password_out = await fetch_password(GetPasswordIn(name="name"), user)
+
+    row_mock.assert_has_calls(
+        [
+            call(GET_PASSWORD, b"hmac", user.id),
+            call(REKEY_PASSWORD, b"hmac", bcrypt.hashpw(b"name", USER_SALT), user.id),
+        ]
+    )
+    assert password_out == GetPasswordOut(**ROW)
+
+
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@patch("routes.password.name_index.hmac_name_key", return_value=b"hmac")
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=None)
+@mark.asyncio
+async def test_fetch_password_hmac_without_migration(
+    row_mock: AsyncMock, _: MagicMock, __: MagicMock, user: User
+) -> None:
+    with pytest.raises(HTTPException):
+        await fetch_password(GetPasswordIn(name="name"), user)
+
+    row_mock.assert_called_once_with(GET_PASSWORD, b"hmac", user.id)
@@ -0,0 +1,81 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import bcrypt
+from db.psql.passwords.queries import INSERT_PASSWORD, REKEY_PASSWORD
+from hashing.service import Hasher
+from lwe import Secret
+from models.user import User
+from pytest import fixture, mark
+
+MOCK_USER_SALT = bcrypt.gensalt(rounds=4)
+with patch.dict(os.environ, {"USER_SALT": MOCK_USER_SALT.decode()}):
+    from routes.password.post.constants import USER_SALT
+    from routes.password.post.inbound import SetPasswordIn
+    from routes.password.post.outbound import SetPasswordOut
+    from routes.password.post.set_password import store_password
+
+SECRET = Secret()
+
+
+@fixture
+def user() -> User:
+    return User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+
+@fixture
+def set_password_in() -> SetPasswordIn:
+    return SetPasswordIn(name="name", username="username", password="password")  # noqa: S106
+
+
+@patch("uuid.uuid4", return_value="uuid")
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.execute", new_callable=AsyncMock)
+@mark.asyncio
+async def test_store_password(
+    execute_mock: AsyncMock, _: MagicMock, uuid_mock: MagicMock, set_password_in: SetPasswordIn, user: User
+) -> None:
+    password_out = await store_password(set_password_in, user)
+
+    execute_mock.assert_called_once_with(
+        INSERT_PASSWORD,
+        uuid_mock.return_value,
+        user.id,
+        set_password_in.username,
+        set_password_in.password,
+        bcrypt.hashpw(b"name", USER_SALT),
+    )
+    assert password_out == SetPasswordOut(name=set_password_in.name)
+    assert Hasher().in_flight == 0
+
+
+@patch("routes.password.name_index.NAME_INDEX_MIGRATE", True)
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@patch("routes.password.name_index.hmac_name_key", return_value=b"hmac")
+@patch("uuid.uuid4", return_value="uuid")
+@patch("db.psql.client.Psql", new_callable=MagicMock)
+@patch("db.psql.client.Psql.execute", new_callable=AsyncMock)
+@mark.asyncio
+async def test_store_password_migrates_legacy_name(
+    execute_mock: AsyncMock,
+    _: MagicMock,
+    uuid_mock: MagicMock,
+    __: MagicMock,
+    set_password_in: SetPasswordIn,
+    user: User,
+) -> None:
+    await store_password(set_password_in, user)
+
+    execute_mock.assert_has_calls(
+        [
+            call(REKEY_PASSWORD, b"hmac", bcrypt.hashpw(b"name", USER_SALT), user.id),
+            call(
+                INSERT_PASSWORD,
+                uuid_mock.return_value,
+                user.id,
+                set_password_in.username,
+                set_password_in.password,
+                b"hmac",
+            ),
+        ]
+    )
@@ -0,0 +1,38 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+from db.psql.passwords.queries import LIST_PASSWORDS
+from lwe import Secret
+from models.user import User
+from pytest import mark
+from routes.password.stream.stream_passwords import stream_passwords
+
+SECRET = Secret()
+ID = UUID("12345678-1234-5678-1234-567812345678")
+
+
+@patch("routes.password.stream.stream_passwords.STREAM_BATCH_SIZE", 2)
+@patch("db.psql.client.Psql.stream")
+@mark.asyncio
+async def test_stream_passwords(stream_mock: MagicMock) -> None:
+    async def rows(*_: Any) -> AsyncIterator[dict[str, Any]]:  # noqa: ANN401
+        yield {"id": ID, "username": "user-a", "password": "password-a"}
+        yield {"id": ID, "username": None, "password": "password-b"}
+        yield {"id": ID, "username": "user-c", "password": "password-c"}
+
+    stream_mock.side_effect = rows
+    user = User(id="user", name="test", public=SECRET.generate_public_key(), secret=SECRET)
+
+    chunks = [chunk async for chunk in stream_passwords(user)]
+    lines = b"".join(chunks).splitlines()
+
+    stream_mock.assert_called_once_with(LIST_PASSWORDS, user.id)
+    assert len(chunks) == 2
+    assert [json.loads(SECRET.decrypt(json.loads(line)["content"])) for line in lines] == [
+        {"id": str(ID), "username": "user-a", "password": "password-a"},
+        {"id": str(ID), "username": None, "password": "password-b"},
+        {"id": str(ID), "username": "user-c", "password": "password-c"},
+    ]
@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+import os
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+import bcrypt
+import pytest_asyncio
+from hashing.service import Hasher
+from pytest import mark
+
+MOCK_USER_SALT = bcrypt.gensalt(rounds=4)
+with patch.dict(os.environ, {"USER_SALT": MOCK_USER_SALT.decode()}):
+    from routes.password.name_index import migrating, name_key, name_keys
+    from routes.password.post.constants import USER_SALT
+
+KEY = b"index key"
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def hasher() -> AsyncIterator[Hasher]:
+    await Hasher().close()
+    async with Hasher() as hasher:
+        yield hasher
+
+
+@mark.asyncio
+async def test_name_key_bcrypt() -> None:
+    assert await name_key("name") == bcrypt.hashpw(b"name", USER_SALT)
+    assert Hasher().in_flight == 0
+
+
+@patch("routes.password.name_index.NAME_INDEX_KEY", KEY)
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@mark.asyncio
+async def test_name_key_hmac() -> None:
+    key = await name_key("name")
+    assert key == hmac.new(KEY, b"name", hashlib.sha256).digest()
+    assert key != await name_key("other name")
+
+
+@mark.asyncio
+async def test_name_keys_bcrypt() -> None:
+    assert await name_keys(["a", "b"]) == [bcrypt.hashpw(b"a", USER_SALT), bcrypt.hashpw(b"b", USER_SALT)]
+    assert Hasher().in_flight == 0
+
+
+@patch("routes.password.name_index.NAME_INDEX_KEY", KEY)
+@patch("routes.password.name_index.NAME_INDEX", "hmac")
+@mark.asyncio
+async def test_name_keys_hmac() -> None:
+    assert await name_keys(["a", "b"]) == [await name_key("a"), await name_key("b")]
+
+
+@mark.parametrize(
+    ("index", "migrate", "expected"),
+    [("bcrypt", False, False), ("bcrypt", True, False), ("hmac", False, False), ("hmac", True, True)],
+)
+def test_migrating(index: str, migrate: bool, expected: bool) -> None:
+    with (
+        patch("routes.password.name_index.NAME_INDEX", index),
+        patch("routes.password.name_index.NAME_INDEX_MIGRATE", migrate),
+    ):
+        assert migrating() is expected
@@ -0,0 +1,77 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from server.constants import SERVER_GRACEFUL_TIMEOUT, SERVER_HOST, SERVER_PORT
+from server.launcher import serve, worker_environment
+
+
+@patch("server.launcher.SERVER_REDIS_CONNECTIONS", 100)
+@patch("server.launcher.SERVER_PSQL_CONNECTIONS", 40)
+@patch("os.process_cpu_count", return_value=8)
+def test_worker_environment(_: MagicMock) -> None:
+    assert worker_environment(4) == {
+        "PSQL_MIN_SIZE": "10",
+        "PSQL_MAX_SIZE": "10",
+        "REDIS_MAX_CONNECTIONS": "25",
+        "HASHING_WORKERS": "2",
+        "LWE_THREADS": "2",
+    }
+
+
+@patch("server.launcher.SERVER_PSQL_CONNECTIONS", 2)
+@patch("os.process_cpu_count", return_value=2)
+def test_worker_environment_never_empty(_: MagicMock) -> None:
+    environment = worker_environment(16)
+
+    assert environment["PSQL_MAX_SIZE"] == "1"
+    assert environment["LWE_THREADS"] == "1"
+
+
+@patch.dict(os.environ, {"PSQL_MAX_SIZE": "3"})
+@patch("server.launcher.SERVER_WORKERS", 4)
+@patch("uvicorn.run")
+def test_serve(run_mock: MagicMock) -> None:
+    serve()
+
+    run_mock.assert_called_once()
+    args, kwargs = run_mock.call_args
+    assert args == ("main:app",)
+    assert kwargs["workers"] == 4
+    assert kwargs["host"] == SERVER_HOST
+    assert kwargs["port"] == SERVER_PORT
+    assert kwargs["timeout_graceful_shutdown"] == SERVER_GRACEFUL_TIMEOUT
+    assert os.environ["PSQL_MAX_SIZE"] == "3"
+    assert os.environ["LWE_THREADS"] == worker_environment(4)["LWE_THREADS"]
+
+
+@patch.dict(os.environ, {"USERNAME_FILTER": "local"})
+@patch("server.launcher.USERNAME_FILTER", "local")
+@patch("uvicorn.run")
+def test_serve_shares_local_username_filter(_: MagicMock) -> None:
+    with patch("server.launcher.SERVER_WORKERS", 1):
+        serve()
+    assert os.environ["USERNAME_FILTER"] == "local"
+
+    with patch("server.launcher.SERVER_WORKERS", 2):
+        serve()
+    assert os.environ["USERNAME_FILTER"] == "redis"
+
+
+@patch("server.launcher.SESSION_STORE", "memory")
+@patch("server.launcher.SERVER_WORKERS", 2)
+@patch("uvicorn.run")
+def test_serve_refuses_memory_sessions_with_workers(run_mock: MagicMock) -> None:
+    with pytest.raises(SystemExit):
+        serve()
+
+    run_mock.assert_not_called()
+
+
+@patch("server.launcher.SESSION_STORE", "memory")
+@patch("server.launcher.SERVER_WORKERS", 1)
+@patch("uvicorn.run")
+def test_serve_memory_sessions_single_worker(run_mock: MagicMock) -> None:
+    serve()
+
+    run_mock.assert_called_once()
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytz
+from db.redis.session import SessionStore
+from db.redis.session_cache import SessionCache
+from models.session import Session, SessionState
+from pytest import fixture, mark
+from sessions.memory import MemorySessionStore
+from sessions.service import session_store
+
+NOW = datetime.now(tz=pytz.UTC)
+EXPIRY = NOW + timedelta(seconds=1800)
+SESSION = Session(id="session", name="test", secret="secret", public="public", expiry=EXPIRY)  # noqa: S106
+
+
+@fixture
+def store() -> MemorySessionStore:
+    store = MemorySessionStore()
+    store.reset()
+    return store
+
+
+def test_memory_session_store_cache(store: MemorySessionStore) -> None:
+    assert MemorySessionStore.cache is store
+    assert MemorySessionStore() is store
+
+
+def test_session_store_selection() -> None:
+    assert isinstance(session_store(), SessionStore)
+
+    with patch("sessions.service.SESSION_STORE", "memory"):
+        assert isinstance(session_store(), MemorySessionStore)
+
+
+@mark.asyncio
+async def test_fetch_valid(store: MemorySessionStore) -> None:
+    await store.create("user", SESSION, "127.0.0.1", 1800)
+
+    assert await store.fetch("user", "session", "127.0.0.1", NOW) == (SessionState.VALID, SESSION)
+    assert await store.fetch("user", None, "127.0.0.1", NOW) == (SessionState.VALID, SESSION)
+
+
+@mark.asyncio
+async def test_fetch_invalid(store: MemorySessionStore) -> None:
+    await store.create("user", SESSION, "127.0.0.1", 1800)
+
+    assert await store.fetch("other", "session", "127.0.0.1", NOW) == (SessionState.MISSING, None)
+    assert await store.fetch("user", "other", "127.0.0.1", NOW) == (SessionState.MISSING, None)
+    assert await store.fetch("user", "session", "10.0.0.1", NOW) == (SessionState.WRONG_IP, None)
+    assert await store.fetch("user", "session", "127.0.0.1", EXPIRY + timedelta(seconds=1)) == (
+        SessionState.EXPIRED,
+        None,
+    )
+
+
+@mark.asyncio
+async def test_ttl_expiry(store: MemorySessionStore) -> None:
+    await store.create("user", SESSION, "127.0.0.1", 60)
+
+    with patch("sessions.memory.monotonic", return_value=float("inf")):
+        assert await store.fetch("user", "session", "127.0.0.1", NOW) == (SessionState.MISSING, None)
+
+    assert "user" not in store.entries
+
+
+@patch("sessions.memory.SESSION_STORE_MAX_ENTRIES", 2)
+@mark.asyncio
+async def test_memory_cap(store: MemorySessionStore) -> None:
+    for user_id in ("a", "b", "c"):
+        await store.create(user_id, SESSION, "127.0.0.1", 1800)
+
+    assert list(store.entries) == ["b", "c"]
+    assert store.stats() == {"size": 2, "evictions": 1}
+
+
+@mark.asyncio
+async def test_invalidate(store: MemorySessionStore) -> None:
+    await store.invalidate("user")
+
+    await store.create("user", SESSION, "127.0.0.1", 1800)
+    epoch = SessionCache().epoch
+    await store.invalidate("user")
+
+    _, session = await store.fetch("user", "session", "127.0.0.1", NOW)
+    assert session == SESSION.model_copy(update={"name": None})
+    assert SessionCache().epoch == epoch + 1
@@ -0,0 +1,26 @@
+from lwe import Secret
+from pytest import raises
+from sessions.keys import load_public, load_secret
+
+SECRET = Secret()
+PUBLIC = SECRET.generate_public_key()
+
+
+def test_load_raw_keys() -> None:
+    assert load_secret(SECRET.to_bytes()).to_bytes() == SECRET.to_bytes()
+
+    for compact in (True, False):
+        assert load_public(PUBLIC.to_bytes(compact=compact)).to_bytes(compact=False) == PUBLIC.to_bytes(compact=False)
+
+
+def test_load_base64_keys() -> None:
+    assert load_secret(SECRET.to_b64().encode()).to_bytes() == SECRET.to_bytes()
+    assert load_public(PUBLIC.to_b64().encode()).to_bytes(compact=False) == PUBLIC.to_bytes(compact=False)
+
+
+def test_load_invalid_keys() -> None:
+    with raises(ValueError):
+        load_secret(b"invalid")
+
+    with raises(ValueError):
+        load_public(b"invalid")
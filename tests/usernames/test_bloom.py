@@ -0,0 +1,19 @@
+from usernames.bloom import BloomFilter
+
+
+def test_bloom_filter_sizing() -> None:
+    bloom = BloomFilter(1000, 0.01)
+
+    assert bloom.size == 9586
+    assert bloom.hashes == 7
+    assert len(bloom.bits) == 1199
+
+
+def test_bloom_filter_membership() -> None:
+    bloom = BloomFilter(1000, 0.01)
+    names = [f"user-{index}" for index in range(1000)]
+    for name in names:
+        bloom.add(name)
+
+    assert all(name in bloom for name in names)
+    assert sum(f"other-{index}" in bloom for index in range(10000)) < 300
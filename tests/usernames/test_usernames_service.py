@@ -0,0 +1,176 @@
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import bcrypt
+from db.psql.users.queries import GET_USER, LIST_USERNAMES
+from db.redis.client import Redis
+from pytest import fixture, mark
+from usernames.bloom import BloomFilter
+from usernames.service import Usernames
+
+SALT = bcrypt.gensalt(rounds=4)
+
+
+@fixture
+def usernames() -> Usernames:
+    usernames = Usernames()
+    usernames.bloom = BloomFilter(100, 0.01)
+    usernames.ready = False
+    usernames.dummy = None
+    usernames.latency = 0.0
+    return usernames
+
+
+def rows(*names: str) -> MagicMock:
+    async def stream(*_: Any, **__: Any) -> AsyncIterator[dict[str, str]]:  # noqa: ANN401
+        for name in names:
+            yield {"name": name}
+
+    return MagicMock(side_effect=stream)
+
+
+def test_usernames_cache() -> None:
+    usernames = Usernames()
+    assert Usernames.cache is usernames
+    assert Usernames() is usernames
+
+
+@patch("usernames.service.USERNAME_FILTER", "local")
+@patch("usernames.service.USERNAME_DUMMY_SALT", SALT)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value={"name": "known"})
+@mark.asyncio
+async def test_lookup_skips_unknown_names(fetch_row_mock: AsyncMock, usernames: Usernames) -> None:
+    with patch("db.psql.client.Psql.stream", rows("known")) as stream_mock:
+        async with usernames:
+            assert usernames.ready
+
+    stream_mock.assert_called_once_with(LIST_USERNAMES)
+    usernames.ready = True
+
+    assert await usernames.lookup("known") == {"name": "known"}
+    fetch_row_mock.assert_called_once_with(GET_USER, "known")
+
+    assert await usernames.lookup("unknown") is None
+    fetch_row_mock.assert_called_once()
+    assert usernames.dummy.startswith(SALT)
+
+
+@patch("usernames.service.USERNAME_DUMMY_SALT", SALT)
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=None)
+@mark.asyncio
+async def test_filter_off_by_default(fetch_row_mock: AsyncMock, usernames: Usernames) -> None:
+    with patch("db.psql.client.Psql.stream", rows("known")) as stream_mock:
+        async with usernames:
+            await usernames.add("unknown")
+
+    stream_mock.assert_not_called()
+    assert not usernames.ready
+    assert await usernames.lookup("unknown") is None
+    fetch_row_mock.assert_called_once_with(GET_USER, "unknown")
+
+
+@patch("db.psql.client.Psql.fetch_row", new_callable=AsyncMock, return_value=None)
+@mark.asyncio
+async def test_lookup_before_build(fetch_row_mock: AsyncMock, usernames: Usernames) -> None:
+    assert await usernames.lookup("unknown") is None
+    fetch_row_mock.assert_called_once_with(GET_USER, "unknown")
+
+
+@patch("usernames.service.USERNAME_FILTER", "local")
+@mark.asyncio
+async def test_add(usernames: Usernames) -> None:
+    usernames.ready = True
+    assert not await usernames.might_exist("new")
+
+    await usernames.add("new")
+    assert await usernames.might_exist("new")
+
+
+@patch("usernames.service.USERNAME_FILTER", "redis")
+@mark.asyncio
+async def test_shared_filter(usernames: Usernames) -> None:
+    bits: dict[int, int] = {}
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.setbit.side_effect = lambda _, position, value: bits.__setitem__(position, value)
+    commands: list[int] = []
+    pipe.exists.side_effect = lambda _: commands.append(1)
+    pipe.getbit.side_effect = lambda _, position: commands.append(bits.get(position, 0))
+    pipe.execute = AsyncMock(side_effect=lambda: list(commands))
+
+    with patch.object(Redis(), "redis", new=MagicMock()) as redis_mock:
+        redis_mock.pipeline.return_value = pipe
+        redis_mock.scan_iter = rows()
+        redis_mock.exists = AsyncMock(return_value=True)
+        await usernames.build()
+        await usernames.add("shared")
+
+        assert usernames.ready
+        assert await usernames.might_exist("shared")
+        commands.clear()
+        assert not await usernames.might_exist("other")
+
+    assert not any(usernames.bloom.bits)
+
+
+@patch("usernames.service.USERNAME_FILTER", "redis")
+@mark.asyncio
+async def test_shared_filter_lost(usernames: Usernames) -> None:
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(side_effect=[[0, 0, 0], []])
+    usernames.ready = True
+
+    with (
+        patch.object(Redis(), "redis", new=MagicMock()) as redis_mock,
+        patch("db.psql.client.Psql.stream", rows("lost")) as stream_mock,
+    ):
+        redis_mock.pipeline.return_value = pipe
+        redis_mock.scan_iter = rows()
+        redis_mock.exists = AsyncMock(return_value=False)
+        redis_mock.set = AsyncMock()
+
+        assert await usernames.might_exist("lost")
+        rebuilding = usernames.rebuilding
+        usernames.rebuild()
+        assert usernames.rebuilding is rebuilding
+        await rebuilding
+
+    pipe.exists.assert_called_once_with(f"{usernames.key}-ready")
+    stream_mock.assert_called_once_with(LIST_USERNAMES)
+    redis_mock.set.assert_called_once_with(f"{usernames.key}-ready", 1)
+
+
+@patch("usernames.service.USERNAME_FILTER_RETIRE_AFTER", 60)
+@patch("usernames.service.USERNAME_FILTER_ERROR_RATE", 0.01)
+@patch("usernames.service.USERNAME_FILTER_CAPACITY", 100)
+@patch("usernames.service.USERNAME_FILTER_KEY", "filter")
+@mark.asyncio
+async def test_retire_stale_filters(usernames: Usernames) -> None:
+    keys = [b"filter", b"filter-ready", b"filter:10:0.1", b"filter:100:0.01", b"filter:100:0.01-ready"]
+
+    async def scan_iter(**_: str) -> AsyncIterator[bytes]:
+        for key in keys:
+            yield key
+
+    assert usernames.key == "filter:100:0.01"
+
+    with patch.object(Redis(), "redis", new=MagicMock()) as redis_mock:
+        redis_mock.scan_iter = MagicMock(side_effect=scan_iter)
+        redis_mock.ttl = AsyncMock(side_effect=[-1, -1, 30])
+        redis_mock.expire = AsyncMock()
+        await usernames.retire()
+
+    redis_mock.scan_iter.assert_called_once_with(match="filter*")
+    assert [call.args for call in redis_mock.expire.call_args_list] == [(b"filter", 60), (b"filter-ready", 60)]
+
+
+@patch("usernames.service.USERNAME_DUMMY_SALT", SALT)
+@patch("hashing.service.Hasher.checkpw", new_callable=AsyncMock)
+@mark.asyncio
+async def test_reject_checks_a_dummy_hash(checkpw_mock: AsyncMock, usernames: Usernames) -> None:
+    await usernames.reject(b"password")
+
+    checkpw_mock.assert_called_once_with(b"password", usernames.dummy)
+    assert usernames.dummy.startswith(SALT)